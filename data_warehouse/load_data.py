@@ -1,24 +1,186 @@
+from datetime import UTC, datetime
+import re
 import sqlite3
 import pandas as pd
 from pathlib import Path
 
+from analytics_project.dw.etl_to_dw import file_checksum, get_load_state
+from analytics_project.intermediate import read_frame, source_path
+
 # Paths
 base_path = Path(__file__).resolve().parent
 db_path = base_path / "datawarehouse.db"
 data_path = base_path.parent / "data" / "prepared"
 
-# Connect to SQLite
-conn = sqlite3.connect(db_path)
+# Same bookkeeping table as the warehouse ETL: one row per loaded table
+LOAD_STATE_SQL = """
+CREATE TABLE IF NOT EXISTS etl_load_state (
+    table_name TEXT PRIMARY KEY,
+    high_water_mark INTEGER,
+    source_checksum TEXT,
+    row_count INTEGER,
+    loaded_at TEXT
+)
+"""
+
+# Table and column names are interpolated into SQL, so only plain identifiers pass
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def quote_identifier(name):
+    """Return ``name`` double-quoted for SQL, refusing anything but a plain identifier."""
+    if not IDENTIFIER.fullmatch(str(name)):
+        raise ValueError(f"Not a valid table or column name: {name!r}")
+    return f'"{name}"'
+
+
+def prepare_table(df, table, key, conn):
+    """Create the table if missing and make sure it has a unique index on ``key``.
+
+    Tables written by the old to_sql(if_exists="replace") script can hold
+    repeated keys (customers_prepared.csv repeats a CustomerID). Before the
+    index is first created, only the last copy of each key is kept, which
+    matches what upsert() keeps from a file.
+    """
+    table_name, key_name = quote_identifier(table), quote_identifier(key)
+    index = f"ux_{table}_{key}"
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if not exists:
+        df.head(0).to_sql(table, conn, index=False)
+    elif not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index,)
+    ).fetchone():
+        removed = conn.execute(
+            f"DELETE FROM {table_name} WHERE rowid NOT IN "  # noqa: S608
+            f"(SELECT MAX(rowid) FROM {table_name} GROUP BY {key_name})"
+        ).rowcount
+        if removed:
+            print(f"{table}: removed {removed} older copies of repeated {key} values")
+    conn.execute(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {quote_identifier(index)} ON {table_name} ({key_name})"
+    )
+
+
+def upsert(df, table, key, conn):
+    """Insert new rows and update changed ones, keyed on `key`.
+
+    Unchanged rows are left alone, so reruns no longer rewrite every table
+    the way to_sql(if_exists="replace") did.
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted", "updated" and "skipped".
+    """
+    df = df.drop_duplicates(subset=[key], keep="last")
+    prepare_table(df, table, key, conn)
+    table_name, key_name = quote_identifier(table), quote_identifier(key)
+    existing = {row[0] for row in conn.execute(f"SELECT {key_name} FROM {table_name}")}  # noqa: S608
+
+    columns = [quote_identifier(col) for col in df.columns]
+    values = [col for col in columns if col != key_name]
+    column_list = ", ".join(columns)
+    placeholders = ", ".join("?" for _ in columns)
+    assignments = ", ".join(f"{col} = excluded.{col}" for col in values)
+    changed = " OR ".join(f"{table_name}.{col} IS NOT excluded.{col}" for col in values)
+    # Every name in the statement went through quote_identifier()
+    sql = (
+        f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}) "  # noqa: S608
+        f"ON CONFLICT({key_name}) DO UPDATE SET {assignments} WHERE {changed}"
+    )
+
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    before = conn.total_changes
+    conn.executemany(sql, rows)
+    written = conn.total_changes - before
+    inserted = int((~df[key].isin(existing)).sum())
+    return {"inserted": inserted, "updated": written - inserted, "skipped": len(df) - written}
+
+
+def save_load_state(conn, table, key, checksum):
+    """Record the table's high-water mark, row count and source checksum in etl_load_state."""
+    table_name, key_name = quote_identifier(table), quote_identifier(key)
+    high_water_mark, row_count = conn.execute(
+        f"SELECT MAX({key_name}), COUNT(*) FROM {table_name}"  # noqa: S608
+    ).fetchone()
+    conn.execute(
+        """
+        INSERT INTO etl_load_state (
+            table_name, high_water_mark, source_checksum, row_count, loaded_at
+        )
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(table_name) DO UPDATE SET
+            high_water_mark = excluded.high_water_mark,
+            source_checksum = excluded.source_checksum,
+            row_count = excluded.row_count,
+            loaded_at = excluded.loaded_at
+        """,
+        (table, high_water_mark, checksum, row_count, datetime.now(UTC).isoformat()),
+    )
+
+
+def load_table(file_name, table, key, conn, append_only=False):
+    """Load one prepared file incrementally and print its counts.
+
+    A file whose checksum matches the last load is skipped without being
+    read. With ``append_only`` (the sales fact), only rows whose key is
+    above the stored high-water mark are upserted; the rest count as skipped.
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted", "updated" and "skipped".
+    """
+    checksum = file_checksum(source_path(data_path / file_name))
+    state = get_load_state(conn, table)
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+
+    if exists and state is not None and state["source_checksum"] == checksum:
+        counts = {"inserted": 0, "updated": 0, "skipped": state["row_count"] or 0}
+        print(f"{table}: source unchanged, skipping ({counts})")
+        return counts
+
+    df = load_prepared(file_name)
+    skipped = 0
+    if append_only and exists and state is not None and state["high_water_mark"] is not None:
+        new = df[df[key] > state["high_water_mark"]]
+        skipped = len(df) - len(new)
+        df = new
+    counts = upsert(df, table, key, conn)
+    counts["skipped"] += skipped
+    save_load_state(conn, table, key, checksum)
+    print(
+        f"{table}: {counts['inserted']} inserted, {counts['updated']} updated, "
+        f"{counts['skipped']} skipped"
+    )
+    return counts
+
+
+def load_prepared(file_name):
+    """Read a prepared table, memory-mapping its binary copy if fresher than the CSV."""
+    if source_path(data_path / file_name).suffix == ".csv":
+        return pd.read_csv(data_path / file_name)
+    df = read_frame(data_path / file_name)
+    # Dates parsed by the prepare step are stored as the text the CSV holds
+    for col in df.select_dtypes("datetime").columns:
+        df[col] = df[col].dt.strftime("%Y-%m-%d")
+    return df
+
+
+def main():
+    """Load the prepared tables incrementally into the SQLite warehouse."""
+    # Connect to SQLite and load into tables
+    conn = sqlite3.connect(db_path)
+    conn.execute(LOAD_STATE_SQL)
+    load_table("customers_prepared.csv", "DimCustomer", "CustomerID", conn)
+    load_table("products_prepared.csv", "DimProduct", "ProductID", conn)
+    # Sales are append-only: rows at or below the TransactionID mark are not revisited
+    load_table("sales_prepared.csv", "FactSales", "TransactionID", conn, append_only=True)
 
-# Load CSVs
-customers = pd.read_csv(data_path / "customers_prepared.csv")
-products = pd.read_csv(data_path / "products_prepared.csv")
-sales = pd.read_csv(data_path / "sales_prepared.csv")
+    conn.commit()
+    conn.close()
+    print("✅ Data loaded successfully into SQLite warehouse.")
 
-# Load into tables
-customers.to_sql("DimCustomer", conn, if_exists="replace", index=False)
-products.to_sql("DimProduct", conn, if_exists="replace", index=False)
-sales.to_sql("FactSales", conn, if_exists="replace", index=False)
 
-conn.close()
-print("✅ Data loaded successfully into SQLite warehouse.")
+if __name__ == "__main__":
+    main()
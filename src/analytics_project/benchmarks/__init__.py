@@ -0,0 +1,3 @@
+# __init__.py
+# Benchmark scripts for the ETL and warehouse stages.
+# Run one with: uv run python -m analytics_project.benchmarks.<module_name>
@@ -0,0 +1,99 @@
+"""Benchmark date parsing: pd.to_datetime inference against DateParser.
+
+The raw sales file is repeated to the requested size and its SaleDate
+column is parsed three ways: pd.to_datetime with format inference, with
+the fixed format, and with DateParser (format detected once, each distinct
+value parsed once). The warehouse path (ISO text plus YYYYMMDD keys) is
+timed separately. Reports best-of-three seconds and rows per second.
+
+The raw file holds only two distinct sale dates; ``--distinct`` replaces
+them with that many dates in the same m/d/yy spelling.
+
+Module Information:
+    - Filename: bench_dates.py
+    - Module: bench_dates
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_dates --rows 1000000
+"""
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.benchmarks.bench_schemas import write_scaled_copy
+from analytics_project.dates import DateParser
+from analytics_project.schemas import SALES_SCHEMA, read_csv
+from analytics_project.utils_logger import init_logger, logger
+
+
+def spread_dates(rows: int, distinct: int, seed: int = 0) -> pd.Series:
+    """Return ``rows`` dates drawn from ``distinct`` days, spelled like 5/4/25."""
+    days = pd.date_range("2000-01-01", periods=distinct, freq="D")
+    spelled = np.array([f"{d.month}/{d.day}/{d.year % 100:02d}" for d in days], dtype=object)
+    picked = np.random.default_rng(seed).choice(spelled, rows)
+    return pd.Series(picked, name="SaleDate", dtype="category")
+
+
+def best_of_three(parse) -> float:
+    """Return the best wall time of three calls."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        parse()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--distinct", type=int, default=0, help="distinct dates (0 = as in raw)")
+    args = parser.parse_args()
+
+    init_logger()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_scaled_copy("sales", args.rows, Path(tmp))
+        dates = read_csv(path, usecols=["SaleDate"])["SaleDate"]
+    if args.distinct:
+        dates = spread_dates(len(dates), args.distinct)
+
+    as_text = dates.astype(object)
+    fmt = SALES_SCHEMA.date_formats["SaleDate"]
+    with warnings.catch_warnings():
+        # Inference warns that it falls back to dateutil per value
+        warnings.simplefilter("ignore", UserWarning)
+        timings = {
+            "to_datetime (inferred)": best_of_three(
+                lambda: pd.to_datetime(as_text, errors="coerce")
+            ),
+            "to_datetime (fixed)": best_of_three(
+                lambda: pd.to_datetime(as_text, format=fmt, errors="coerce")
+            ),
+            "DateParser.parse": best_of_three(lambda: DateParser().parse(as_text)),
+            "DateParser.parse (category)": best_of_three(lambda: DateParser().parse(dates)),
+            "DateParser.iso_and_keys": best_of_three(lambda: DateParser().iso_and_keys(dates)),
+        }
+
+    baseline = timings["to_datetime (inferred)"]
+    lines = [
+        f"DATE BENCHMARK ({len(dates)} rows, {dates.nunique()} distinct dates)",
+        f"{'method':<29}{'seconds':>9}{'rows/s':>13}{'speedup':>9}",
+        "-" * 60,
+    ]
+    for method, seconds in timings.items():
+        lines.append(
+            f"{method:<29}{seconds:>9.3f}{len(dates) / seconds:>13,.0f}{baseline / seconds:>8.1f}x"
+        )
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark bulk vs per-row warehouse loads.
+
+Replicates the cleaned sample CSVs up to the requested number of sale rows
+(giving each copy fresh sale IDs) and loads them into a throwaway SQLite
+database twice: once through the per-row iterrows() path and once through
+the bulk executemany() path.
+
+Module Information:
+    - Filename: bench_dw_load.py
+    - Module: bench_dw_load
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_dw_load --rows 200000
+"""
+
+import argparse
+from collections.abc import Callable
+from pathlib import Path
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.utils_logger import init_logger, logger
+
+
+def make_sales(rows: int) -> pd.DataFrame:
+    """Repeat the cleaned sales sample until it holds ``rows`` rows."""
+    sample = pd.read_csv(etl_to_dw.SALES_CSV)
+    copies = -(-rows // len(sample))  # ceiling division
+    sales = pd.concat([sample] * copies, ignore_index=True).head(rows)
+    sales["TransactionID"] = range(1, len(sales) + 1)
+    return sales
+
+
+def time_load(
+    load: Callable[[pd.DataFrame, pd.DataFrame, pd.DataFrame, sqlite3.Cursor], None],
+    customers: pd.DataFrame,
+    products: pd.DataFrame,
+    sales: pd.DataFrame,
+) -> float:
+    """Load all three tables into a fresh database and return seconds taken."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(Path(tmp) / "bench.db")
+        cursor = conn.cursor()
+        etl_to_dw.create_tables(cursor)
+        started = time.perf_counter()
+        load(customers, products, sales, cursor)
+        conn.commit()
+        elapsed = time.perf_counter() - started
+        conn.close()
+    return elapsed
+
+
+def load_rowwise(customers, products, sales, cursor) -> None:
+    """Load using the original iterrows() path."""
+    etl_to_dw.insert_customers_rowwise(customers, cursor)
+    etl_to_dw.insert_products_rowwise(products, cursor)
+    etl_to_dw.insert_sales_rowwise(sales, cursor)
+
+
+def make_bulk_loader(chunk_size: int) -> Callable:
+    """Return a loader using the executemany() path with ``chunk_size``."""
+
+    def load_bulk(customers, products, sales, cursor) -> None:
+        etl_to_dw.insert_customers(customers, cursor, chunk_size)
+        etl_to_dw.insert_products(products, cursor, chunk_size)
+        etl_to_dw.insert_sales(sales, cursor, chunk_size)
+
+    return load_bulk
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000, help="sale rows to load")
+    parser.add_argument("--chunk-size", type=int, default=etl_to_dw.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_logger()
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = make_sales(args.rows)
+
+    rowwise = time_load(load_rowwise, customers, products, sales)
+    bulk = time_load(make_bulk_loader(args.chunk_size), customers, products, sales)
+
+    summary = (
+        f"DW LOAD BENCHMARK ({len(sales)} sale rows, chunk_size={args.chunk_size})\n"
+        f"{'path':<12}{'seconds':>10}{'rows/sec':>14}\n"
+        f"{'-' * 36}\n"
+        f"{'rowwise':<12}{rowwise:>10.3f}{len(sales) / rowwise:>14,.0f}\n"
+        f"{'bulk':<12}{bulk:>10.3f}{len(sales) / bulk:>14,.0f}\n"
+        f"speedup: {rowwise / bulk:.1f}x\n"
+    )
+    logger.info("\n" + summary)
+
+
+if __name__ == "__main__":
+    main()
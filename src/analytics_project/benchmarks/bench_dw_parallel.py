@@ -0,0 +1,77 @@
+"""Benchmark the parallel sales load against the single-core streaming load.
+
+Writes a seeded synthetic sales file, then loads it into a fresh SQLite
+database once with load_sales_streaming() and once with
+load_sales_parallel() for each worker count. Throughput should rise with
+workers until the single writer thread is busy all the time; the ETL log
+line of each parallel run shows how busy the writer was.
+
+Module Information:
+    - Filename: bench_dw_parallel.py
+    - Module: bench_dw_parallel
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_dw_parallel --rows 2000000 --workers 1 2 4
+"""
+
+import argparse
+from pathlib import Path
+import sqlite3
+import tempfile
+import time
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.synthetic_data import write_dataset
+from analytics_project.utils_logger import init_logger, logger
+
+
+def time_load(csv_path: Path, db_path: Path, workers: int | None, shard_rows: int) -> float:
+    """Load the sales file into a new database; return seconds (streaming if workers is None)."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    cursor = conn.cursor()
+    etl_to_dw.apply_load_profile(conn, "fast")
+    etl_to_dw.create_tables(cursor)
+    started = time.perf_counter()
+    if workers is None:
+        etl_to_dw.load_sales_streaming(csv_path, cursor, shard_rows)
+    else:
+        etl_to_dw.load_sales_parallel(csv_path, cursor, workers, shard_rows)
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-rows", type=int, default=etl_to_dw.DEFAULT_READ_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    init_logger()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = write_dataset(Path(tmp), args.rows)["sales"]
+        for workers in [None, *args.workers]:
+            label = "streaming" if workers is None else f"{workers} workers"
+            db_path = Path(tmp) / f"{label.replace(' ', '_')}.db"
+            results[label] = time_load(csv_path, db_path, workers, args.shard_rows)
+
+    baseline = results["streaming"]
+    lines = [
+        f"PARALLEL SALES LOAD BENCHMARK ({args.rows} sale rows)",
+        f"{'mode':<12}{'seconds':>10}{'rows/sec':>14}{'speedup':>9}",
+        "-" * 45,
+    ]
+    lines += [
+        f"{label:<12}{seconds:>10.2f}{args.rows / seconds:>14,.0f}{baseline / seconds:>8.2f}x"
+        for label, seconds in results.items()
+    ]
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
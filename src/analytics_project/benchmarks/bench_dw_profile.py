@@ -0,0 +1,112 @@
+"""Benchmark the "safe" vs "fast" warehouse load profiles.
+
+Loads a synthetic sale table into a throwaway SQLite database under each
+entry in etl_to_dw.LOAD_PROFILES and reports wall-clock time, including
+the index build and ANALYZE at the end of the load.
+
+Module Information:
+    - Filename: bench_dw_profile.py
+    - Module: bench_dw_profile
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_dw_profile --rows 10000000
+"""
+
+import argparse
+from collections.abc import Iterator
+from pathlib import Path
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.utils_logger import init_logger, logger
+
+PAYMENT_TYPES = np.array(["Credit", "Cash", "PayPal", "GiftCard"], dtype=object)
+
+
+def synthetic_sale_chunks(rows: int, chunk_size: int, seed: int = 42) -> Iterator[list[tuple]]:
+    """Yield insert-ready sale tuples in chunks, generated column-wise."""
+    rng = np.random.default_rng(seed)
+    days = [(m, d) for m in range(1, 13) for d in range(1, 29)]
+    # ISO sale_date plus its date_dim key, as prepare_sales() produces them
+    dates = np.array([f"2025-{m:02d}-{d:02d}" for m, d in days], dtype=object)
+    date_keys = np.array([20250000 + m * 100 + d for m, d in days])
+    for start in range(0, rows, chunk_size):
+        n = min(chunk_size, rows - start)
+        day = rng.integers(0, len(dates), n)
+        customers = rng.integers(1000, 1200, n)
+        products = rng.integers(2000, 2100, n)
+        yield list(
+            zip(
+                range(start + 1, start + n + 1),
+                customers.tolist(),
+                products.tolist(),
+                rng.uniform(1, 5000, n).round(2).tolist(),
+                dates[day].tolist(),
+                PAYMENT_TYPES[rng.integers(0, len(PAYMENT_TYPES), n)].tolist(),
+                date_keys[day].tolist(),
+                # Surrogate keys of a history with one version per ID
+                (customers - 999).tolist(),
+                (products - 1999).tolist(),
+                strict=True,
+            )
+        )
+
+
+def time_profile(profile: str, rows: int, chunk_size: int, db_path: Path) -> float:
+    """Load ``rows`` synthetic sales under ``profile`` and return seconds taken."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    started = time.perf_counter()
+
+    settings = etl_to_dw.apply_load_profile(conn, profile)
+    etl_to_dw.create_tables(cursor)
+    if settings["defer_indexes"]:
+        etl_to_dw.drop_secondary_indexes(cursor)
+    else:
+        etl_to_dw.create_secondary_indexes(cursor)
+
+    for chunk in synthetic_sale_chunks(rows, chunk_size):
+        cursor.executemany(etl_to_dw.SALE_INSERT_SQL, chunk)
+
+    etl_to_dw.finish_load(cursor)
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    return elapsed
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--chunk-size", type=int, default=etl_to_dw.DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_logger()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in etl_to_dw.LOAD_PROFILES:
+            results[profile] = time_profile(
+                profile, args.rows, args.chunk_size, Path(tmp) / f"{profile}.db"
+            )
+
+    lines = [
+        f"LOAD PROFILE BENCHMARK ({args.rows} sale rows)",
+        f"{'profile':<10}{'seconds':>10}{'rows/sec':>14}",
+        "-" * 34,
+    ]
+    lines += [
+        f"{profile:<10}{seconds:>10.2f}{args.rows / seconds:>14,.0f}"
+        for profile, seconds in results.items()
+    ]
+    lines.append(f"fast vs safe: {results['safe'] / results['fast']:.1f}x")
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
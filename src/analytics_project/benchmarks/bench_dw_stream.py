@@ -0,0 +1,84 @@
+"""Benchmark peak memory of full vs streaming sales loads.
+
+Writes synthetic sales CSVs of increasing size, then loads each one into a
+throwaway SQLite database in a fresh child process, once with the whole
+file read up front and once streamed in chunks. The child reports its peak
+resident set size, so the streaming column should stay flat as files grow.
+
+Module Information:
+    - Filename: bench_dw_stream.py
+    - Module: bench_dw_stream
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_dw_stream --rows 100000 400000
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+from pathlib import Path
+import resource
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from analytics_project.benchmarks.bench_dw_load import make_sales
+from analytics_project.dw import etl_to_dw
+from analytics_project.utils_logger import init_logger, logger
+
+
+def load_in_child(csv_path: Path, db_path: Path, stream: bool, read_chunk_rows: int):
+    """Load one sales CSV and return (seconds, peak RSS in MB)."""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    started = time.perf_counter()
+    if stream:
+        etl_to_dw.load_sales_streaming(csv_path, cursor, read_chunk_rows)
+    else:
+        etl_to_dw.insert_sales(pd.read_csv(csv_path), cursor)
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    conn.close()
+    # ru_maxrss is reported in kilobytes on Linux
+    return elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_isolated(csv_path: Path, db_path: Path, stream: bool, read_chunk_rows: int):
+    """Run load_in_child() in a brand-new process so peak RSS is not shared."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(load_in_child, csv_path, db_path, stream, read_chunk_rows).result()
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000, 1_600_000])
+    parser.add_argument("--read-chunk-rows", type=int, default=etl_to_dw.DEFAULT_READ_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    init_logger()
+    lines = [
+        f"STREAMING LOAD BENCHMARK (read_chunk_rows={args.read_chunk_rows})",
+        f"{'rows':>10}{'mode':>8}{'seconds':>10}{'peak MB':>10}",
+        "-" * 38,
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            csv_path = Path(tmp) / f"sales_{rows}.csv"
+            make_sales(rows).to_csv(csv_path, index=False)
+            for stream in (False, True):
+                db_path = Path(tmp) / f"bench_{rows}_{stream}.db"
+                seconds, peak_mb = run_isolated(csv_path, db_path, stream, args.read_chunk_rows)
+                mode = "stream" if stream else "full"
+                lines.append(f"{rows:>10}{mode:>8}{seconds:>10.2f}{peak_mb:>10.1f}")
+
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark the pipeline end to end with CSV and binary intermediates.
+
+The raw sales file is replicated to the requested number of rows (giving
+each copy fresh transaction IDs, so cleaning keeps them) next to the raw
+customer and product files. Each intermediate format then runs the same
+pipeline in a temp folder: data_prep cleans the three files, and the
+warehouse ETL reads the cleaned tables and bulk-loads a fresh SQLite
+database. Reports seconds per stage, the intermediate size on disk and
+the end-to-end total.
+
+Module Information:
+    - Filename: bench_intermediate.py
+    - Module: bench_intermediate
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_intermediate --rows 1000000
+"""
+
+import argparse
+import contextlib
+import io
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import pandas as pd
+
+from analytics_project.data_prep import CLEANING_JOBS, RAW_DIR, process_file
+from analytics_project.dw import etl_to_dw
+from analytics_project.intermediate import output_paths, read_frame
+from analytics_project.utils_logger import init_logger, logger
+
+
+def write_raw_copy(rows: int, folder: Path) -> None:
+    """Copy the raw files into ``folder``, with the sales file grown to ``rows`` rows."""
+    for job in CLEANING_JOBS:
+        shutil.copyfile(RAW_DIR / job["file_name"], folder / job["file_name"])
+    sample = pd.read_csv(RAW_DIR / "sales_data.csv", dtype=str)
+    copies = -(-rows // len(sample))  # ceiling division
+    sales = pd.concat([sample] * copies, ignore_index=True).head(rows)
+    sales["TransactionID"] = range(1, len(sales) + 1)
+    sales.to_csv(folder / "sales_data.csv", index=False)
+
+
+def disk_bytes(path: Path) -> int:
+    """Return the size of a file or of every file under a folder."""
+    if path.is_dir():
+        return sum(file.stat().st_size for file in path.rglob("*") if file.is_file())
+    return path.stat().st_size
+
+
+def run_pipeline(raw_dir: Path, work_dir: Path, output_format: str) -> dict[str, float]:
+    """Clean, read and load once; return seconds per stage and intermediate MB."""
+    processed_dir = work_dir / "processed"
+    processed_dir.mkdir(parents=True)
+
+    started = time.perf_counter()
+    # process_file() prints a line per file; keep the report readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for job in CLEANING_JOBS:
+            process_file(
+                **job, raw_dir=raw_dir, processed_dir=processed_dir, output_format=output_format
+            )
+    cleaned = time.perf_counter()
+
+    paths = [
+        processed_dir / job["file_name"].replace(".csv", "_cleaned.csv") for job in CLEANING_JOBS
+    ]
+    customers, products, sales = (read_frame(path) for path in paths)
+    read = time.perf_counter()
+
+    conn = sqlite3.connect(work_dir / "dw.db")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.insert_customers(customers, cursor)
+    etl_to_dw.insert_products(products, cursor)
+    etl_to_dw.insert_sales(sales, cursor)
+    conn.commit()
+    conn.close()
+    loaded = time.perf_counter()
+
+    size = sum(disk_bytes(out) for path in paths for out in output_paths(path, output_format))
+    return {
+        "clean": cleaned - started,
+        "read": read - cleaned,
+        "load": loaded - read,
+        "total": loaded - started,
+        "MB": size / 2**20,
+    }
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="raw sale rows")
+    args = parser.parse_args()
+
+    init_logger()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = Path(tmp) / "raw"
+        raw_dir.mkdir()
+        write_raw_copy(args.rows, raw_dir)
+        for output_format in ("csv", "npy"):
+            results[output_format] = run_pipeline(raw_dir, Path(tmp) / output_format, output_format)
+
+    columns = ("clean", "read", "load", "total", "MB")
+    lines = [
+        f"INTERMEDIATE FORMAT BENCHMARK ({args.rows} raw sale rows)",
+        f"{'format':<8}" + "".join(f"{col:>10}" for col in columns),
+        "-" * 58,
+    ]
+    for output_format, timings in results.items():
+        lines.append(f"{output_format:<8}" + "".join(f"{timings[col]:>10.3f}" for col in columns))
+    csv, npy = results["csv"], results["npy"]
+    lines.append(
+        f"read speedup: {csv['read'] / npy['read']:.1f}x, "
+        f"end to end: {csv['total'] / npy['total']:.2f}x"
+    )
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""Benchmark logging throughput in a hot loop.
+
+Each case logs ``--records`` records from one loop and reports the
+seconds the loop took (what the ETL pays) and records per second:
+    - disabled DEBUG calls, with an f-string message against lazy
+      ``"{}"`` arguments Loguru never formats
+    - the text file sink with enqueue=True, as init_logger() adds it
+      (Loguru's unbounded queue, which pickles each record through a
+      pipe), and written synchronously
+    - JsonLinesSink, with a queue large enough for the run and with a
+      small one that drops records under pressure (the "drain" column is
+      the extra time until everything queued is on disk)
+    - throttled() sampling every 1000th record into the text file
+    - stdlib ``logging`` routed through InterceptHandler
+
+Module Information:
+    - Filename: bench_logging.py
+    - Module: bench_logging
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_logging --records 200000
+"""
+
+import argparse
+from collections.abc import Callable
+import logging
+from pathlib import Path
+import tempfile
+import time
+
+from loguru import logger
+
+from analytics_project.utils_logger import InterceptHandler, JsonLinesSink, init_logger, throttled
+
+FMT = "{time:YYYY-MM-DD HH:mm}:{level:<7} AT {file}:{line}: {message}"
+
+
+def timed(emit: Callable[[int], None], records: int, drain: Callable[[], None] | None = None):
+    """Call emit(i) for each record; return (loop seconds, drain seconds)."""
+    started = time.perf_counter()
+    for i in range(records):
+        emit(i)
+    loop = time.perf_counter() - started
+    if drain is None:
+        return loop, 0.0
+    started = time.perf_counter()
+    drain()
+    return loop, time.perf_counter() - started
+
+
+def run_cases(records: int, folder: Path) -> dict[str, tuple[float, float]]:
+    """Time every case with only its own sink attached."""
+    timings = {}
+    row = {"sale_id": 1, "amount": 12.5}
+
+    logger.remove()
+    logger.add(folder / "null.log", level="INFO", format=FMT)
+    timings["debug off, f-string"] = timed(
+        lambda i: logger.debug(f"row {i}: {row} failed"), records
+    )
+    timings["debug off, lazy args"] = timed(
+        lambda i: logger.debug("row {}: {} failed", i, row), records
+    )
+
+    for name, enqueue in (("text file, enqueue", True), ("text file, sync", False)):
+        logger.remove()
+        logger.add(folder / f"{enqueue}.log", level="INFO", format=FMT, enqueue=enqueue)
+        timings[name] = timed(
+            lambda i: logger.info("row {}: {} failed", i, row), records, logger.complete
+        )
+
+    for name, max_queue in (
+        ("JSON lines, queue fits", records + 1),
+        ("JSON lines, queue 1000", 1000),
+    ):
+        logger.remove()
+        sink = JsonLinesSink(folder / f"{max_queue}.jsonl", max_queue=max_queue)
+        logger.add(sink, level="INFO", format="{message}")
+        timings[name] = timed(
+            lambda i: logger.info("row {}: {} failed", i, row), records, sink.join
+        )
+
+    logger.remove()
+    logger.add(folder / "throttled.log", level="INFO", format=FMT)
+    timings["throttled every 1000"] = timed(
+        lambda i: throttled("WARNING", "row {}: {} failed", i, row, every=1000), records
+    )
+
+    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    stdlib = logging.getLogger("bench")
+    timings["stdlib via Loguru"] = timed(
+        lambda i: stdlib.info("row %s: %s failed", i, row), records
+    )
+    logger.remove()
+    return timings
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = run_cases(args.records, Path(tmp))
+
+    # run_cases() replaced the sinks; restore the project's before reporting
+    init_logger()
+    lines = [
+        f"LOGGING BENCHMARK ({args.records} records per case)",
+        f"{'case':<25}{'loop s':>9}{'drain s':>9}{'records/s':>13}",
+        "-" * 56,
+    ]
+    for case, (loop, drain) in timings.items():
+        lines.append(f"{case:<25}{loop:>9.3f}{drain:>9.3f}{args.records / loop:>13,.0f}")
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
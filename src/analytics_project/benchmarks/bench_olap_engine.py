@@ -0,0 +1,137 @@
+"""Benchmark the in-process OLAP engine against Spark over the warehouse.
+
+Runs the reporting notebook queries (slice on payment type, dice on
+region + payment type, ROLLUP over region/payment type/category) end to
+end: session start-up, table load and query. The Spark side reads the
+tables through the SQLite JDBC driver when ``--jdbc-jar`` is given, and
+from pandas otherwise. Results from both engines are checked against each
+other before timings are reported.
+
+Module Information:
+    - Filename: bench_olap_engine.py
+    - Module: bench_olap_engine
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_olap_engine --jdbc-jar lib/sqlite-jdbc.jar
+"""
+
+import argparse
+from pathlib import Path
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.olap_engine import DW_PATH, SalesCube
+from analytics_project.utils_logger import init_logger, logger
+
+ROLLUP_DIMS = ["region", "payment_type", "category"]
+
+SPARK_ROLLUP_SQL = """
+    SELECT c.region, s.payment_type, p.category, SUM(s.sale_amount_usd) AS total_sales
+    FROM sale s
+    JOIN customer c ON s.customer_id = c.customer_id
+    JOIN product p ON s.product_id = p.product_id
+    GROUP BY ROLLUP (c.region, s.payment_type, p.category)
+"""
+
+SPARK_DICE_SQL = """
+    SELECT c.region, s.payment_type, p.category, SUM(s.sale_amount_usd) AS total_sales
+    FROM sale s
+    JOIN customer c ON s.customer_id = c.customer_id
+    JOIN product p ON s.product_id = p.product_id
+    WHERE c.region = 'South' AND s.payment_type = 'Credit'
+    GROUP BY c.region, s.payment_type, p.category
+"""
+
+
+def run_engine(db_path: Path) -> tuple[float, dict[str, pd.DataFrame]]:
+    """Load the cube and run the notebook queries; return seconds and results."""
+    started = time.perf_counter()
+    cube = SalesCube.from_warehouse(db_path)
+    results = {
+        "slice_rows": pd.DataFrame({"rows": [len(cube.slice("payment_type", "Credit"))]}),
+        "dice": cube.dice({"region": "South", "payment_type": "Credit"}).aggregate(ROLLUP_DIMS),
+        "rollup": cube.rollup(ROLLUP_DIMS),
+    }
+    return time.perf_counter() - started, results
+
+
+def run_spark(db_path: Path, jdbc_jar: str | None) -> tuple[float, dict[str, pd.DataFrame]]:
+    """Start Spark, load the tables and run the notebook queries."""
+    from pyspark.sql import SparkSession
+
+    started = time.perf_counter()
+    builder = SparkSession.builder.appName("OlapBenchmark")
+    if jdbc_jar:
+        builder = builder.config("spark.driver.extraClassPath", jdbc_jar)
+    spark = builder.getOrCreate()
+
+    for table in ("sale", "customer", "product"):
+        if jdbc_jar:
+            df = (
+                spark.read.format("jdbc")
+                .options(url=f"jdbc:sqlite:{db_path}", dbtable=table)
+                .load()
+            )
+        else:
+            with sqlite3.connect(db_path) as conn:
+                df = spark.createDataFrame(pd.read_sql_query(f"SELECT * FROM {table}", conn))  # noqa: S608
+        df.createOrReplaceTempView(table)
+
+    results = {
+        "slice_rows": pd.DataFrame(
+            {"rows": [spark.sql("SELECT * FROM sale WHERE payment_type = 'Credit'").count()]}
+        ),
+        "dice": spark.sql(SPARK_DICE_SQL).toPandas(),
+        "rollup": spark.sql(SPARK_ROLLUP_SQL).toPandas(),
+    }
+    elapsed = time.perf_counter() - started
+    spark.stop()
+    return elapsed, results
+
+
+def check_same_totals(engine: dict[str, pd.DataFrame], spark: dict[str, pd.DataFrame]) -> None:
+    """Compare the summed measure of each engine's results."""
+    for name in ("dice", "rollup"):
+        ours = engine[name].iloc[:, -1].sum()
+        theirs = spark[name].iloc[:, -1].sum()
+        if not np.isclose(ours, theirs) or len(engine[name]) != len(spark[name]):
+            raise AssertionError(
+                f"{name}: engine {ours} ({len(engine[name])} rows) vs spark {theirs}"
+            )
+    logger.info("Engine and Spark results agree.")
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", type=Path, default=DW_PATH)
+    parser.add_argument("--jdbc-jar", default=None, help="path to sqlite-jdbc.jar")
+    args = parser.parse_args()
+
+    init_logger()
+    engine_seconds, engine_results = run_engine(args.db)
+    lines = [
+        f"OLAP ENGINE BENCHMARK ({args.db.name})",
+        f"{'engine':<10}{'seconds':>10}",
+        "-" * 20,
+        f"{'numpy':<10}{engine_seconds:>10.3f}",
+    ]
+
+    try:
+        spark_seconds, spark_results = run_spark(args.db, args.jdbc_jar)
+    except ImportError as e:
+        logger.warning(f"Spark not available, skipping comparison: {e}")
+    else:
+        check_same_totals(engine_results, spark_results)
+        lines.append(f"{'spark':<10}{spark_seconds:>10.3f}")
+        lines.append(f"speedup: {spark_seconds / engine_seconds:.1f}x")
+
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark one-pass profiling against the repeated pandas passes it replaces.
+
+A prepare run calls check_data_consistency_before_cleaning(), inspect_data()
+and check_data_consistency_after_cleaning(); before profiling these ran
+isnull().sum() and duplicated().sum() twice plus info() and describe().
+This times that sequence against building one DataProfile, and against
+profiling the same rows as chunks merged from separate profiles.
+
+Module Information:
+    - Filename: bench_profiling.py
+    - Module: bench_profiling
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_profiling --rows 2000000
+"""
+
+import argparse
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.benchmarks.bench_scrubber_lazy import make_sales
+from analytics_project.profiling import DataProfile
+from analytics_project.utils_logger import init_logger, logger
+
+
+def repeated_passes(df: pd.DataFrame) -> None:
+    """Run the checks and inspection as separate pandas passes."""
+    for _ in range(2):
+        df.isnull().sum()
+        df.duplicated().sum()
+    df.info(buf=io.StringIO())
+    df.describe()
+
+
+def one_pass(df: pd.DataFrame) -> DataProfile:
+    """Everything the checks and inspection need, in one profile."""
+    profile = DataProfile.from_frame(df)
+    profile.info_text()
+    profile.describe()
+    return profile
+
+
+def merged_chunks(df: pd.DataFrame, chunks: int) -> DataProfile:
+    """Profile chunks separately (as workers would) and merge them."""
+    profiles = [DataProfile.from_frame(part) for part in np.array_split(df, chunks)]
+    merged = profiles[0]
+    for profile in profiles[1:]:
+        merged.merge(profile)
+    return merged
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--chunks", type=int, default=8)
+    args = parser.parse_args()
+
+    init_logger()
+    df = make_sales(args.rows)
+    timings = {}
+    for name, run in (
+        ("pandas", lambda: repeated_passes(df)),
+        ("profile", lambda: one_pass(df)),
+        ("merged", lambda: merged_chunks(df, args.chunks)),
+    ):
+        started = time.perf_counter()
+        result = run()
+        timings[name] = time.perf_counter() - started
+        if isinstance(result, DataProfile):
+            assert result.null_counts.equals(df.isnull().sum())
+
+    lines = [
+        f"PROFILING BENCHMARK ({len(df)} rows)",
+        f"{'method':<10}{'seconds':>10}",
+        "-" * 20,
+    ]
+    lines += [f"{name:<10}{seconds:>10.3f}" for name, seconds in timings.items()]
+    lines.append(f"profile vs pandas: {timings['profile'] / timings['pandas']:.0%} of the time")
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark default pd.read_csv dtypes against the schemas.py registry.
+
+Each raw source file is repeated to the requested size in a temp folder and
+read both ways. Reports parse time (best of three) and the frame's deep
+memory footprint per table.
+
+Module Information:
+    - Filename: bench_schemas.py
+    - Module: bench_schemas
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_schemas --rows 1000000
+"""
+
+import argparse
+from pathlib import Path
+import tempfile
+import time
+
+import pandas as pd
+
+from analytics_project.data_prep import RAW_DIR
+from analytics_project.schemas import SCHEMAS, read_csv
+from analytics_project.utils_logger import init_logger, logger
+
+
+def write_scaled_copy(table: str, rows: int, folder: Path) -> Path:
+    """Repeat a raw source file until it has about ``rows`` data rows."""
+    source = RAW_DIR / f"{table}_data.csv"
+    header, *lines = source.read_text().splitlines(keepends=True)
+    path = folder / source.name
+    with path.open("w") as f:
+        f.write(header)
+        for _ in range(max(1, rows // len(lines))):
+            f.writelines(lines)
+    return path
+
+
+def measure(read) -> tuple[float, float, int]:
+    """Return best-of-three seconds, deep MB and row count for one reader."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        df = read()
+        best = min(best, time.perf_counter() - started)
+    return best, df.memory_usage(deep=True).sum() / 2**20, len(df)
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    init_logger()
+    lines = [
+        f"SCHEMA BENCHMARK (~{args.rows} rows per table)",
+        f"{'table':<11}{'mode':<9}{'seconds':>9}{'MB':>9}{'memory':>9}",
+        "-" * 47,
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        for table in SCHEMAS:
+            path = write_scaled_copy(table, args.rows, Path(tmp))
+            default = measure(lambda path=path: pd.read_csv(path))
+            typed = measure(lambda path=path: read_csv(path))
+            lines.append(f"{table:<11}{'default':<9}{default[0]:>9.3f}{default[1]:>9.1f}")
+            lines.append(
+                f"{'':<11}{'schema':<9}{typed[0]:>9.3f}{typed[1]:>9.1f}"
+                f"{default[1] / typed[1]:>8.1f}x"
+            )
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Benchmark eager DataScrubber against the fused LazyDataScrubber plan.
+
+Runs the same cleaning chain (dedupe, fill, three outlier filters and two
+string normalizations) both ways over a synthetic sales frame and reports
+wall-clock time and peak traced memory. Results are checked to be equal.
+
+Module Information:
+    - Filename: bench_scrubber_lazy.py
+    - Module: bench_scrubber_lazy
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_scrubber_lazy --rows 2000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.data_scrubber import DataScrubber, LazyDataScrubber
+from analytics_project.utils_logger import init_logger, logger
+
+PAYMENT_TYPES = np.array([" Credit", "cash ", "PayPal", "GiftCard", None], dtype=object)
+REGIONS = np.array(["East", "west ", " North", "SOUTH", "Central"], dtype=object)
+
+
+def make_sales(rows: int, seed: int = 42) -> pd.DataFrame:
+    """Build a dirty sales frame with repeated rows and missing values."""
+    rng = np.random.default_rng(seed)
+    amount = rng.uniform(-50, 6000, rows).round(2)
+    amount[rng.random(rows) < 0.02] = np.nan
+    df = pd.DataFrame(
+        {
+            "TransactionID": rng.integers(1, rows // 2 + 2, rows),
+            "CustomerID": rng.integers(1000, 1200, rows),
+            "StoreID": rng.integers(400, 410, rows).astype(float),
+            "SaleAmount": amount,
+            "DiscountPct": rng.uniform(-0.1, 1.1, rows).round(2),
+            "PaymentType": PAYMENT_TYPES[rng.integers(0, len(PAYMENT_TYPES), rows)],
+            "Region": REGIONS[rng.integers(0, len(REGIONS), rows)],
+        }
+    )
+    # Roughly 5% exact duplicate rows
+    return pd.concat([df, df.sample(frac=0.05, random_state=seed)], ignore_index=True)
+
+
+def clean(scrubber: DataScrubber) -> pd.DataFrame:
+    """Apply the benchmark cleaning chain and return the result."""
+    scrubber.remove_duplicate_records()
+    scrubber.handle_missing_data(fill_value=0)
+    scrubber.filter_column_outliers("SaleAmount", 0, 5000)
+    scrubber.filter_column_outliers("DiscountPct", 0, 1)
+    scrubber.filter_column_outliers("StoreID", 401, 409)
+    scrubber.format_column_strings_to_lower_and_trim("PaymentType")
+    scrubber.format_column_strings_to_upper_and_trim("Region")
+    if isinstance(scrubber, LazyDataScrubber):
+        return scrubber.execute()
+    return scrubber.df
+
+
+def measure(scrubber_class: type, df: pd.DataFrame) -> tuple[float, float, pd.DataFrame]:
+    """Return seconds, peak traced MB and the result for one mode."""
+    started = time.perf_counter()
+    result = clean(scrubber_class(df.copy()))
+    seconds = time.perf_counter() - started
+
+    # Separate run for memory: tracing slows the allocations it observes
+    data = df.copy()
+    tracemalloc.start()
+    clean(scrubber_class(data))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, result
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    init_logger()
+    df = make_sales(args.rows)
+    eager = measure(DataScrubber, df)
+    lazy = measure(LazyDataScrubber, df)
+    pd.testing.assert_frame_equal(eager[2], lazy[2])
+
+    lines = [
+        f"SCRUBBER BENCHMARK ({len(df)} rows in, {len(lazy[2])} rows out)",
+        f"{'mode':<8}{'seconds':>10}{'peak MB':>10}",
+        "-" * 28,
+        f"{'eager':<8}{eager[0]:>10.3f}{eager[1]:>10.1f}",
+        f"{'lazy':<8}{lazy[0]:>10.3f}{lazy[1]:>10.1f}",
+        f"lazy vs eager: {eager[0] / lazy[0]:.1f}x faster, {eager[1] / lazy[1]:.1f}x less peak memory",
+    ]
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark demo_module_stats on a large column of sale amounts.
+
+``--rows`` seeded, skewed sale amounts are summarized (min, max, mean,
+stdev, median) four ways:
+    - the calculate_* functions on a Python list (the statistics module)
+    - the calculate_* functions on a NumPy array (NumPy fast path)
+    - StreamingStats fed ``--chunk-rows`` values at a time
+    - four StreamingStats, one per quarter of the data, merged at the end
+Reports seconds, speedup over the list path and each method's distance
+from the statistics results (the median as a relative error, since the
+streaming median is sketched).
+
+Module Information:
+    - Filename: bench_stats.py
+    - Module: bench_stats
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_stats --rows 1000000
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from analytics_project.demo_module_stats import (
+    StreamingStats,
+    calculate_max,
+    calculate_mean,
+    calculate_min,
+    calculate_standard_deviation,
+)
+from analytics_project.utils_logger import init_logger, logger
+
+
+def sale_amounts(rows: int, seed: int = 0) -> np.ndarray:
+    """Return ``rows`` cent-rounded, right-skewed sale amounts."""
+    return np.round(np.random.default_rng(seed).lognormal(4.0, 1.0, rows), 2)
+
+
+def with_functions(scores) -> tuple[float, ...]:
+    """Summarize with the calculate_* functions (median from statistics)."""
+    median = statistics.median(scores) if isinstance(scores, list) else float(np.median(scores))
+    return (
+        calculate_min(scores),
+        calculate_max(scores),
+        calculate_mean(scores),
+        calculate_standard_deviation(scores),
+        median,
+    )
+
+
+def with_stream(stats: StreamingStats) -> tuple[float, ...]:
+    """Read the same summary off a StreamingStats."""
+    return stats.min, stats.max, stats.mean, stats.stdev, stats.quantile(0.5)
+
+
+def main() -> None:
+    """Run the benchmark and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    init_logger()
+    amounts = sale_amounts(args.rows)
+    chunks = [amounts[i : i + args.chunk_rows] for i in range(0, len(amounts), args.chunk_rows)]
+    as_list = amounts.tolist()
+
+    def merged() -> tuple[float, ...]:
+        parts = [StreamingStats.from_chunks([part]) for part in np.array_split(amounts, 4)]
+        total = StreamingStats()
+        for part in parts:
+            total.merge(part)
+        return with_stream(total)
+
+    methods = {
+        "statistics (list)": lambda: with_functions(as_list),
+        "NumPy fast path (array)": lambda: with_functions(amounts),
+        "StreamingStats (chunks)": lambda: with_stream(StreamingStats.from_chunks(chunks)),
+        "StreamingStats (4 merged)": merged,
+    }
+    results = {}
+    for name, method in methods.items():
+        started = time.perf_counter()
+        summary = method()
+        results[name] = (time.perf_counter() - started, summary)
+
+    baseline_seconds, expected = results["statistics (list)"]
+    lines = [
+        f"STATS BENCHMARK ({args.rows} values, chunks of {args.chunk_rows})",
+        f"{'method':<27}{'seconds':>9}{'speedup':>9}{'max |d| moments':>17}{'median rel':>12}",
+        "-" * 74,
+    ]
+    for name, (seconds, summary) in results.items():
+        moments_error = max(
+            abs(got - want) for got, want in zip(summary[:4], expected[:4], strict=True)
+        )
+        median_error = abs(summary[4] / expected[4] - 1)
+        lines.append(
+            f"{name:<27}{seconds:>9.3f}{baseline_seconds / seconds:>8.1f}x"
+            f"{moments_error:>17.2e}{median_error:>12.2e}"
+        )
+    logger.info("\n" + "\n".join(lines) + "\n")
+
+
+if __name__ == "__main__":
+    main()
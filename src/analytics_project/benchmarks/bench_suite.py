@@ -0,0 +1,286 @@
+"""Benchmark every pipeline stage at increasing scales and keep the results.
+
+For each scale, a seeded dataset with the default dirty-value rates is
+written by synthetic_data. The stages then run on it in order:
+    - clean: data_prep cleans the three raw files (DataScrubber steps)
+    - prepare: the prepare engine writes the three prepared tables
+    - load: the warehouse ETL reads the cleaned tables and bulk-loads a
+      fresh SQLite database, then builds its indexes
+
+Each stage runs in a fresh worker process, so its peak RSS is its own.
+Every measurement is appended as one JSON line to the results file,
+tagged with the git commit, so runs from different commits can be
+compared. The summary table shows the change against the latest run of
+the same stage and scale from another commit.
+
+Module Information:
+    - Filename: bench_suite.py
+    - Module: bench_suite
+    - Location: src/analytics_project/benchmarks/
+
+Usage:
+    uv run python -m analytics_project.benchmarks.bench_suite --scales 10000 100000 1000000
+"""
+
+import argparse
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+from datetime import UTC, datetime
+import io
+import json
+import multiprocessing
+import os
+from pathlib import Path
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from analytics_project.data_prep import CLEANING_JOBS, process_file
+from analytics_project.data_preparation.prepare_engine import prepare_tables
+from analytics_project.dw import etl_to_dw
+from analytics_project.intermediate import read_frame
+from analytics_project.synthetic_data import write_dataset
+from analytics_project.utils_logger import init_logger, logger, project_root
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000)
+DEFAULT_RESULTS = project_root / "data" / "benchmarks" / "bench_suite.jsonl"
+
+
+# ---------------- Stages ----------------
+# Each stage takes the scale's work folder and returns the rows it wrote.
+
+
+def clean_stage(work_dir: Path) -> int:
+    """Clean the raw files into work_dir/processed."""
+    rows = 0
+    for job in CLEANING_JOBS:
+        rows += process_file(**job, raw_dir=work_dir / "raw", processed_dir=work_dir / "processed")
+    return rows
+
+
+def prepare_stage(work_dir: Path) -> int:
+    """Prepare the raw files into work_dir/prepared."""
+    results = prepare_tables(raw_dir=work_dir / "raw", prepared_dir=work_dir / "prepared")
+    return sum(result.rows for result in results.values())
+
+
+def load_stage(work_dir: Path) -> int:
+    """Load the cleaned files into a fresh work_dir/dw.db."""
+    db_path = work_dir / "dw.db"
+    db_path.unlink(missing_ok=True)
+    processed = work_dir / "processed"
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.drop_secondary_indexes(cursor)
+    etl_to_dw.insert_customers(read_frame(processed / "customers_data_cleaned.csv"), cursor)
+    etl_to_dw.insert_products(read_frame(processed / "products_data_cleaned.csv"), cursor)
+    etl_to_dw.insert_sales(read_frame(processed / "sales_data_cleaned.csv"), cursor)
+    etl_to_dw.finish_load(cursor)
+    conn.commit()
+    rows = sum(
+        cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608 - fixed names
+        for table in ("customer", "product", "sale")
+    )
+    conn.close()
+    return rows
+
+
+STAGES: dict[str, Callable[[Path], int]] = {
+    "clean": clean_stage,
+    "prepare": prepare_stage,
+    "load": load_stage,
+}
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def measure(stage: str, work_dir: Path) -> dict:
+    """Run one stage in this process; return rows, seconds and peak RSS."""
+    # Keep the per-file prints and per-chunk ETL logging out of the report
+    logger.disable("analytics_project")
+    started_cpu = time.process_time()
+    started = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows = STAGES[stage](work_dir)
+    finally:
+        logger.enable("analytics_project")
+    seconds = time.perf_counter() - started
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(time.process_time() - started_cpu, 4),
+        "rows_per_second": round(rows / seconds, 1) if seconds > 0 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def measure_isolated(stage: str, work_dir: Path) -> dict:
+    """Run one stage in a freshly spawned process, so peak RSS covers only it."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(measure, stage, work_dir).result()
+
+
+# ---------------- Results ----------------
+
+
+def git_commit() -> str | None:
+    """Return the current commit hash, with "+dirty" for uncommitted changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607 - git from PATH
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],  # noqa: S607
+            cwd=project_root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}+dirty" if dirty else commit
+
+
+def load_results(path: Path) -> list[dict]:
+    """Read every earlier result line (an unreadable line is skipped)."""
+    if not path.exists():
+        return []
+    results = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        with contextlib.suppress(ValueError):
+            results.append(json.loads(line))
+    return results
+
+
+def baseline_for(history: Sequence[dict], result: dict) -> dict | None:
+    """Return the latest earlier result for the same stage and scale from another commit."""
+    for old in reversed(history):
+        if (
+            old.get("stage") == result["stage"]
+            and old.get("scale") == result["scale"]
+            and old.get("commit") != result["commit"]
+        ):
+            return old
+    return None
+
+
+def run_suite(
+    scales: Sequence[int],
+    stages: Sequence[str] = tuple(STAGES),
+    seed: int = 42,
+    isolate: bool = True,
+    results_path: Path | None = DEFAULT_RESULTS,
+) -> list[dict]:
+    """Run the stages at each scale; append and return one result per stage and scale.
+
+    Args:
+        scales: Sales rows of each generated dataset.
+        stages: Stages to time, in order ("load" needs "clean" before it).
+        seed: Seed for the generated data.
+        isolate: Run each stage in its own process (peak RSS per stage).
+        results_path: JSON-lines file to append to; None keeps nothing.
+    """
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {sorted(unknown)}; choose from {list(STAGES)}")
+    if "load" in stages and "clean" not in stages:
+        raise ValueError('The "load" stage reads the output of "clean"; run both')
+
+    run = {
+        "run_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "cpus": os.cpu_count(),
+        "seed": seed,
+    }
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            work_dir = Path(tmp)
+            started = time.perf_counter()
+            write_dataset(work_dir / "raw", scale, seed=seed)
+            logger.info(f"Generated {scale} sale rows in {time.perf_counter() - started:.1f}s")
+            for stage in (name for name in STAGES if name in stages):
+                measured = (measure_isolated if isolate else measure)(stage, work_dir)
+                results.append({**run, "scale": scale, "stage": stage, **measured})
+                logger.info(f"scale {scale}, {stage}: {measured['seconds']:.2f}s")
+
+    if results_path is not None:
+        results_path = Path(results_path)
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        with results_path.open("a", encoding="utf-8") as f:
+            f.writelines(json.dumps(result) + "\n" for result in results)
+    return results
+
+
+def report(results: Sequence[dict], history: Sequence[dict] = ()) -> str:
+    """Format the results, with the change in seconds against each baseline."""
+    header = (
+        f"{'scale':>11}  {'stage':<8}{'rows':>11}{'seconds':>9}{'rows/sec':>12}"
+        f"{'peak MB':>9}  vs baseline"
+    )
+    lines = [header, "-" * 78]
+    for result in results:
+        old = baseline_for(history, result)
+        change = ""
+        if old and old.get("seconds"):
+            change = f"{result['seconds'] / old['seconds'] - 1:+.0%} vs {old['commit']}"
+        rate = result["rows_per_second"]
+        peak = result["peak_rss_mb"]
+        lines.append(
+            f"{result['scale']:>11,}  {result['stage']:<8}{result['rows']:>11,}"
+            f"{result['seconds']:>9.2f}{'' if rate is None else f'{rate:,.0f}':>12}"
+            f"{'' if peak is None else f'{peak:.0f}':>9}  {change}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    """Run the suite and log a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--results", type=Path, default=DEFAULT_RESULTS)
+    parser.add_argument(
+        "--in-process", action="store_true", help="skip per-stage processes (peak RSS is shared)"
+    )
+    args = parser.parse_args()
+
+    init_logger()
+    history = load_results(args.results)
+    results = run_suite(args.scales, args.stages, args.seed, not args.in_process, args.results)
+    logger.info(
+        f"STAGE BENCHMARK (commit {results[0]['commit']}, results in {args.results})\n"
+        + report(results, history)
+        + "\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Store DataFrames as partitioned, dictionary-encoded column files.
+
+Each table is a folder holding a JSON manifest and one sub-folder per
+partition (Hive-style ``year=2025/month=5``). Every column is written as a
+NumPy ``.npy`` file, so readers can memory-map exactly the columns and
+partitions a query needs instead of deserializing whole rows.
+
+Module Information:
+    - Filename: columnar_store.py
+    - Module: columnar_store
+    - Location: src/analytics_project/
+
+Column encodings:
+    - "dictionary": strings -> int32 codes (-1 = NULL) + a per-partition
+      dictionary of unique values (<col>.npy + <col>.dict.npy)
+    - "float": float64 values, NaN = NULL
+    - "int": integers at their own width (Int32 -> int32); if any are NULL,
+      a <col>.valid.npy mask
+    - "bool" / "datetime": native NumPy dtypes (NaT = NULL)
+
+Example:
+    write_table(sales, SNAPSHOT_DIR / "sale", partition_by=["year", "month"])
+    read_table(SNAPSHOT_DIR / "sale", columns=["sale_amount_usd"], filters={"year": 2025})
+"""
+
+from collections.abc import Collection, Iterable, Sequence
+import json
+from pathlib import Path
+import shutil
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from .utils_logger import logger
+
+MANIFEST_NAME = "_manifest.json"
+FORMAT_VERSION = 1
+
+_NULL_PARTITION = "__null__"
+
+
+def _column_kind(series: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(series):
+        return "bool"
+    if pd.api.types.is_integer_dtype(series):
+        return "int"
+    if pd.api.types.is_float_dtype(series):
+        return "float"
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return "datetime"
+    return "dictionary"
+
+
+def _write_column(series: pd.Series, kind: str, folder: Path) -> None:
+    name = series.name
+    if kind == "dictionary":
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        np.save(folder / f"{name}.npy", codes.astype(np.int32))
+        np.save(folder / f"{name}.dict.npy", np.asarray(uniques, dtype=str))
+    elif kind == "int":
+        valid = series.notna().to_numpy()
+        width = np.dtype(getattr(series.dtype, "numpy_dtype", series.dtype))
+        np.save(folder / f"{name}.npy", series.fillna(0).to_numpy(dtype=width))
+        if not valid.all():
+            np.save(folder / f"{name}.valid.npy", valid)
+    elif kind == "float":
+        np.save(folder / f"{name}.npy", series.to_numpy(dtype=np.float64, na_value=np.nan))
+    elif kind == "datetime":
+        np.save(folder / f"{name}.npy", series.to_numpy(dtype="datetime64[ns]"))
+    else:
+        np.save(folder / f"{name}.npy", series.to_numpy(dtype=bool))
+
+
+def _partition_path(values: dict[str, object]) -> str:
+    parts = []
+    for key, value in values.items():
+        text = _NULL_PARTITION if pd.isna(value) else str(value)
+        parts.append(f"{key}={text}")
+    return "/".join(parts)
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: Path,
+    partition_by: Sequence[str] = (),
+    kinds: dict[str, str] | None = None,
+) -> dict:
+    """Write a DataFrame as a columnar table folder, replacing any old copy.
+
+    Partition columns are not stored as files: their values live in the
+    partition folder names and manifest, and are restored on read.
+
+    Args:
+        df: Data to write.
+        path: Table folder to create.
+        partition_by: Columns to partition on (e.g. ["year", "month"]).
+        kinds: Per-column encoding overrides; otherwise inferred from dtype.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    path = Path(path)
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+
+    data_columns = [col for col in df.columns if col not in partition_by]
+    column_kinds = {col: _column_kind(df[col]) for col in data_columns}
+    column_kinds.update(kinds or {})
+
+    groups = df.groupby(list(partition_by), dropna=False, sort=True) if partition_by else [((), df)]
+
+    partitions = []
+    for key, part in groups:
+        key = key if isinstance(key, tuple) else (key,)
+        values = {
+            col: (None if pd.isna(value) else value.item() if hasattr(value, "item") else value)
+            for col, value in zip(partition_by, key, strict=True)
+        }
+        relative = _partition_path(values)
+        folder = path / relative if relative else path
+        folder.mkdir(parents=True, exist_ok=True)
+        for col in data_columns:
+            _write_column(part[col].reset_index(drop=True), column_kinds[col], folder)
+        partitions.append({"path": relative, "values": values, "rows": len(part)})
+
+    manifest = {
+        "format_version": FORMAT_VERSION,
+        "columns": column_kinds,
+        "dtypes": {col: str(df[col].dtype) for col in df.columns},
+        "column_order": list(df.columns),
+        "partition_by": list(partition_by),
+        "partitions": partitions,
+        "row_count": len(df),
+    }
+    (path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    logger.info(f"Wrote {path.name}: {len(df)} rows, {len(partitions)} partition(s)")
+    return manifest
+
+
+def concat_tables(parts: Sequence[Path], path: Path) -> dict:
+    """Join unpartitioned tables with the same columns into one table, in order.
+
+    The parts' column files are moved, not rewritten: each part becomes one
+    partition of the new table. Used when parallel workers each write a
+    slice of the rows.
+
+    Returns:
+        dict: The manifest that was written.
+    """
+    path = Path(path)
+    manifests = [read_manifest(part) for part in parts]
+    if not manifests:
+        raise ValueError("concat_tables needs at least one part")
+    first = manifests[0]
+    for part, manifest in zip(parts, manifests, strict=True):
+        if manifest["partition_by"] or manifest["columns"] != first["columns"]:
+            raise ValueError(f"{part} does not match the columns of {parts[0]}")
+
+    if path.exists():
+        shutil.rmtree(path)
+    path.mkdir(parents=True)
+    partitions = []
+    for index, (part, manifest) in enumerate(zip(parts, manifests, strict=True)):
+        relative = f"part={index:05d}"
+        (path / relative).mkdir()
+        for file in Path(part).glob("*.npy"):
+            file.replace(path / relative / file.name)
+        partitions.append({"path": relative, "values": {}, "rows": manifest["row_count"]})
+
+    manifest = {
+        **first,
+        "partitions": partitions,
+        "row_count": sum(item["rows"] for item in partitions),
+    }
+    (path / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+    logger.info(f"Wrote {path.name}: {manifest['row_count']} rows from {len(parts)} part(s)")
+    return manifest
+
+
+def read_manifest(path: Path) -> dict:
+    """Return a table folder's manifest."""
+    return json.loads((Path(path) / MANIFEST_NAME).read_text())
+
+
+def _matches(values: dict[str, object], filters: dict[str, object]) -> bool:
+    for col, wanted in filters.items():
+        allowed = wanted if isinstance(wanted, list | tuple | set) else [wanted]
+        if values.get(col) not in allowed:
+            return False
+    return True
+
+
+def _read_column(folder: Path, name: str, kind: str, mmap: bool, rows: slice) -> object:
+    mode = "r" if mmap else None
+    values = np.load(folder / f"{name}.npy", mmap_mode=mode)[rows]
+    if kind == "dictionary":
+        dictionary = np.load(folder / f"{name}.dict.npy").astype(object)
+        return pd.Categorical.from_codes(np.asarray(values), categories=dictionary)
+    if kind == "int":
+        valid_path = folder / f"{name}.valid.npy"
+        if valid_path.exists():
+            valid = np.load(valid_path, mmap_mode=mode)[rows]
+            return pd.arrays.IntegerArray(np.asarray(values), ~valid)
+    return values
+
+
+def _combine(parts: list, kind: str | None, categorical: bool) -> object:
+    """Join one column's per-partition pieces (kind None = partition column)."""
+    if not parts:
+        return pd.Series([], dtype=object)
+    if kind == "dictionary":
+        merged = union_categoricals(parts, ignore_order=True) if len(parts) > 1 else parts[0]
+        if categorical:
+            return merged
+        # NULL codes decode to None, as pd.read_sql returns them
+        decoded = np.asarray(merged, dtype=object)
+        decoded[pd.isna(decoded)] = None
+        return decoded
+    if len(parts) == 1:
+        # A single memory-mapped array is handed to pandas without a copy
+        return parts[0]
+    if all(isinstance(part, np.ndarray) for part in parts):
+        return np.concatenate(parts)
+    # Partition values or nullable ints: let pandas unify the dtypes
+    return pd.concat([pd.Series(part) for part in parts], ignore_index=True)
+
+
+def read_table(
+    path: Path,
+    columns: Iterable[str] | None = None,
+    filters: dict[str, object] | None = None,
+    mmap: bool = True,
+    categorical: bool | Collection[str] = False,
+    rows: tuple[int, int] | None = None,
+) -> pd.DataFrame:
+    """Read a columnar table folder, touching only the files it needs.
+
+    Args:
+        path: Table folder written by write_table().
+        columns: Columns to read (default: all). Partition columns are free.
+        filters: Partition column -> value (or list of values); partitions
+            that cannot match are skipped without opening any file.
+        mmap: Memory-map the column files instead of reading them eagerly.
+        categorical: Keep dictionary columns as pandas Categoricals rather
+            than decoding to object strings (True for all, or the names of
+            the columns to keep).
+        rows: Only this (start, end) range of the rows that pass
+            ``filters``. Partitions outside it are skipped, and the rest
+            are sliced before decoding, so with ``mmap`` only these rows
+            are paged in.
+
+    Returns:
+        pd.DataFrame: The selected rows and columns.
+    """
+    path = Path(path)
+    manifest = read_manifest(path)
+    partition_by = manifest["partition_by"]
+    filters = filters or {}
+    unknown = set(filters) - set(partition_by)
+    if unknown:
+        raise ValueError(
+            f"Can only filter on partition columns {partition_by}, not {sorted(unknown)}"
+        )
+
+    wanted = list(columns) if columns is not None else manifest["column_order"]
+    missing = set(wanted) - set(manifest["column_order"])
+    if missing:
+        raise KeyError(f"Columns not in {path.name}: {sorted(missing)}")
+
+    pieces: dict[str, list] = {col: [] for col in wanted}
+    kept = 0
+    offset = 0
+    for partition in manifest["partitions"]:
+        if not _matches(partition["values"], filters):
+            continue
+        start, offset = offset, offset + partition["rows"]
+        if rows is None:
+            selected = slice(None)
+            count = partition["rows"]
+        else:
+            selected = slice(max(rows[0] - start, 0), min(rows[1], offset) - start)
+            count = selected.stop - selected.start
+            if count <= 0:
+                continue
+        kept += 1
+        folder = path / partition["path"] if partition["path"] else path
+        for col in wanted:
+            if col in partition_by:
+                pieces[col].append(pd.Series([partition["values"][col]] * count, dtype=object))
+            else:
+                kind = manifest["columns"][col]
+                pieces[col].append(_read_column(folder, col, kind, mmap, selected))
+
+    logger.debug("read_table {}: {}/{} partitions", path.name, kept, len(manifest["partitions"]))
+
+    data = {
+        col: _combine(
+            parts,
+            None if col in partition_by else manifest["columns"][col],
+            categorical if isinstance(categorical, bool) else col in categorical,
+        )
+        for col, parts in pieces.items()
+    }
+    return pd.DataFrame(data, copy=False)
+
+
+__all__ = ["concat_tables", "read_manifest", "read_table", "write_table"]
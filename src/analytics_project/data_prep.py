@@ -1,6 +1,31 @@
-import pandas as pd
+import argparse
+from concurrent.futures import Executor, ProcessPoolExecutor
+import functools
+import io
+import os
 from pathlib import Path
-from analytics_project.data_scrubber import DataScrubber
+import pickle
+import shutil
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from analytics_project import data_scrubber
+from analytics_project.columnar_store import concat_tables, write_table
+from analytics_project.data_scrubber import ChunkedDataScrubber, LazyDataScrubber
+from analytics_project.instrumentation import stage
+from analytics_project.intermediate import (
+    DEFAULT_OUTPUT_FORMAT,
+    OUTPUT_FORMATS,
+    binary_path,
+    csv_shard_offsets,
+    output_paths,
+    write_frame,
+)
+from analytics_project.pipeline_cache import StageCache, source_version
+from analytics_project.schemas import read_csv, schema_for
 
 # --- Define paths ---
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -8,51 +33,438 @@ RAW_DIR = PROJECT_ROOT / "data" / "raw"
 PROCESSED_DIR = PROJECT_ROOT / "data" / "processed"
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
+# --- Cleaning jobs run by main() ---
+CLEANING_JOBS = [
+    {
+        "file_name": "customers_data.csv",
+        "numeric_limits": {"OpenInvoices": (0, 10000), "RetentionRate": (0, 1)},
+        "fill_value": "N/A",
+    },
+    {
+        "file_name": "products_data.csv",
+        "numeric_limits": {"RestockQuantity": (0, 1000)},
+        "fill_value": 0,
+    },
+    {
+        "file_name": "sales_data.csv",
+        "numeric_limits": {"DiscountPercent": (0, 1)},
+        "fill_value": 0,
+    },
+]
 
-# --- Function to process any file ---
-def process_file(file_name: str, numeric_limits: dict = None, fill_value="N/A"):
-    raw_path = RAW_DIR / file_name
-    processed_path = PROCESSED_DIR / file_name.replace(".csv", "_cleaned.csv")
+# Files larger than this are split into row-range shards when running in
+# parallel, so one big extract can use every worker
+DEFAULT_SHARD_BYTES = 64 * 1024 * 1024
 
-    print(f"\n📂 Reading: {raw_path}")
-    df = pd.read_csv(raw_path)
+# Second hash seed; two 64-bit row hashes make accidental collisions negligible
+_SECOND_HASH_KEY = "analytics_dedupe"
 
-    scrubber = DataScrubber(df)
 
-    # Run cleaning steps separately
-    df = scrubber.remove_duplicate_records()
-    df = scrubber.handle_missing_data(fill_value=fill_value)
+@functools.cache
+def _code_version() -> str:
+    # Editing the cleaning code invalidates every cached output
+    return source_version(sys.modules[__name__], data_scrubber)
+
+
+def _cached(
+    stage_cache: StageCache,
+    raw_path: Path,
+    processed_path: Path,
+    compute,
+    numeric_limits: dict | None,
+    fill_value,
+    chunk_rows: int | None,
+    output_format: str,
+) -> int:
+    """Run ``compute`` through the stage cache; sharded runs share the sequential key."""
+    params = {
+        "numeric_limits": {col: list(limits) for col, limits in (numeric_limits or {}).items()},
+        "fill_value": fill_value,
+        # Chunked reads infer dtypes per chunk, so their output can differ
+        "chunk_rows": chunk_rows,
+        "output_format": output_format,
+    }
+    return stage_cache.run(
+        "data_prep",
+        inputs=[raw_path],
+        outputs=output_paths(processed_path, output_format),
+        compute=compute,
+        params=params,
+        code_version=_code_version(),
+    )
+
+
+# --- Cleaning steps shared by the sequential and sharded paths ---
+def clean_frame(
+    df: pd.DataFrame, numeric_limits: dict | None = None, fill_value="N/A", dedupe: bool = True
+) -> pd.DataFrame:
+    """Run the DataScrubber steps every raw file gets, fused into one pass."""
+    scrubber = LazyDataScrubber(df)
+
+    # Record the cleaning steps; execute() runs them without per-step copies
+    if dedupe:
+        scrubber.remove_duplicate_records()
+    scrubber.handle_missing_data(fill_value=fill_value)
 
     # Apply outlier filtering if limits provided
     if numeric_limits:
         for col, (low, high) in numeric_limits.items():
-            if col in df.columns:
-                df = scrubber.filter_column_outliers(col, low, high)
+            scrubber.filter_column_outliers(col, low, high)
+    return scrubber.execute()
 
-    df.to_csv(processed_path, index=False)
-    print(f"✅ Cleaned file saved: {processed_path} ({df.shape[0]} rows)")
 
+# --- Function to process any file ---
+def process_file(
+    file_name: str,
+    numeric_limits: dict = None,
+    fill_value="N/A",
+    raw_dir: Path = RAW_DIR,
+    processed_dir: Path = PROCESSED_DIR,
+    chunk_rows: int | None = None,
+    cache: StageCache | None = None,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+) -> int:
+    raw_path = Path(raw_dir) / file_name
+    processed_path = Path(processed_dir) / file_name.replace(".csv", "_cleaned.csv")
 
-# --- Main function ---
-def main():
-    print("🚀 Starting unified data cleaning process...\n")
+    if chunk_rows and output_format != "csv":
+        # The cleaned file never fits in memory at once, so it is streamed to CSV
+        print(f"⚠️ Chunked cleaning writes CSV only; ignoring output format {output_format!r}")
+        output_format = "csv"
 
-    # Customers
-    process_file(
-        "customers_data.csv",
-        numeric_limits={"OpenInvoices": (0, 10000), "RetentionRate": (0, 1)},
-        fill_value="N/A",
-    )
+    if cache is not None:
+        return _cached(
+            cache,
+            raw_path,
+            processed_path,
+            lambda: process_file(
+                file_name,
+                numeric_limits,
+                fill_value,
+                raw_dir,
+                processed_dir,
+                chunk_rows,
+                output_format=output_format,
+            ),
+            numeric_limits,
+            fill_value,
+            chunk_rows,
+            output_format,
+        )
+
+    if chunk_rows:
+        return process_file_out_of_core(
+            raw_path, processed_path, numeric_limits, fill_value, chunk_rows
+        )
+
+    print(f"\n📂 Reading: {raw_path}")
+    with stage("prep.read", file=file_name) as timer:
+        df = read_csv(raw_path)
+        timer.rows = len(df)
+
+    with stage("prep.clean", rows=len(df), file=file_name):
+        df = clean_frame(df, numeric_limits, fill_value)
+
+    with stage("prep.write", rows=len(df), file=file_name, format=output_format):
+        for path in write_frame(df, processed_path, output_format):
+            print(f"✅ Cleaned file saved: {path} ({df.shape[0]} rows)")
+    return df.shape[0]
+
+
+# --- Out-of-core cleaning for files larger than memory ---
+def process_file_out_of_core(
+    raw_path: Path, processed_path: Path, numeric_limits: dict | None, fill_value, chunk_rows: int
+) -> int:
+    """Stream the file in chunks of ``chunk_rows``; memory stays about one chunk."""
+    print(f"\n📂 Streaming in chunks of {chunk_rows}: {raw_path}")
+    scrubber = ChunkedDataScrubber(raw_path, chunk_rows=chunk_rows)
+    scrubber.remove_duplicate_records()
+    scrubber.handle_missing_data(fill_value=fill_value)
+    for col, (low, high) in (numeric_limits or {}).items():
+        scrubber.filter_column_outliers(col, low, high)
+    rows = scrubber.execute(processed_path)
+    print(f"✅ Cleaned file saved: {processed_path} ({rows} rows)")
+    return rows
+
+
+# --- Sharded cleaning for one large file ---
+def _read_shard(raw_path: str, header: bytes, start: int, end: int, spill_path: str) -> dict:
+    """Parse one byte range, spill the frame to disk and return its dtype kinds."""
+    with Path(raw_path).open("rb") as f:
+        f.seek(start)
+        body = f.read(end - start)
+    df = read_csv(io.BytesIO(header + body), schema=schema_for(raw_path))
+    with Path(spill_path).open("wb") as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return {col: df[col].dtype.kind for col in df.columns}
+
+
+def _load_shard(spill_path: str, dtypes: dict) -> pd.DataFrame:
+    # Spills are written by _read_shard in this run's private temp folder
+    with Path(spill_path).open("rb") as f:
+        return pickle.load(f).astype(dtypes)  # noqa: S301
+
+
+def _hash_shard(spill_path: str, dtypes: dict) -> np.ndarray:
+    """Hash each row of a spilled shard, after casting to the file-wide dtypes."""
+    df = _load_shard(spill_path, dtypes)
+    first = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    second = pd.util.hash_pandas_object(df, index=False, hash_key=_SECOND_HASH_KEY).to_numpy()
+    return np.stack([first, second], axis=1)
 
-    # Products
-    process_file("products_data.csv", numeric_limits={"RestockQuantity": (0, 1000)}, fill_value=0)
 
-    # Sales
-    process_file("sales_data.csv", numeric_limits={"DiscountPercent": (0, 1)}, fill_value=0)
+def _clean_shard(
+    spill_path: str,
+    keep: np.ndarray,
+    dtypes: dict,
+    numeric_limits: dict,
+    fill_value,
+    out_path: str | None,
+    table_path: str | None = None,
+) -> int:
+    """Clean one spilled shard (duplicates already marked).
+
+    Writes it as a headerless CSV part and/or a columnar table part.
+    """
+    df = _load_shard(spill_path, dtypes)[keep]
+    df = clean_frame(df, numeric_limits, fill_value, dedupe=False)
+    if out_path:
+        df.to_csv(out_path, index=False, header=False)
+    if table_path:
+        write_table(df.reset_index(drop=True), Path(table_path))
+    return df.shape[0]
+
+
+def _unified_dtypes(kinds: list[dict], fixed: dict | None = None) -> dict:
+    """Pick the dtype a full read would give each column from per-shard dtype kinds.
+
+    Columns with a schema dtype (``fixed``) were read with it in every shard.
+    """
+    fixed = fixed or {}
+    dtypes = {}
+    for col in kinds[0]:
+        seen = {shard[col] for shard in kinds}
+        if col in fixed:
+            dtypes[col] = fixed[col]
+        elif seen == {"i"}:
+            dtypes[col] = "int64"
+        elif seen <= {"i", "f"}:
+            dtypes[col] = "float64"
+        elif seen == {"b"}:
+            dtypes[col] = "bool"
+        else:
+            dtypes[col] = object
+    return dtypes
+
+
+def process_file_sharded(
+    file_name: str,
+    numeric_limits: dict | None = None,
+    fill_value="N/A",
+    raw_dir: Path = RAW_DIR,
+    processed_dir: Path = PROCESSED_DIR,
+    shards: int | None = None,
+    executor: Executor | None = None,
+    cache: StageCache | None = None,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+) -> int:
+    """Clean one large file as row-range shards in parallel.
+
+    Workers parse the shards and spill them to a temp folder, then hash
+    their rows; the parent marks the first occurrence of each row across the
+    whole file, so remove_duplicate_records stays global. Finally each shard
+    is cleaned and the parts are concatenated in the original row order.
+    The output matches process_file(), and so does its cache entry. A
+    binary output is written as one columnar part per shard.
+    """
+    raw_path = Path(raw_dir) / file_name
+    processed_path = Path(processed_dir) / file_name.replace(".csv", "_cleaned.csv")
+    if cache is not None:
+        return _cached(
+            cache,
+            raw_path,
+            processed_path,
+            lambda: process_file_sharded(
+                file_name,
+                numeric_limits,
+                fill_value,
+                raw_dir,
+                processed_dir,
+                shards,
+                executor,
+                output_format=output_format,
+            ),
+            numeric_limits,
+            fill_value,
+            None,
+            output_format,
+        )
+    outputs = output_paths(processed_path, output_format)
+
+    shards = shards or os.cpu_count() or 1
+    own_executor = executor is None
+    executor = executor or ProcessPoolExecutor(max_workers=shards)
+
+    print(f"\n📂 Reading in shards: {raw_path}")
+    header, ranges = csv_shard_offsets(raw_path, shards)
+    tmp_dir = Path(tempfile.mkdtemp(prefix="data_prep_"))
+    try:
+        spills = [str(tmp_dir / f"shard_{i}.pkl") for i in range(len(ranges))]
+        kinds = list(
+            executor.map(
+                _read_shard,
+                [str(raw_path)] * len(ranges),
+                [header] * len(ranges),
+                [start for start, _ in ranges],
+                [end for _, end in ranges],
+                spills,
+            )
+        )
+        # Shards infer dtypes independently; cast all to what a full read gives
+        schema = schema_for(raw_path)
+        dtypes = _unified_dtypes(kinds, schema.dtypes if schema else None)
+
+        # Global duplicate pass: keep the first occurrence of each row hash
+        shard_hashes = list(executor.map(_hash_shard, spills, [dtypes] * len(spills)))
+        keep = ~pd.DataFrame(np.concatenate(shard_hashes)).duplicated().to_numpy()
+        bounds = np.cumsum([0] + [len(hashes) for hashes in shard_hashes])
+
+        write_csv = processed_path in outputs
+        table = binary_path(processed_path)
+        parts = [str(tmp_dir / f"part_{i}.csv") for i in range(len(ranges))]
+        table_parts = [str(tmp_dir / f"part_{i}{table.suffix}") for i in range(len(ranges))]
+        rows = sum(
+            executor.map(
+                _clean_shard,
+                spills,
+                [keep[bounds[i] : bounds[i + 1]] for i in range(len(ranges))],
+                [dtypes] * len(ranges),
+                [numeric_limits] * len(ranges),
+                [fill_value] * len(ranges),
+                parts if write_csv else [None] * len(ranges),
+                table_parts if table in outputs else [None] * len(ranges),
+            )
+        )
+
+        if table in outputs:
+            concat_tables([Path(part) for part in table_parts], table)
+        if write_csv:
+            with processed_path.open("wb") as out:
+                out.write(pd.DataFrame(columns=list(dtypes)).to_csv(index=False).encode())
+                for part in parts:
+                    with Path(part).open("rb") as f:
+                        shutil.copyfileobj(f, out)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if own_executor:
+            executor.shutdown()
+
+    for path in outputs:
+        print(f"✅ Cleaned file saved: {path} ({rows} rows, {len(ranges)} shards)")
+    return rows
+
+
+# --- Run many cleaning jobs across a process pool ---
+def _process_file_job(job: dict) -> tuple[int, dict[str, int] | None]:
+    """Run one process_file() job in a worker; return its rows and its cache counts.
+
+    The worker's cache is a pickled copy, so the hits and misses of this job
+    must travel back to the parent.
+    """
+    cache = job.get("cache")
+    before = dict(cache.stats) if cache is not None else {}
+    rows = process_file(**job)
+    if cache is None:
+        return rows, None
+    return rows, {name: count - before[name] for name, count in cache.stats.items()}
+
+
+def process_files(
+    jobs: list[dict], workers: int | None = None, shard_bytes: int = DEFAULT_SHARD_BYTES
+) -> dict[str, int]:
+    """Run process_file() jobs in parallel; return cleaned row counts by file.
+
+    Each job is a dict of process_file() keyword arguments. Files larger than
+    ``shard_bytes`` are split into shards that share the same worker pool.
+    A job's ``cache`` is checked in the worker that runs it, and the
+    worker's hit/miss counts are added to that cache's ``stats`` here.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        large = []
+        for job in jobs:
+            raw_path = Path(job.get("raw_dir", RAW_DIR)) / job["file_name"]
+            # Out-of-core jobs stream on one worker instead of being sharded
+            if workers > 1 and not job.get("chunk_rows") and raw_path.stat().st_size > shard_bytes:
+                large.append(job)
+            else:
+                futures[job["file_name"]] = executor.submit(_process_file_job, job)
+
+        for job in large:
+            # Sharded jobs never stream, so chunk_rows (None here) is not passed on
+            sharded = {key: value for key, value in job.items() if key != "chunk_rows"}
+            results[job["file_name"]] = process_file_sharded(
+                **sharded, shards=workers, executor=executor
+            )
+        for job in jobs:
+            if job["file_name"] in futures:
+                results[job["file_name"]], stats = futures[job["file_name"]].result()
+                if stats is not None:
+                    job["cache"].add_stats(stats)
+    return results
+
+
+# --- Main function ---
+def main(
+    workers: int = 1,
+    chunk_rows: int | None = None,
+    use_cache: bool = True,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+):
+    print("🚀 Starting unified data cleaning process...\n")
+
+    # Unchanged raw files with unchanged settings reuse their cleaned output
+    stage_cache = StageCache() if use_cache else None
+    jobs = [
+        {**job, "chunk_rows": chunk_rows, "cache": stage_cache, "output_format": output_format}
+        for job in CLEANING_JOBS
+    ]
+    if workers > 1:
+        print(f"⚙️ Running {len(jobs)} jobs on {workers} worker processes")
+        process_files(jobs, workers=workers)
+    else:
+        for job in jobs:
+            process_file(**job)
+    if stage_cache is not None:
+        stage_cache.log_stats()
 
     print("\n🎯 All files cleaned successfully!")
 
 
 # --- Run main if executed directly ---
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Clean the raw CSV files into data/processed/.")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="worker processes (1 = run files one by one)"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=None,
+        help="stream each file in chunks of this many rows (for files larger than memory)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="re-clean every file even if its input and settings are unchanged",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=DEFAULT_OUTPUT_FORMAT,
+        help="cleaned output: CSV, memory-mappable .npy columns (*.cols/), or both",
+    )
+    args = parser.parse_args()
+    main(args.workers, args.chunk_rows, use_cache=not args.no_cache, output_format=args.format)
@@ -0,0 +1,336 @@
+"""Prepare the raw source tables from declarative rule specs.
+
+Each table is described by a TableSpec (dedupe keys, numeric ranges, fill
+values, date columns). prepare_frame() compiles a spec into one pass: every
+filter rule only narrows a shared keep-mask, rows are selected once at the
+end, and fills and date parsing then run on the surviving rows only.
+prepare_tables() runs all tables on a thread pool in one process, so
+imports and pandas start-up are paid once, and logs rows per second for
+every rule.
+
+Module Information:
+    - Filename: prepare_engine.py
+    - Module: prepare_engine
+    - Location: src/analytics_project/data_preparation/
+
+Example:
+    uv run python -m analytics_project.data_preparation.prepare_engine
+"""
+
+import argparse
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.dates import parse_dates
+from analytics_project.intermediate import (
+    DEFAULT_OUTPUT_FORMAT,
+    OUTPUT_FORMATS,
+    output_paths,
+    write_frame,
+)
+from analytics_project.pipeline_cache import StageCache, source_version
+from analytics_project.schemas import fill_missing, read_csv, schema_for
+from analytics_project.utils_logger import init_logger, logger
+
+# --- PATHS ---
+REPO_ROOT = Path(__file__).resolve().parents[3]
+RAW_DATA_DIR = REPO_ROOT / "data" / "raw"
+PREPARED_DATA_DIR = REPO_ROOT / "data" / "prepared"
+
+
+# ---------------- Specs ----------------
+
+
+@dataclass(frozen=True)
+class NumericRange:
+    """Keep rows whose ``column`` parses as a number inside the range.
+
+    Values that do not parse are dropped. Bounds are exclusive unless the
+    matching ``*_inclusive`` flag is set; None means unbounded.
+    """
+
+    column: str
+    low: float | None = None
+    high: float | None = None
+    low_inclusive: bool = False
+    high_inclusive: bool = False
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """Rules that turn one raw CSV into its prepared CSV.
+
+    Rules run in a fixed order: dedupe, numeric ranges, fills, dates.
+    ``dedupe_keys`` None compares whole rows; an empty tuple skips dedupe.
+    Rules naming a column the file does not have are skipped.
+    """
+
+    name: str
+    raw_file: str
+    prepared_file: str
+    dedupe_keys: tuple[str, ...] | None = None
+    ranges: tuple[NumericRange, ...] = ()
+    fill_values: dict[str, object] = field(default_factory=dict)
+    date_columns: tuple[str, ...] = ()
+
+
+@dataclass
+class RuleStat:
+    """Work done by one rule: rows it looked at, rows it dropped, time taken."""
+
+    table: str
+    rule: str
+    rows: int
+    dropped: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        """Throughput of the rule."""
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+
+@dataclass
+class PrepareResult:
+    """Outcome of preparing one table (``rule_stats`` is empty on a cache hit)."""
+
+    table: str
+    rows: int
+    seconds: float
+    cached: bool = False
+    rule_stats: list[RuleStat] = field(default_factory=list)
+
+
+CUSTOMERS_SPEC = TableSpec(
+    name="customers",
+    raw_file="customers_data.csv",
+    prepared_file="customers_prepared.csv",
+    ranges=(NumericRange("OpenInvoices_num", low=0, low_inclusive=True),),
+    fill_values={"Region": "Unknown", "RetentionCategory_Cat": "Unspecified"},
+)
+
+PRODUCTS_SPEC = TableSpec(
+    name="products",
+    raw_file="products_data.csv",
+    prepared_file="products_prepared.csv",
+    ranges=(
+        NumericRange("RestockTime_days_num", low=0),
+        NumericRange("UnitPrice", low=0, high=10000),
+    ),
+    fill_values={"Supplier_cat": "Unknown"},
+)
+
+SALES_SPEC = TableSpec(
+    name="sales",
+    raw_file="sales_data.csv",
+    prepared_file="sales_prepared.csv",
+    ranges=(NumericRange("SaleAmount", low=0, high=100000),),
+    fill_values={"PaymentType_cat": "Unknown"},
+    date_columns=("SaleDate",),
+)
+
+TABLE_SPECS = (CUSTOMERS_SPEC, PRODUCTS_SPEC, SALES_SPEC)
+
+
+# ---------------- Compiled pass ----------------
+
+
+def _range_mask(values: pd.Series, rule: NumericRange) -> np.ndarray:
+    numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+    mask = ~np.isnan(numbers)
+    if rule.low is not None:
+        mask &= numbers >= rule.low if rule.low_inclusive else numbers > rule.low
+    if rule.high is not None:
+        mask &= numbers <= rule.high if rule.high_inclusive else numbers < rule.high
+    return mask
+
+
+def _timed(stats: list[RuleStat], table: str, rule: str, rows: int, step: Callable):
+    started = time.perf_counter()
+    result = step()
+    stats.append(RuleStat(table, rule, rows, 0, time.perf_counter() - started))
+    return result
+
+
+def prepare_frame(df: pd.DataFrame, spec: TableSpec) -> tuple[pd.DataFrame, list[RuleStat]]:
+    """Apply a spec to a frame in one pass; return the result and per-rule stats."""
+    stats: list[RuleStat] = []
+    rows = len(df)
+    keep = np.ones(rows, dtype=bool)
+    numeric: dict[str, pd.Series] = {}
+
+    if spec.dedupe_keys != ():
+        subset = list(spec.dedupe_keys) if spec.dedupe_keys else None
+        before = int(keep.sum())
+        keep &= _timed(stats, spec.name, "dedupe", rows, lambda: ~df.duplicated(subset).to_numpy())
+        stats[-1].dropped = before - int(keep.sum())
+
+    for rule in spec.ranges:
+        if rule.column not in df.columns:
+            continue
+        before = int(keep.sum())
+
+        def check(rule=rule):
+            # Parsed once; the kept values are written back as numbers
+            numeric[rule.column] = pd.to_numeric(df[rule.column], errors="coerce")
+            return _range_mask(numeric[rule.column], rule)
+
+        keep &= _timed(stats, spec.name, f"range {rule.column}", rows, check)
+        stats[-1].dropped = before - int(keep.sum())
+
+    # Rows are selected once; the remaining rules touch only what is kept
+    out = df[keep].copy() if not keep.all() else df.copy()
+    for col, values in numeric.items():
+        out[col] = values[keep]
+
+    kept = len(out)
+    schema = schema_for(spec.raw_file)
+    date_formats = schema.date_formats if schema else {}
+    for col, value in spec.fill_values.items():
+        if col in out.columns:
+            out[col] = _timed(
+                stats,
+                spec.name,
+                f"fill {col}",
+                kept,
+                lambda col=col, value=value: fill_missing(out[col], value),
+            )
+    for col in spec.date_columns:
+        if col in out.columns:
+            out[col] = _timed(
+                stats,
+                spec.name,
+                f"date {col}",
+                kept,
+                lambda col=col: parse_dates(out[col], date_formats.get(col)),
+            )
+    return out, stats
+
+
+# ---------------- Tables ----------------
+
+
+def prepare_table(
+    spec: TableSpec,
+    raw_dir: Path = RAW_DATA_DIR,
+    prepared_dir: Path = PREPARED_DATA_DIR,
+    cache: StageCache | None = None,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+) -> PrepareResult:
+    """Read one raw CSV, apply its spec and write the prepared table.
+
+    ``output_format`` picks CSV, a binary columnar table or both (see
+    analytics_project.intermediate).
+    """
+    raw_path = Path(raw_dir) / spec.raw_file
+    prepared_path = Path(prepared_dir) / spec.prepared_file
+    if not raw_path.exists():
+        raise FileNotFoundError(f"Missing file: {raw_path}")
+
+    started = time.perf_counter()
+    result = PrepareResult(spec.name, 0, 0.0, cached=True)
+
+    def compute() -> int:
+        result.cached = False
+        df = read_csv(raw_path)
+        out, result.rule_stats = prepare_frame(df, spec)
+        write_frame(out, prepared_path, output_format)
+        return len(out)
+
+    if cache is None:
+        result.rows = compute()
+    else:
+        result.rows = cache.run(
+            f"prepare_{spec.name}",
+            inputs=[raw_path],
+            outputs=output_paths(prepared_path, output_format),
+            compute=compute,
+            params={**asdict(spec), "output_format": output_format},
+            code_version=source_version(sys.modules[__name__]),
+        )
+    result.seconds = time.perf_counter() - started
+    logger.info(f"Prepared {spec.name}: {result.rows} rows -> {prepared_path}")
+    return result
+
+
+def prepare_tables(
+    specs: Sequence[TableSpec] = TABLE_SPECS,
+    raw_dir: Path = RAW_DATA_DIR,
+    prepared_dir: Path = PREPARED_DATA_DIR,
+    workers: int | None = None,
+    cache: StageCache | None = None,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+) -> dict[str, PrepareResult]:
+    """Prepare every table concurrently on a thread pool; return results by table.
+
+    Parsing and the vectorized rules spend most of their time in pandas and
+    NumPy code that releases the GIL, so threads overlap the tables without
+    the cost of starting worker processes.
+    """
+    with ThreadPoolExecutor(max_workers=workers or len(specs)) as executor:
+        futures = {
+            spec.name: executor.submit(
+                prepare_table, spec, raw_dir, prepared_dir, cache, output_format
+            )
+            for spec in specs
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def throughput_report(results: dict[str, PrepareResult]) -> str:
+    """Format rows, time and rows/s for every rule of every table."""
+    lines = [
+        f"{'table':<11}{'rule':<28}{'rows':>9}{'dropped':>9}{'ms':>9}{'rows/s':>13}",
+        "-" * 79,
+    ]
+    for result in results.values():
+        if result.cached:
+            lines.append(f"{result.table:<11}{'(cache hit)':<28}{result.rows:>9}")
+            continue
+        for stat in result.rule_stats:
+            lines.append(
+                f"{stat.table:<11}{stat.rule:<28}{stat.rows:>9}{stat.dropped:>9}"
+                f"{stat.seconds * 1000:>9.2f}{stat.rows_per_second:>13,.0f}"
+            )
+    return "\n".join(lines)
+
+
+def main(
+    use_cache: bool = True, output_format: str = DEFAULT_OUTPUT_FORMAT
+) -> dict[str, PrepareResult]:
+    """Prepare all source tables and log the per-rule throughput."""
+    init_logger()
+    cache = StageCache() if use_cache else None
+    started = time.perf_counter()
+    results = prepare_tables(cache=cache, output_format=output_format)
+    logger.info(
+        f"Prepared {len(results)} tables in {time.perf_counter() - started:.2f}s\n"
+        + throughput_report(results)
+    )
+    if cache is not None:
+        cache.log_stats()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prepare the raw CSV files into data/prepared/.")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="re-prepare every table even if its input and rules are unchanged",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=DEFAULT_OUTPUT_FORMAT,
+        help="prepared output: CSV, memory-mappable .npy columns (*.cols/), or both",
+    )
+    args = parser.parse_args()
+    main(use_cache=not args.no_cache, output_format=args.format)
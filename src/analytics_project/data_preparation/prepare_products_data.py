@@ -1,55 +1,25 @@
-import pandas as pd
-import logging
 from pathlib import Path
 
+from analytics_project.data_preparation.prepare_engine import PRODUCTS_SPEC, prepare_table
+from analytics_project.pipeline_cache import StageCache
+from analytics_project.utils_logger import init_logger
+
 # --- PATHS ---
 REPO_ROOT = Path(__file__).resolve().parents[3]
 RAW_DATA_PATH = REPO_ROOT / "data" / "raw" / "products_data.csv"
 PREPARED_DATA_DIR = REPO_ROOT / "data" / "prepared"
 PREPARED_DATA_PATH = PREPARED_DATA_DIR / "products_prepared.csv"
 
-# --- LOGGING ---
-logging.basicConfig(
-    filename=REPO_ROOT / "project.log",
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-)
-
-
-def clean_products_data():
-    print(f"📂 Reading: {RAW_DATA_PATH}")
-    if not RAW_DATA_PATH.exists():
-        raise FileNotFoundError(f"Missing file: {RAW_DATA_PATH}")
-
-    # Load data
-    df = pd.read_csv(RAW_DATA_PATH)
-    print(f"✅ Loaded successfully: {df.shape}")
-
-    # --- Cleaning Steps ---
-    # 1. Remove duplicates
-    df.drop_duplicates(inplace=True)
-
-    # 2. Handle missing supplier or category names
-    if "Supplier_cat" in df.columns:
-        df["Supplier_cat"] = df["Supplier_cat"].fillna("Unknown")
-
-    if "RestockTime_days_num" in df.columns:
-        df["RestockTime_days_num"] = pd.to_numeric(df["RestockTime_days_num"], errors="coerce")
-        df = df[df["RestockTime_days_num"].notna() & (df["RestockTime_days_num"] > 0)]
-
-    # 3. Handle invalid prices
-    if "UnitPrice" in df.columns:
-        df["UnitPrice"] = pd.to_numeric(df["UnitPrice"], errors="coerce")
-        df = df[df["UnitPrice"].notna() & (df["UnitPrice"] > 0) & (df["UnitPrice"] < 10000)]
-
-    # --- Save cleaned data ---
-    PREPARED_DATA_DIR.mkdir(parents=True, exist_ok=True)
-    df.to_csv(PREPARED_DATA_PATH, index=False)
-    print(f"💾 Prepared file saved to: {PREPARED_DATA_PATH}")
-    print(f"✅ Final shape: {df.shape}")
 
-    return df
+def clean_products_data(cache: StageCache | None = None):
+    """Prepare products_data.csv with PRODUCTS_SPEC; prepare_engine runs all tables at once."""
+    result = prepare_table(PRODUCTS_SPEC, RAW_DATA_PATH.parent, PREPARED_DATA_DIR, cache)
+    print(f"💾 Prepared file saved to: {PREPARED_DATA_PATH} ({result.rows} rows)")
+    return result
 
 
 if __name__ == "__main__":
-    clean_products_data()
+    init_logger()
+    stage_cache = StageCache()
+    clean_products_data(stage_cache)
+    stage_cache.log_stats()
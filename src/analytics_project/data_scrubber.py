@@ -1,6 +1,14 @@
+from collections.abc import Iterator
+import numpy as np
 import pandas as pd
-import io
-from typing import Dict, Tuple, Union, List
+from pathlib import Path
+import tempfile
+from typing import Dict, List, Tuple, Union
+
+from analytics_project.dates import parse_dates
+from analytics_project.profiling import DataProfile
+from analytics_project.schemas import fill_missing, read_csv
+from analytics_project.sketches import hash_rows
 
 
 class DataScrubber:
@@ -8,14 +16,39 @@ class DataScrubber:
         """Initialize the DataScrubber with a DataFrame."""
         self.df = df
 
+    @property
+    def df(self) -> pd.DataFrame:
+        """The data being cleaned."""
+        return self._df
+
+    @df.setter
+    def df(self, df: pd.DataFrame) -> None:
+        self._df = df
+        self._profile: DataProfile | None = None
+
+    def profile(self) -> DataProfile:
+        """Return a one-pass profile of the data, reused until a method changes it.
+
+        Edit the data through the scrubber's methods (or reassign .df) so the
+        cached profile is dropped.
+        """
+        if self._profile is None:
+            self._profile = DataProfile.from_frame(self.df)
+        return self._profile
+
+    def _null_and_duplicate_counts(self) -> tuple[pd.Series, int]:
+        profile = self.profile()
+        if profile.duplicates_exact:
+            return profile.null_counts, profile.duplicate_rows
+        # Too many rows to count exactly from hashes; the check needs an exact answer
+        return profile.null_counts, int(self.df.duplicated().sum())
+
     def check_data_consistency_before_cleaning(self) -> Dict[str, Union[pd.Series, int]]:
-        null_counts = self.df.isnull().sum()
-        duplicate_count = self.df.duplicated().sum()
+        null_counts, duplicate_count = self._null_and_duplicate_counts()
         return {'null_counts': null_counts, 'duplicate_count': duplicate_count}
 
     def check_data_consistency_after_cleaning(self) -> Dict[str, Union[pd.Series, int]]:
-        null_counts = self.df.isnull().sum()
-        duplicate_count = self.df.duplicated().sum()
+        null_counts, duplicate_count = self._null_and_duplicate_counts()
         assert null_counts.sum() == 0, "Data still contains null values after cleaning."
         assert duplicate_count == 0, "Data still contains duplicate records after cleaning."
         return {'null_counts': null_counts, 'duplicate_count': duplicate_count}
@@ -23,12 +56,14 @@ class DataScrubber:
     def convert_column_to_new_data_type(self, column: str, new_type: type) -> pd.DataFrame:
         try:
             self.df[column] = self.df[column].astype(new_type)
+            self._profile = None
             return self.df
         except KeyError:
             raise ValueError(f"Column '{column}' not found in DataFrame.")
 
     def drop_columns(self, columns: List[str]) -> pd.DataFrame:
         self.df.drop(columns=[col for col in columns if col in self.df.columns], inplace=True)
+        self._profile = None
         return self.df
 
     def filter_column_outliers(
@@ -41,11 +76,13 @@ class DataScrubber:
     def format_column_strings_to_lower_and_trim(self, column: str) -> pd.DataFrame:
         if column in self.df.columns:
             self.df[column] = self.df[column].astype(str).str.lower().str.strip()
+            self._profile = None
         return self.df
 
     def format_column_strings_to_upper_and_trim(self, column: str) -> pd.DataFrame:
         if column in self.df.columns:
             self.df[column] = self.df[column].astype(str).str.upper().str.strip()
+            self._profile = None
         return self.df
 
     def handle_missing_data(
@@ -54,19 +91,20 @@ class DataScrubber:
         if drop:
             self.df = self.df.dropna()
         elif fill_value is not None:
-            self.df = self.df.fillna(fill_value)
+            filled = self.df.copy()
+            for col in filled.columns[filled.isna().any().to_numpy()]:
+                filled[col] = fill_missing(filled[col], fill_value)
+            self.df = filled
         return self.df
 
     def inspect_data(self) -> Tuple[str, str]:
-        buffer = io.StringIO()
-        self.df.info(buf=buffer)
-        info_str = buffer.getvalue()
-        describe_str = self.df.describe().to_string()
-        return info_str, describe_str
+        profile = self.profile()
+        return profile.info_text(), profile.describe().to_string()
 
     def parse_dates_to_add_standard_datetime(self, column: str) -> pd.DataFrame:
         if column in self.df.columns:
-            self.df['StandardDateTime'] = pd.to_datetime(self.df[column], errors='coerce')
+            self.df['StandardDateTime'] = parse_dates(self.df[column])
+            self._profile = None
         return self.df
 
     def remove_duplicate_records(self) -> pd.DataFrame:
@@ -81,3 +119,495 @@ class DataScrubber:
         columns = [col for col in columns if col in self.df.columns]
         self.df = self.df[columns]
         return self.df
+
+
+class LazyDataScrubber(DataScrubber):
+    """Record DataScrubber steps and run them as one fused pass on execute().
+
+    The cleaning methods take the same arguments as DataScrubber's but
+    return self, so calls can be chained. Nothing is copied until execute()
+    (or a check/inspect method) builds the result, which is identical to
+    running the same calls eagerly:
+
+    - row filters (outliers, dropna) narrow one shared boolean keep-mask,
+      evaluated only on rows that are still kept
+    - string formatting is queued per column and applied once per unique
+      value in a single sweep
+    - fills and type conversions rewrite only the columns they touch
+    - duplicate removal is deferred to the end: rows equal when it was
+      called stay equal through later row-wise steps, so it runs once over
+      the surviving rows, using the column values as of the call
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """Initialize the LazyDataScrubber with a DataFrame."""
+        super().__init__(df)
+        self._start_plan()
+
+    def _start_plan(self) -> None:
+        self._columns: dict[str, pd.Series] = {col: self.df[col] for col in self.df.columns}
+        self._string_ops: dict[str, tuple[str, ...]] = {}
+        self._keep = np.ones(len(self.df), dtype=bool)
+        self._dedupe_snapshots: list[dict[str, tuple[pd.Series, tuple[str, ...]]]] = []
+        # (id(column), ops) -> (column, result); the column is kept to detect id reuse
+        self._resolved: dict[tuple[int, tuple[str, ...]], tuple[pd.Series, pd.Series]] = {}
+        self.steps: list[str] = []
+
+    # ---------------- Plan helpers ----------------
+
+    def _resolve(self, series: pd.Series, ops: tuple[str, ...]) -> pd.Series:
+        """Apply queued string ops to a column, once per unique value."""
+        if not ops:
+            return series
+        cache_key = (id(series), ops)
+        cached = self._resolved.get(cache_key)
+        if cached is None or cached[0] is not series:
+            codes, uniques = pd.factorize(series)
+            text = pd.Series(uniques).astype(str)
+            missing = codes < 0
+            na_text = series[missing].astype(str)
+            for op in ops:
+                text = getattr(text.str, op)().str.strip()
+                na_text = getattr(na_text.str, op)().str.strip()
+            values = text.to_numpy(dtype=object)[codes]
+            values[missing] = na_text.to_numpy(dtype=object)
+            resolved = pd.Series(values, index=series.index, name=series.name)
+            self._resolved[cache_key] = cached = (series, resolved)
+        return cached[1]
+
+    def _current(self, column: str) -> pd.Series:
+        """Return a column's values with its queued string ops applied."""
+        series = self._resolve(self._columns[column], self._string_ops.pop(column, ()))
+        self._columns[column] = series
+        return series
+
+    def _kept_positions(self) -> np.ndarray:
+        return np.flatnonzero(self._keep)
+
+    def _scatter(self, kept_values: pd.Series, positions: np.ndarray) -> pd.Series:
+        """Spread values computed on kept rows back to a full-length column.
+
+        Rows that were already dropped get an arbitrary kept value; they are
+        never read again.
+        """
+        if len(positions):
+            indexer = np.zeros(len(self._keep), dtype=np.intp)
+            indexer[positions] = np.arange(len(positions))
+            values = kept_values.array.take(indexer)
+        else:
+            values = kept_values.array.take(np.full(len(self._keep), -1), allow_fill=True)
+        return pd.Series(values, index=self.df.index, name=kept_values.name)
+
+    def _group_ids(self, columns: list[pd.Series], positions: np.ndarray) -> np.ndarray:
+        """Return an ID per row, equal for equal rows (NaN equals NaN, as in drop_duplicates)."""
+        ids = np.zeros(len(positions), dtype=np.int64)
+        bound = 1
+        for series in columns:
+            codes, uniques = pd.factorize(series.iloc[positions])
+            codes = np.where(codes < 0, len(uniques), codes)
+            if bound * (len(uniques) + 1) >= 1 << 62:
+                ids, _ = pd.factorize(ids)
+                bound = int(ids.max()) + 1 if len(ids) else 1
+            ids = ids * (len(uniques) + 1) + codes
+            bound *= len(uniques) + 1
+        return ids
+
+    # ---------------- Recorded steps ----------------
+
+    def convert_column_to_new_data_type(self, column: str, new_type: type) -> "LazyDataScrubber":
+        """Convert ``column`` to ``new_type``, computing only the kept rows."""
+        if column not in self._columns:
+            raise ValueError(f"Column '{column}' not found in DataFrame.")
+        positions = self._kept_positions()
+        converted = self._current(column).iloc[positions].astype(new_type)
+        self._columns[column] = self._scatter(converted, positions)
+        self.steps.append(f"convert {column} -> {new_type}")
+        return self
+
+    def drop_columns(self, columns: list[str]) -> "LazyDataScrubber":
+        """Drop ``columns`` from the plan."""
+        for col in columns:
+            self._columns.pop(col, None)
+            self._string_ops.pop(col, None)
+        self.steps.append(f"drop {columns}")
+        return self
+
+    def filter_column_outliers(
+        self, column: str, lower_bound: float, upper_bound: float
+    ) -> "LazyDataScrubber":
+        """Narrow the keep-mask to rows with ``column`` inside the bounds."""
+        if column in self._columns:
+            positions = self._kept_positions()
+            values = self._current(column).iloc[positions]
+            inside = ((values >= lower_bound) & (values <= upper_bound)).to_numpy(dtype=bool)
+            self._keep[positions[~inside]] = False
+            self.steps.append(f"filter {lower_bound} <= {column} <= {upper_bound}")
+        return self
+
+    def format_column_strings_to_lower_and_trim(self, column: str) -> "LazyDataScrubber":
+        """Queue lowercasing and trimming ``column``."""
+        if column in self._columns:
+            self._string_ops[column] = (*self._string_ops.get(column, ()), "lower")
+            self.steps.append(f"lower+trim {column}")
+        return self
+
+    def format_column_strings_to_upper_and_trim(self, column: str) -> "LazyDataScrubber":
+        """Queue uppercasing and trimming ``column``."""
+        if column in self._columns:
+            self._string_ops[column] = (*self._string_ops.get(column, ()), "upper")
+            self.steps.append(f"upper+trim {column}")
+        return self
+
+    def handle_missing_data(
+        self, drop: bool = False, fill_value: float | str | None = None
+    ) -> "LazyDataScrubber":
+        """Narrow the keep-mask to complete rows, or fill the columns with nulls."""
+        # Columns with queued string ops hold no nulls: astype(str) turns them into text
+        nullable = [col for col in self._columns if col not in self._string_ops]
+        if drop:
+            positions = self._kept_positions()
+            complete = np.ones(len(positions), dtype=bool)
+            for col in nullable:
+                complete &= self._columns[col].iloc[positions].notna().to_numpy()
+            self._keep[positions[~complete]] = False
+            self.steps.append("dropna")
+        elif fill_value is not None:
+            for col in nullable:
+                series = self._columns[col]
+                if series.isna().any():
+                    self._columns[col] = fill_missing(series, fill_value)
+            self.steps.append(f"fillna {fill_value!r}")
+        return self
+
+    def parse_dates_to_add_standard_datetime(self, column: str) -> "LazyDataScrubber":
+        """Parse ``column`` into StandardDateTime, computing only the kept rows."""
+        if column in self._columns:
+            positions = self._kept_positions()
+            parsed = parse_dates(self._current(column).iloc[positions])
+            self._columns["StandardDateTime"] = self._scatter(parsed, positions).rename(
+                "StandardDateTime"
+            )
+            self._string_ops.pop("StandardDateTime", None)
+            self.steps.append(f"parse dates {column}")
+        return self
+
+    def remove_duplicate_records(self) -> "LazyDataScrubber":
+        """Snapshot the columns for the dedupe that execute() runs."""
+        self._dedupe_snapshots.append(
+            {col: (series, self._string_ops.get(col, ())) for col, series in self._columns.items()}
+        )
+        self.steps.append("dedupe (deferred)")
+        return self
+
+    def rename_columns(self, column_mapping: dict[str, str]) -> "LazyDataScrubber":
+        """Rename the planned columns by ``column_mapping``."""
+        self._columns = {column_mapping.get(col, col): s for col, s in self._columns.items()}
+        self._string_ops = {
+            column_mapping.get(col, col): ops for col, ops in self._string_ops.items()
+        }
+        self.steps.append(f"rename {column_mapping}")
+        return self
+
+    def reorder_columns(self, columns: list[str]) -> "LazyDataScrubber":
+        """Select and reorder the planned columns."""
+        self._columns = {col: self._columns[col] for col in columns if col in self._columns}
+        self._string_ops = {
+            col: ops for col, ops in self._string_ops.items() if col in self._columns
+        }
+        self.steps.append(f"reorder {columns}")
+        return self
+
+    # ---------------- Execution ----------------
+
+    def execute(self) -> pd.DataFrame:
+        """Run the recorded plan and return the cleaned DataFrame.
+
+        The result becomes self.df and a new, empty plan starts from it.
+        """
+        positions = self._kept_positions()
+        for columns in self._dedupe_columns():
+            if columns:
+                duplicated = pd.Series(self._group_ids(columns, positions)).duplicated()
+                positions = positions[~duplicated.to_numpy()]
+
+        self.df = self._materialize(positions)
+        self._start_plan()
+        return self.df
+
+    def _dedupe_columns(self) -> list[list[pd.Series]]:
+        """Full-length column values as of each deferred remove_duplicate_records() call."""
+        return [
+            [self._resolve(series, ops) for series, ops in snapshot.values()]
+            for snapshot in self._dedupe_snapshots
+        ]
+
+    def _materialize(self, positions: np.ndarray) -> pd.DataFrame:
+        """Build the result frame from the given row positions, in one copy."""
+        data = {col: self._current(col).array.take(positions) for col in list(self._columns)}
+        return pd.DataFrame(data, index=self.df.index[positions], copy=False)
+
+    def check_data_consistency_before_cleaning(self) -> dict[str, pd.Series | int]:
+        """Execute the plan, then count nulls and duplicates."""
+        self.execute()
+        return super().check_data_consistency_before_cleaning()
+
+    def check_data_consistency_after_cleaning(self) -> dict[str, pd.Series | int]:
+        """Execute the plan, then assert no nulls or duplicates remain."""
+        self.execute()
+        return super().check_data_consistency_after_cleaning()
+
+    def inspect_data(self) -> tuple[str, str]:
+        """Execute the plan, then return info() and describe() text."""
+        self.execute()
+        return super().inspect_data()
+
+
+# Rows per chunk streamed by ChunkedDataScrubber (~100-200 MB per chunk for
+# typical extracts)
+DEFAULT_CHUNK_ROWS = 500_000
+
+# Hash partitions of the on-disk duplicate index; each one is loaded alone
+DEFAULT_DEDUPE_PARTITIONS = 256
+
+_INDEX_RECORD = np.dtype([("row", "<i8"), ("h1", "<u8"), ("h2", "<u8")])
+_SECOND_HASH_KEY = "chunked_dedupe!!"
+
+
+class _SpilledDedupeIndex:
+    """Row hashes spilled to disk in hash partitions, resolved one partition at a time."""
+
+    def __init__(self, folder: Path, partitions: int):
+        self.folder = folder
+        self.partitions = partitions
+        folder.mkdir(parents=True, exist_ok=True)
+
+    def _part_path(self, part: int) -> Path:
+        return self.folder / f"part_{part:05d}.bin"
+
+    def add(self, rows: np.ndarray, h1: np.ndarray, h2: np.ndarray) -> None:
+        records = np.empty(len(rows), dtype=_INDEX_RECORD)
+        records["row"], records["h1"], records["h2"] = rows, h1, h2
+        parts = h1 % np.uint64(self.partitions)
+        order = np.argsort(parts, kind="stable")
+        bounds = np.searchsorted(parts[order], np.arange(self.partitions + 1))
+        for part in np.flatnonzero(np.diff(bounds)):
+            with self._part_path(part).open("ab") as f:
+                records[order[bounds[part] : bounds[part + 1]]].tofile(f)
+
+    def duplicate_rows(self, skip: np.ndarray | None = None) -> Iterator[np.ndarray]:
+        """Yield, per partition, the row numbers that repeat an earlier row.
+
+        Rows flagged in ``skip`` (e.g. dropped by an earlier dedupe) are ignored.
+        """
+        for part in range(self.partitions):
+            path = self._part_path(part)
+            if not path.exists():
+                continue
+            records = np.fromfile(path, dtype=_INDEX_RECORD)
+            if skip is not None:
+                records = records[~skip[records["row"]]]
+            # Rows were appended in file order, so the first of a group is the earliest
+            duplicated = pd.DataFrame({"h1": records["h1"], "h2": records["h2"]}).duplicated()
+            yield records["row"][duplicated.to_numpy()]
+
+
+class ChunkedDataScrubber:
+    """Clean a CSV larger than memory with DataScrubber's method surface.
+
+    Step methods only record the call (see the DataScrubber method of the
+    same name for what each does) and return self; nothing is read until
+    execute(), which streams the file twice in chunks of ``chunk_rows``:
+
+    1. each chunk runs the plan on a LazyDataScrubber, and the surviving
+       rows' hashes (as of each remove_duplicate_records() call) are spilled
+       to hash-partitioned files; each partition is then loaded on its own
+       to mark duplicate row numbers in an on-disk bitmap
+    2. each chunk runs the plan again, drops the marked rows and is
+       appended to the output CSV
+
+    Memory stays bounded by one chunk plus one index partition. Duplicates
+    are found by two 64-bit row hashes rather than exact comparison. Files
+    of the three source tables read with their schemas.py dtypes; other
+    files infer dtypes chunk by chunk, so pass ``dtype=`` (forwarded to
+    read_csv) when number formatting must be identical across the output.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        work_dir: str | Path | None = None,
+        partitions: int = DEFAULT_DEDUPE_PARTITIONS,
+        **read_csv_kwargs,
+    ):
+        """Initialize the ChunkedDataScrubber with a CSV path."""
+        if chunk_rows <= 0:
+            raise ValueError(f"chunk_rows must be positive, got {chunk_rows}")
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self.work_dir = work_dir
+        self.partitions = partitions
+        self.read_csv_kwargs = read_csv_kwargs
+        self.output_path: Path | None = None
+        self._profiles: dict[Path, DataProfile] = {}
+        self.steps: list[tuple[str, tuple, dict]] = []
+
+    # ---------------- Streaming helpers ----------------
+
+    def _chunks(self, path: Path | None = None) -> Iterator[pd.DataFrame]:
+        path = Path(path or self.path)
+        kwargs = self.read_csv_kwargs if path == self.path else {}
+        yield from read_csv(path, chunksize=self.chunk_rows, **kwargs)
+
+    def _replay(self, chunk: pd.DataFrame) -> "LazyDataScrubber":
+        lazy = LazyDataScrubber(chunk)
+        for method, args, kwargs in self.steps:
+            getattr(lazy, method)(*args, **kwargs)
+        return lazy
+
+    def _record(self, method: str, *args, **kwargs) -> "ChunkedDataScrubber":
+        self.steps.append((method, args, kwargs))
+        return self
+
+    def _consistency(self, path: Path) -> dict[str, pd.Series | int]:
+        """Stream ``path`` once: profile it and count exact duplicates via the spill index."""
+        profile = DataProfile()
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            index = _SpilledDedupeIndex(Path(tmp), self.partitions)
+            for chunk in self._chunks(path):
+                columns = [chunk[col] for col in chunk.columns]
+                rows = np.arange(profile.rows, profile.rows + len(chunk))
+                index.add(rows, hash_rows(columns), hash_rows(columns, _SECOND_HASH_KEY))
+                profile.update(chunk)
+            duplicate_count = sum(len(rows) for rows in index.duplicate_rows())
+        self._profiles[path] = profile
+        return {"null_counts": profile.null_counts, "duplicate_count": duplicate_count}
+
+    def profile(self, path: Path | None = None) -> DataProfile:
+        """Stream a one-pass profile of the input (or another CSV, e.g. the output)."""
+        path = Path(path or self.path)
+        if path not in self._profiles:
+            self._profiles[path] = DataProfile.from_chunks(self._chunks(path))
+        return self._profiles[path]
+
+    # ---------------- Checks ----------------
+
+    def check_data_consistency_before_cleaning(self) -> dict[str, pd.Series | int]:
+        """Stream the input once for its null counts and exact-duplicate count."""
+        return self._consistency(self.path)
+
+    def check_data_consistency_after_cleaning(self) -> dict[str, pd.Series | int]:
+        """Stream the output of execute() and assert it holds no nulls or duplicates."""
+        if self.output_path is None:
+            raise RuntimeError("Run execute(output_path) before checking the cleaned data.")
+        result = self._consistency(self.output_path)
+        assert result["null_counts"].sum() == 0, "Data still contains null values after cleaning."
+        assert result["duplicate_count"] == 0, (
+            "Data still contains duplicate records after cleaning."
+        )
+        return result
+
+    def inspect_data(self) -> tuple[str, str]:
+        """Return info() and describe() text from the streamed profile of the input."""
+        profile = self.profile()
+        return profile.info_text(), profile.describe().to_string()
+
+    # ---------------- Recorded steps ----------------
+
+    def convert_column_to_new_data_type(self, column: str, new_type: type) -> "ChunkedDataScrubber":
+        """Record a dtype conversion of ``column``."""
+        return self._record("convert_column_to_new_data_type", column, new_type)
+
+    def drop_columns(self, columns: list[str]) -> "ChunkedDataScrubber":
+        """Record dropping ``columns``."""
+        return self._record("drop_columns", columns)
+
+    def filter_column_outliers(
+        self, column: str, lower_bound: float, upper_bound: float
+    ) -> "ChunkedDataScrubber":
+        """Record keeping rows with ``column`` inside the bounds."""
+        return self._record("filter_column_outliers", column, lower_bound, upper_bound)
+
+    def format_column_strings_to_lower_and_trim(self, column: str) -> "ChunkedDataScrubber":
+        """Record lowercasing and trimming ``column``."""
+        return self._record("format_column_strings_to_lower_and_trim", column)
+
+    def format_column_strings_to_upper_and_trim(self, column: str) -> "ChunkedDataScrubber":
+        """Record uppercasing and trimming ``column``."""
+        return self._record("format_column_strings_to_upper_and_trim", column)
+
+    def handle_missing_data(
+        self, drop: bool = False, fill_value: float | str | None = None
+    ) -> "ChunkedDataScrubber":
+        """Record dropping or filling missing values."""
+        return self._record("handle_missing_data", drop=drop, fill_value=fill_value)
+
+    def parse_dates_to_add_standard_datetime(self, column: str) -> "ChunkedDataScrubber":
+        """Record parsing ``column`` into StandardDateTime."""
+        return self._record("parse_dates_to_add_standard_datetime", column)
+
+    def remove_duplicate_records(self) -> "ChunkedDataScrubber":
+        """Record a dedupe of the rows as they stand at this step."""
+        return self._record("remove_duplicate_records")
+
+    def rename_columns(self, column_mapping: dict[str, str]) -> "ChunkedDataScrubber":
+        """Record renaming columns by ``column_mapping``."""
+        return self._record("rename_columns", column_mapping)
+
+    def reorder_columns(self, columns: list[str]) -> "ChunkedDataScrubber":
+        """Record reordering to ``columns``."""
+        return self._record("reorder_columns", columns)
+
+    # ---------------- Execution ----------------
+
+    def execute(self, output_path: str | Path) -> int:
+        """Run the recorded plan over the whole file, writing ``output_path``.
+
+        Returns:
+            int: Rows written.
+        """
+        output_path = Path(output_path)
+        with tempfile.TemporaryDirectory(dir=self.work_dir) as tmp:
+            tmp = Path(tmp)
+            dedupes = sum(1 for method, _, _ in self.steps if method == "remove_duplicate_records")
+            indexes = [
+                _SpilledDedupeIndex(tmp / f"dedupe_{i}", self.partitions) for i in range(dedupes)
+            ]
+
+            # Pass 1: spill the hashes of rows that survive the row filters
+            total_rows = 0
+            for chunk in self._chunks():
+                lazy = self._replay(chunk)
+                positions = lazy._kept_positions()
+                for index, columns in zip(indexes, lazy._dedupe_columns(), strict=True):
+                    kept = [col.iloc[positions] for col in columns]
+                    index.add(
+                        total_rows + positions, hash_rows(kept), hash_rows(kept, _SECOND_HASH_KEY)
+                    )
+                total_rows += len(chunk)
+
+            # Resolve each dedupe in call order, one index partition at a time
+            dropped = np.lib.format.open_memmap(
+                tmp / "dropped.npy", mode="w+", dtype=bool, shape=(total_rows,)
+            )
+            for index in indexes:
+                for rows in index.duplicate_rows(skip=dropped):
+                    dropped[rows] = True
+
+            # Pass 2: clean again and append the surviving rows to the output
+            written = 0
+            offset = 0
+            with output_path.open("w", newline="") as out:
+                for chunk in self._chunks():
+                    lazy = self._replay(chunk)
+                    positions = lazy._kept_positions()
+                    positions = positions[~dropped[offset + positions]]
+                    frame = lazy._materialize(positions)
+                    frame.to_csv(out, index=False, header=offset == 0)
+                    written += len(frame)
+                    offset += len(chunk)
+            del dropped
+
+        self.output_path = output_path
+        self._profiles.pop(output_path, None)
+        return written
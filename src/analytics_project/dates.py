@@ -0,0 +1,133 @@
+"""Normalize source date strings to datetimes, ISO dates and integer keys.
+
+The raw files spell dates like 5/4/25 and hold only a few hundred distinct
+values in thousands of rows. Instead of letting pandas infer a format (and
+fall back to dateutil for every value), a DateParser detects the format
+once from a sample and then parses each distinct string once with that
+fixed format, spreading the results back to the rows.
+
+Module Information:
+    - Filename: dates.py
+    - Module: dates
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Format detection: the candidate that parses most of a sample of the
+      distinct values wins, and is reused for later chunks of the same file
+    - Unique-value cache: parsing cost scales with distinct dates, not rows
+    - Values the detected format rejects get the other candidate formats
+      in turn (then per-value inference), so a file mixing 5/4/25 and
+      2025-05-04 still parses; impossible dates such as 2023-13-01 become NaT
+
+Example:
+    parser = DateParser()
+    for chunk in chunks:
+        chunk["sale_date_key"] = parser.keys(chunk["SaleDate"])
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+# Source files write dates as 5/4/25; prepared files as 2025-05-04
+DATE_FORMATS = ("%m/%d/%y", "%Y-%m-%d", "%m/%d/%Y")
+
+DETECT_SAMPLE = 1_000
+
+
+class DateParser:
+    """Parse date columns with a format detected once and a per-value cache.
+
+    Args:
+        formats: Candidate formats, best guess first.
+        fmt: Skip detection and use this format first.
+    """
+
+    def __init__(self, formats: Sequence[str] = DATE_FORMATS, fmt: str | None = None):
+        """Create a parser; the format is detected on first use unless given."""
+        self.formats = tuple(formats)
+        self.format = fmt
+
+    def detect(self, uniques: pd.Index) -> str:
+        """Pick (and remember) the candidate format that parses most of a sample."""
+        if self.format is None:
+            sample = pd.Series(uniques[:DETECT_SAMPLE]).astype(str)
+            self.format = max(
+                self.formats,
+                key=lambda fmt: pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum(),
+            )
+        return self.format
+
+    def _parse_uniques(self, uniques: pd.Index) -> np.ndarray:
+        if isinstance(uniques, pd.DatetimeIndex):
+            return uniques.to_numpy(dtype="datetime64[ns]")
+        text = pd.Series(uniques, dtype=object).astype(str)
+        first = self.detect(uniques)
+        parsed = pd.to_datetime(text, format=first, errors="coerce")
+        for fmt in self.formats:
+            missing = parsed.isna()
+            if fmt == first or not missing.any():
+                continue
+            parsed[missing] = pd.to_datetime(text[missing], format=fmt, errors="coerce")
+        missing = parsed.isna()
+        if missing.any():
+            # Last resort for the few distinct values no candidate fits
+            parsed[missing] = pd.to_datetime(text[missing], format="mixed", errors="coerce")
+        return parsed.to_numpy(dtype="datetime64[ns]")
+
+    def _factorize(self, values: pd.Series) -> tuple[np.ndarray, pd.DatetimeIndex]:
+        """Return row codes (-1 = missing) and the parsed distinct values."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes, uniques = values.cat.codes.to_numpy(), values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+        return codes, pd.DatetimeIndex(self._parse_uniques(uniques))
+
+    def parse(self, values: pd.Series) -> pd.Series:
+        """Return values as datetime64 (NaT where no candidate format fits)."""
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values
+        codes, parsed = self._factorize(values)
+        # Code -1 (missing) picks the trailing NaT
+        lookup = np.append(parsed.to_numpy(), np.datetime64("NaT", "ns"))
+        return pd.Series(lookup[codes], index=values.index, name=values.name)
+
+    def keys(self, values: pd.Series) -> pd.Series:
+        """Return integer YYYYMMDD keys (<NA> when unparseable)."""
+        return self.iso_and_keys(values)[1]
+
+    def iso(self, values: pd.Series) -> pd.Series:
+        """Return ISO YYYY-MM-DD strings (None when unparseable)."""
+        return self.iso_and_keys(values)[0]
+
+    def iso_and_keys(self, values: pd.Series) -> tuple[pd.Series, pd.Series]:
+        """Return iso() and keys() of one column from a single parse."""
+        codes, parsed = self._factorize(values)
+        text = np.asarray(parsed.strftime("%Y-%m-%d"), dtype=object)
+        iso_lookup = np.append(np.where(parsed.isna(), None, text), None)
+        key_lookup = pd.array(
+            [*(parsed.year * 10_000 + parsed.month * 100 + parsed.day), pd.NA], dtype="Int64"
+        )
+        return (
+            pd.Series(iso_lookup[codes], index=values.index, name=values.name, dtype=object),
+            pd.Series(key_lookup.take(codes), index=values.index, name=values.name),
+        )
+
+
+def parse_dates(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """Parse one date column (see DateParser.parse)."""
+    return DateParser(fmt=fmt).parse(values)
+
+
+def to_date_keys(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """Convert one date column to integer YYYYMMDD keys (see DateParser.keys)."""
+    return DateParser(fmt=fmt).keys(values)
+
+
+def to_iso_dates(values: pd.Series, fmt: str | None = None) -> pd.Series:
+    """Convert one date column to ISO date strings (see DateParser.iso)."""
+    return DateParser(fmt=fmt).iso(values)
+
+
+__all__ = ["DATE_FORMATS", "DateParser", "parse_dates", "to_date_keys", "to_iso_dates"]
@@ -13,6 +13,8 @@ Key Concepts:
     - Statistical functions (min, max, mean, stdev)
     - Formatted output for professional reporting
     - Logging statistical summaries
+    - Streaming statistics: StreamingStats is fed chunk by chunk (for
+      example millions of sale_amount_usd values) and merged across workers
 
 Professional Applications:
     - Data quality assessment
@@ -25,9 +27,13 @@ Professional Applications:
 # Imports At the Top
 #####################################
 
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
 import statistics
 
+import numpy as np
+
+from .sketches import QuantileSketch, RunningMoments
+
 # Import the shared logger
 from .utils_logger import init_logger, logger
 
@@ -36,24 +42,124 @@ from .utils_logger import init_logger, logger
 #####################################
 
 
+# NumPy arrays (and pandas Series) are summarized in C instead of one
+# Python number at a time; lists keep the exact statistics-module results.
+# Both raise statistics.StatisticsError for too few values.
+
+
+def _as_array(scores: Sequence[float]) -> np.ndarray | None:
+    if isinstance(scores, list | tuple):
+        return None
+    return np.asarray(scores, dtype=np.float64) if hasattr(scores, "__array__") else None
+
+
 def calculate_min(scores: Sequence[float]) -> float:
     """Return the minimum value in the list."""
-    return min(scores)
+    values = _as_array(scores)
+    return min(scores) if values is None else float(values.min())
 
 
 def calculate_max(scores: Sequence[float]) -> float:
     """Return the maximum value in the list."""
-    return max(scores)
+    values = _as_array(scores)
+    return max(scores) if values is None else float(values.max())
 
 
 def calculate_mean(scores: Sequence[float]) -> float:
     """Return the mean (average) of the list."""
-    return statistics.mean(scores)
+    values = _as_array(scores)
+    if values is None:
+        return statistics.mean(scores)
+    if not len(values):
+        raise statistics.StatisticsError("mean requires at least one data point")
+    return float(values.mean())
 
 
 def calculate_standard_deviation(scores: Sequence[float]) -> float:
     """Return the standard deviation of the list."""
-    return statistics.stdev(scores)
+    values = _as_array(scores)
+    if values is None:
+        return statistics.stdev(scores)
+    if len(values) < 2:
+        raise statistics.StatisticsError("stdev requires at least two data points")
+    return float(values.std(ddof=1))
+
+
+#####################################
+# Streaming Statistics
+#####################################
+
+
+class StreamingStats:
+    """Min, max, mean, standard deviation and quantiles of a stream of numbers.
+
+    Values arrive in chunks (lists or arrays), so the whole stream never has
+    to be in memory. Moments are exact (sketches.RunningMoments, Welford's
+    method); quantiles come from sketches.QuantileSketch and are approximate
+    once more than ``k`` values have been seen. NaNs are skipped. Stats
+    built by separate workers combine with merge().
+
+    Example:
+        stats = StreamingStats()
+        for chunk in pd.read_csv(path, usecols=["sale_amount_usd"], chunksize=100_000):
+            stats.update(chunk["sale_amount_usd"].to_numpy())
+        stats.mean, stats.stdev, stats.quantile(0.5)
+    """
+
+    def __init__(self, k: int = 512):
+        """Start with no values; ``k`` sets the quantile sketch's accuracy."""
+        self.moments = RunningMoments()
+        self.sketch = QuantileSketch(k)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Sequence[float]], k: int = 512) -> "StreamingStats":
+        """Feed every chunk of ``chunks`` into new stats."""
+        stats = cls(k)
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    def update(self, values: Sequence[float] | float) -> "StreamingStats":
+        """Add one chunk of values (or a single value)."""
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+        self.moments.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other: "StreamingStats") -> "StreamingStats":
+        """Add the values seen by another StreamingStats (e.g. from a worker)."""
+        self.moments.merge(other.moments)
+        self.sketch.merge(other.sketch)
+        return self
+
+    @property
+    def count(self) -> int:
+        """Number of (non-NaN) values seen."""
+        return self.moments.count
+
+    @property
+    def min(self) -> float:
+        """Smallest value seen."""
+        return self.moments.min
+
+    @property
+    def max(self) -> float:
+        """Largest value seen."""
+        return self.moments.max
+
+    @property
+    def mean(self) -> float:
+        """Mean of the values seen (NaN if none)."""
+        return self.moments.mean if self.count else float("nan")
+
+    @property
+    def stdev(self) -> float:
+        """Sample standard deviation, like statistics.stdev (NaN below two values)."""
+        return self.moments.std
+
+    def quantile(self, q: float) -> float:
+        """Return the (approximate) value at quantile ``q`` (0 to 1)."""
+        return self.sketch.quantiles([q])[0]
 
 
 #####################################
@@ -132,4 +238,5 @@ __all__ = [
     "calculate_mean",
     "calculate_standard_deviation",
     "demo_stats",
+    "StreamingStats",
 ]
@@ -0,0 +1,236 @@
+"""
+Dimension History (P4)
+Keeps a Type 2 slowly-changing history of the customer and product
+dimensions next to the current-state tables.
+
+customer and product hold one row per source ID and are overwritten by
+each load. customer_history and product_history keep every version of
+each row under an integer surrogate key (customer_key, product_key), with
+the dates it was in effect. Each sale records the surrogate keys current
+when it was loaded, so reports can join to the attributes as they were.
+
+After each dimension load, update_history() hashes the loaded rows in
+one vectorized pass and compares the hashes with those stored on the
+current versions. New IDs get a first version; changed rows have their
+version expired and a new one opened. Unchanged rows are not written.
+"""
+
+from dataclasses import dataclass
+from datetime import date
+import sqlite3
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+
+# expiry_date of the version currently in effect
+OPEN_END = "9999-12-31"
+
+
+@dataclass(frozen=True)
+class TrackedDimension:
+    """A dimension table whose changes are versioned in <table>_history."""
+
+    table: str
+    natural_key: str
+    surrogate_key: str
+    # (column, SQLite type) pairs whose changes open a new version
+    attributes: tuple[tuple[str, str], ...]
+
+    @property
+    def history_table(self) -> str:
+        """Name of the history table."""
+        return f"{self.table}_history"
+
+    @property
+    def columns(self) -> list[str]:
+        """Names of the tracked attribute columns."""
+        return [name for name, _ in self.attributes]
+
+
+DIMENSIONS = {
+    "customer": TrackedDimension(
+        "customer",
+        "customer_id",
+        "customer_key",
+        (
+            ("name", "TEXT"),
+            ("region", "TEXT"),
+            ("join_date", "TEXT"),
+            ("open_invoices_num", "TEXT"),
+            ("retention_category", "TEXT"),
+        ),
+    ),
+    "product": TrackedDimension(
+        "product",
+        "product_id",
+        "product_key",
+        (
+            ("product_name", "TEXT"),
+            ("category", "TEXT"),
+            ("unit_price_usd", "REAL"),
+            ("restock_days", "INTEGER"),
+            ("supplier", "TEXT"),
+        ),
+    ),
+}
+
+
+# ---------------------------------------------------
+# SCHEMA
+# ---------------------------------------------------
+
+
+def create_history_tables(cursor: sqlite3.Cursor) -> None:
+    """Create the history tables, with at most one current version per ID."""
+    for dim in DIMENSIONS.values():
+        definitions = [
+            f"{dim.surrogate_key} INTEGER PRIMARY KEY",
+            f"{dim.natural_key} INTEGER NOT NULL",
+            *(f"{name} {kind}" for name, kind in dim.attributes),
+            "row_hash INTEGER NOT NULL",
+            "effective_date TEXT NOT NULL",
+            f"expiry_date TEXT NOT NULL DEFAULT '{OPEN_END}'",
+            "is_current INTEGER NOT NULL DEFAULT 1",
+        ]
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {dim.history_table} ({', '.join(definitions)})")
+        cursor.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{dim.history_table}_current "
+            f"ON {dim.history_table}({dim.natural_key}) WHERE is_current = 1"
+        )
+
+
+# ---------------------------------------------------
+# CHANGE DETECTION
+# ---------------------------------------------------
+
+
+def normalize(rows: pd.DataFrame, dim: TrackedDimension) -> pd.DataFrame:
+    """Return the ID and tracked columns of ``rows`` in one dtype per SQLite type.
+
+    A value must hash the same whichever way it reached the frame: from a
+    CSV whose column pandas read as int, float or text, or from SQLite.
+    Missing attribute columns are NULL.
+    """
+    columns = {dim.natural_key: rows[dim.natural_key].astype("int64").to_numpy()}
+    for name, kind in dim.attributes:
+        values = rows[name] if name in rows.columns else pd.Series(None, index=rows.index)
+        if kind == "TEXT":
+            columns[name] = values.astype(str).astype(object).where(values.notna(), None)
+        else:
+            columns[name] = pd.to_numeric(values, errors="coerce").astype("float64")
+    return pd.DataFrame(columns, index=rows.index)
+
+
+def row_hashes(values: pd.DataFrame) -> np.ndarray:
+    """Hash each row of ``values`` to a signed 64-bit integer (SQLite INTEGER)."""
+    return pd.util.hash_pandas_object(values, index=False).to_numpy().view(np.int64)
+
+
+def read_dimension(cursor: sqlite3.Cursor, table: str, ids: list[int]) -> pd.DataFrame:
+    """Read the given IDs' rows back from a dimension table."""
+    dim = DIMENSIONS[table]
+    placeholders = ", ".join("?" for _ in ids)
+    return pd.read_sql_query(
+        f"SELECT {dim.natural_key}, {', '.join(dim.columns)} FROM {dim.table} "  # noqa: S608
+        f"WHERE {dim.natural_key} IN ({placeholders})",
+        cursor.connection,
+        params=ids,
+    )
+
+
+def update_history(
+    cursor: sqlite3.Cursor, table: str, rows: pd.DataFrame, as_of: str | None = None
+) -> dict[str, int]:
+    """Version the given dimension rows.
+
+    Each row's tracked columns are hashed and compared with the current
+    version of its ID. IDs not in ``rows`` are left alone.
+
+    Args:
+        cursor: Open cursor on the warehouse connection.
+        table: Dimension table (a key of DIMENSIONS).
+        rows: Prepared rows (prepare_customers() or prepare_products()), one per ID.
+        as_of: ISO date the new versions take effect and the replaced ones
+            expire (default: today).
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted" (new IDs), "changed" and
+        "unchanged".
+    """
+    dim = DIMENSIONS[table]
+    as_of = as_of or date.today().isoformat()
+    values = normalize(rows, dim)
+    hashes = row_hashes(values[dim.columns])
+
+    versions = np.array(
+        cursor.execute(
+            f"SELECT {dim.natural_key}, {dim.surrogate_key}, row_hash "  # noqa: S608
+            f"FROM {dim.history_table} WHERE is_current = 1"
+        ).fetchall(),
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    current = pd.DataFrame(
+        dict(zip([dim.natural_key, dim.surrogate_key, "version_hash"], versions.T, strict=True))
+    )
+    merged = pd.DataFrame({dim.natural_key: values[dim.natural_key].to_numpy()}).merge(
+        current, on=dim.natural_key, how="left"
+    )
+    new = merged[dim.surrogate_key].isna().to_numpy()
+    changed = ~new & (merged["version_hash"].to_numpy() != hashes)
+
+    # Expire first: the unique index allows one current version per ID
+    cursor.executemany(
+        f"UPDATE {dim.history_table} SET expiry_date = ?, is_current = 0 "  # noqa: S608
+        f"WHERE {dim.surrogate_key} = ?",
+        [(as_of, int(key)) for key in merged.loc[changed, dim.surrogate_key]],
+    )
+    opened = values[new | changed]
+    opened = opened.astype(object).where(opened.notna(), None)
+    columns = [dim.natural_key, *dim.columns]
+    cursor.executemany(
+        f"INSERT INTO {dim.history_table} "  # noqa: S608
+        f"({', '.join(columns)}, row_hash, effective_date) "
+        f"VALUES ({', '.join('?' for _ in columns)}, ?, ?)",
+        [
+            (*row, int(row_hash), as_of)
+            for row, row_hash in zip(
+                opened[columns].itertuples(index=False, name=None),
+                hashes[new | changed],
+                strict=True,
+            )
+        ],
+    )
+
+    counts = {
+        "inserted": int(new.sum()),
+        "changed": int(changed.sum()),
+        "unchanged": int(len(values) - new.sum() - changed.sum()),
+    }
+    logger.info(f"{dim.history_table}: versions as of {as_of} {counts}")
+    return counts
+
+
+def current_keys(cursor: sqlite3.Cursor, table: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return every ID in ``table`` and its current surrogate key (0 if unversioned)."""
+    dim = DIMENSIONS[table]
+    rows = cursor.execute(
+        f"SELECT d.{dim.natural_key}, IFNULL(h.{dim.surrogate_key}, 0) "  # noqa: S608
+        f"FROM {dim.table} d LEFT JOIN {dim.history_table} h "
+        f"ON h.{dim.natural_key} = d.{dim.natural_key} AND h.is_current = 1"
+    ).fetchall()
+    keys = np.array(rows, dtype=np.int64).reshape(-1, 2)
+    return keys[:, 0], keys[:, 1]
+
+
+__all__ = [
+    "DIMENSIONS",
+    "OPEN_END",
+    "TrackedDimension",
+    "create_history_tables",
+    "current_keys",
+    "normalize",
+    "read_dimension",
+    "row_hashes",
+    "update_history",
+]
@@ -3,10 +3,47 @@ ETL to Data Warehouse (P4)
 Loads cleaned data from data/processed/ into a SQLite data warehouse.
 """
 
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import UTC, datetime
+import hashlib
+import os
 from pathlib import Path
+import queue
 import sqlite3
-import pandas as pd
+import threading
+import time
+
 from loguru import logger
+import numpy as np
+import pandas as pd
+
+from analytics_project.dates import DateParser
+from analytics_project.dw.dimension_history import (
+    DIMENSIONS,
+    create_history_tables,
+    read_dimension,
+    update_history,
+)
+from analytics_project.dw.key_resolution import (
+    DEFAULT_ORPHAN_POLICY,
+    UNKNOWN_MEMBER_ID,
+    KeyResolver,
+    create_quarantine_table,
+    ensure_unknown_members,
+    quarantine,
+)
+from analytics_project.dw.olap_cubes import refresh_cubes
+from analytics_project.instrumentation import stage
+from analytics_project.intermediate import (
+    read_chunks,
+    read_frame,
+    read_shard,
+    shard_bounds,
+    source_path,
+)
+from analytics_project.utils_logger import throttled
 
 # ---------------------------------------------------
 # PATH SETUP
@@ -26,12 +63,70 @@ DW_PATH = DW_DIR / "datawarehouse.db"
 
 logger.info(f"DW_PATH resolved to: {DW_PATH}")
 
-# Cleaned files
+# Cleaned files; a fresher binary copy (data_prep --format npy) is read instead
 PROCESSED_DIR = REPO_ROOT / "data" / "processed"
 CUSTOMERS_CSV = PROCESSED_DIR / "customers_data_cleaned.csv"
 PRODUCTS_CSV = PROCESSED_DIR / "products_data_cleaned.csv"
 SALES_CSV = PROCESSED_DIR / "sales_data_cleaned.csv"
 
+# Rows handed to a single executemany() call during bulk loads
+DEFAULT_CHUNK_SIZE = 50_000
+
+# CSV rows read per chunk when streaming the sales file
+DEFAULT_READ_CHUNK_ROWS = 250_000
+
+# Parallel sales load: batches waiting for the writer, and rows per commit
+DEFAULT_QUEUE_BATCHES = 4
+DEFAULT_COMMIT_ROWS = 1_000_000
+
+# Stored for customers and products whose (NOT NULL) name is missing
+UNKNOWN_NAME = "Unknown"
+
+# Connection settings applied before a load.
+# "safe" is SQLite's durable default; "fast" trades crash durability of
+# the in-flight load (rerun it) for much faster bulk inserts.
+LOAD_PROFILES: dict[str, dict[str, str | int | bool]] = {
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2_000,  # negative = KiB, i.e. ~2 MB (SQLite default)
+        "temp_store": "DEFAULT",
+        "mmap_size": 0,
+        "defer_indexes": False,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -262_144,  # ~256 MB page cache
+        "temp_store": "MEMORY",
+        "mmap_size": 1 << 30,  # 1 GB
+        "defer_indexes": True,
+    },
+}
+
+DEFAULT_LOAD_PROFILE = "safe"
+
+# Secondary indexes, dropped before a deferred-index load and rebuilt after
+# The sale indexes cover the columns used by time-range and region/category
+# rollups, so those queries are answered from the index without touching
+# the table. customer/product indexes carry the rowid (the primary key).
+SECONDARY_INDEXES: dict[str, str] = {
+    "idx_sale_date_key": (
+        "CREATE INDEX IF NOT EXISTS idx_sale_date_key ON sale("
+        "sale_date_key, customer_id, product_id, payment_type, sale_amount_usd)"
+    ),
+    "idx_sale_customer_id": (
+        "CREATE INDEX IF NOT EXISTS idx_sale_customer_id ON sale("
+        "customer_id, sale_date_key, product_id, payment_type, sale_amount_usd)"
+    ),
+    "idx_sale_product_id": (
+        "CREATE INDEX IF NOT EXISTS idx_sale_product_id ON sale("
+        "product_id, sale_date_key, customer_id, payment_type, sale_amount_usd)"
+    ),
+    "idx_customer_region": "CREATE INDEX IF NOT EXISTS idx_customer_region ON customer(region)",
+    "idx_product_category": "CREATE INDEX IF NOT EXISTS idx_product_category ON product(category)",
+}
+
 
 # ---------------------------------------------------
 # SCHEMA CREATION
@@ -75,27 +170,179 @@ def create_tables(cursor: sqlite3.Cursor) -> None:
             sale_amount_usd REAL,
             sale_date TEXT,
             payment_type TEXT,
+            sale_date_key INTEGER,
+            customer_key INTEGER,
+            product_key INTEGER,
             FOREIGN KEY (customer_id) REFERENCES customer(customer_id),
-            FOREIGN KEY (product_id) REFERENCES product(product_id)
+            FOREIGN KEY (product_id) REFERENCES product(product_id),
+            FOREIGN KEY (sale_date_key) REFERENCES date_dim(date_key),
+            FOREIGN KEY (customer_key) REFERENCES customer_history(customer_key),
+            FOREIGN KEY (product_key) REFERENCES product_history(product_key)
         );
         """
     )
+    # Warehouses created before these columns existed get them added
+    _ensure_column(cursor, "sale", "sale_date_key", "INTEGER")
+    _ensure_column(cursor, "sale", "customer_key", "INTEGER")
+    _ensure_column(cursor, "sale", "product_key", "INTEGER")
+
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS date_dim (
+            date_key INTEGER PRIMARY KEY,
+            full_date TEXT NOT NULL,
+            year INTEGER,
+            quarter INTEGER,
+            month INTEGER,
+            month_name TEXT,
+            week INTEGER,
+            day INTEGER,
+            day_of_week INTEGER,
+            day_name TEXT
+        );
+        """
+    )
+
+    # Bookkeeping for incremental loads: one row per loaded table
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS etl_load_state (
+            table_name TEXT PRIMARY KEY,
+            high_water_mark INTEGER,
+            source_checksum TEXT,
+            row_count INTEGER,
+            loaded_at TEXT
+        );
+        """
+    )
+
+    # Versions of each customer and product row (see dimension_history)
+    create_history_tables(cursor)
+
+    # Sales whose customer or product key did not resolve (see key_resolution)
+    create_quarantine_table(cursor)
+
+
+def _ensure_column(cursor: sqlite3.Cursor, table: str, column: str, column_type: str) -> None:
+    columns = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
 
 
 # ---------------------------------------------------
-# INSERT FUNCTIONS
+# DATE DIMENSION
 # ---------------------------------------------------
 
 
-def insert_customers(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+def build_date_dimension(first_key: int, last_key: int) -> pd.DataFrame:
+    """Build one date_dim row per calendar day between two YYYYMMDD keys."""
+    days = pd.date_range(
+        pd.to_datetime(str(first_key), format="%Y%m%d"),
+        pd.to_datetime(str(last_key), format="%Y%m%d"),
+        freq="D",
+    )
+    return pd.DataFrame(
+        {
+            "date_key": days.year * 10_000 + days.month * 100 + days.day,
+            "full_date": days.strftime("%Y-%m-%d"),
+            "year": days.year,
+            "quarter": days.quarter,
+            "month": days.month,
+            "month_name": days.month_name(),
+            "week": days.isocalendar().week.to_numpy(),
+            "day": days.day,
+            "day_of_week": days.dayofweek + 1,  # ISO: Monday = 1
+            "day_name": days.day_name(),
+        }
+    )
+
+
+def load_date_dimension(cursor: sqlite3.Cursor) -> int:
+    """Add any missing date_dim rows for the range of dates in sale.
+
+    Returns:
+        int: Number of date_dim rows added.
     """
-    Insert cleaned customer rows into customer dimension table.
+    first_key, last_key = cursor.execute(
+        "SELECT MIN(sale_date_key), MAX(sale_date_key) FROM sale"
+    ).fetchone()
+    if first_key is None:
+        return 0
+
+    dates = build_date_dimension(first_key, last_key)
+    before = cursor.connection.total_changes
+    cursor.executemany(
+        f"INSERT INTO date_dim ({', '.join(dates.columns)}) "  # noqa: S608
+        f"VALUES ({', '.join('?' for _ in dates.columns)}) "
+        "ON CONFLICT(date_key) DO NOTHING",
+        dates.itertuples(index=False, name=None),
+    )
+    added = cursor.connection.total_changes - before
+    logger.info(f"date_dim: {added} days added ({first_key} to {last_key})")
+    return added
+
+
+# ---------------------------------------------------
+# CONNECTION TUNING
+# ---------------------------------------------------
+
+
+def apply_load_profile(
+    conn: sqlite3.Connection,
+    profile: str = DEFAULT_LOAD_PROFILE,
+    overrides: dict[str, str | int | bool] | None = None,
+) -> dict[str, str | int | bool]:
+    """Apply a named LOAD_PROFILES entry (plus overrides) to a connection.
+
+    Must run before the load starts: journal_mode cannot change inside a
+    transaction.
+
+    Args:
+        conn: Warehouse connection.
+        profile: "fast" or "safe".
+        overrides: Individual settings to replace, e.g. {"synchronous": "NORMAL"}.
+
+    Returns:
+        dict: The settings that were applied.
     """
+    if profile not in LOAD_PROFILES:
+        raise ValueError(f"Unknown load profile '{profile}'. Choose from {sorted(LOAD_PROFILES)}.")
+
+    settings = {**LOAD_PROFILES[profile], **(overrides or {})}
+    for pragma in ("journal_mode", "synchronous", "cache_size", "temp_store", "mmap_size"):
+        conn.execute(f"PRAGMA {pragma} = {settings[pragma]}")
+
+    logger.info(f"Load profile '{profile}': {settings}")
+    return settings
+
+
+def drop_secondary_indexes(cursor: sqlite3.Cursor) -> None:
+    """Drop secondary indexes so inserts do not maintain them row by row."""
+    for name in SECONDARY_INDEXES:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
 
-    # Remove duplicate customer IDs
-    if "CustomerID" in df.columns:
-        df = df.drop_duplicates(subset=["CustomerID"])
 
+def create_secondary_indexes(cursor: sqlite3.Cursor) -> None:
+    """Create any missing secondary indexes."""
+    for ddl in SECONDARY_INDEXES.values():
+        cursor.execute(ddl)
+
+
+def finish_load(cursor: sqlite3.Cursor) -> None:
+    """Build deferred indexes and refresh planner statistics after a load."""
+    started = time.perf_counter()
+    create_secondary_indexes(cursor)
+    cursor.execute("ANALYZE")
+    logger.info(f"Indexes and ANALYZE finished in {time.perf_counter() - started:.3f}s")
+
+
+# ---------------------------------------------------
+# PREPARE FUNCTIONS (shared by bulk and per-row loads)
+# ---------------------------------------------------
+
+
+def prepare_customers(df: pd.DataFrame) -> pd.DataFrame:
+    """Dedupe, rename and coerce customer rows to the DW schema."""
     # Rename columns from CSV to DW schema
     df = df.rename(
         columns={
@@ -112,43 +359,23 @@ def insert_customers(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
     df["customer_id"] = pd.to_numeric(df["customer_id"], errors="coerce")
     df = df[df["customer_id"].notna()]
 
-    for _, row in df.iterrows():
-        cursor.execute(
-            """
-            INSERT INTO customer (
-                customer_id,
-                name,
-                region,
-                join_date,
-                open_invoices_num,
-                retention_category
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                int(row["customer_id"]),
-                row.get("name"),
-                row.get("region"),
-                str(row.get("join_date")),
-                # Do not cast invoices to int - keep as text to avoid 'Loyal' crashes
-                None
-                if pd.isna(row.get("open_invoices_num"))
-                else str(row.get("open_invoices_num")),
-                row.get("retention_category"),
-            ),
-        )
-
-    logger.info("Customers inserted successfully.")
+    # One row per ID ("7" and "7.0" are the same ID). A later line in the
+    # extract is the later state of the customer, so it wins.
+    df = df.drop_duplicates(subset=["customer_id"], keep="last")
 
+    # name is NOT NULL; a blank name (written as "N/A" by data_prep, which
+    # pandas reads back as missing) must not reject the whole load
+    if "name" in df.columns:
+        df = df.assign(name=df["name"].fillna(UNKNOWN_NAME))
 
-def insert_products(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
-    """
-    Insert cleaned product rows into product dimension table.
-    """
+    # Store join dates as ISO text (NULL when unparseable)
+    if "join_date" in df.columns:
+        df = df.assign(join_date=DateParser().iso(df["join_date"]))
+    return df
 
-    if "ProductID" in df.columns:
-        df = df.drop_duplicates(subset=["ProductID"])
 
+def prepare_products(df: pd.DataFrame) -> pd.DataFrame:
+    """Dedupe, rename and coerce product rows to the DW schema."""
     df = df.rename(
         columns={
             "ProductID": "product_id",
@@ -166,38 +393,23 @@ def insert_products(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
     df["restock_days"] = pd.to_numeric(df["restock_days"], errors="coerce")
 
     df = df[df["product_id"].notna()]
+    # One row per ID; the last line is the latest state, as for customers
+    df = df.drop_duplicates(subset=["product_id"], keep="last")
+    if "product_name" in df.columns:
+        df = df.assign(product_name=df["product_name"].fillna(UNKNOWN_NAME))
+    return df
 
-    for _, row in df.iterrows():
-        cursor.execute(
-            """
-            INSERT INTO product (
-                product_id,
-                product_name,
-                category,
-                unit_price_usd,
-                restock_days,
-                supplier
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (
-                int(row["product_id"]),
-                row.get("product_name"),
-                row.get("category"),
-                None if pd.isna(row.get("unit_price_usd")) else float(row.get("unit_price_usd")),
-                None if pd.isna(row.get("restock_days")) else int(row.get("restock_days")),
-                row.get("supplier"),
-            ),
-        )
-
-    logger.info("Products inserted successfully.")
 
+def prepare_sales(
+    df: pd.DataFrame, date_parser: DateParser | None = None, keep_missing_keys: bool = False
+) -> pd.DataFrame:
+    """Rename, dedupe and coerce sale rows to the DW schema.
 
-def insert_sales(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    Pass one DateParser for all chunks of a file so its date format is
+    detected once. Rows with a missing customer_id or product_id are
+    dropped unless ``keep_missing_keys`` is set, which leaves them for a
+    KeyResolver to quarantine or map to the Unknown member.
     """
-    Insert cleaned sales rows into sale fact table.
-    """
-
     df = df.rename(
         columns={
             "TransactionID": "sale_id",
@@ -218,69 +430,1042 @@ def insert_sales(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
     df["product_id"] = pd.to_numeric(df["product_id"], errors="coerce")
     df["sale_amount_usd"] = pd.to_numeric(df["sale_amount_usd"], errors="coerce")
 
-    df = df[
-        df["sale_id"].notna()
-        & df["customer_id"].notna()
-        & df["product_id"].notna()
-        & df["sale_amount_usd"].notna()
+    valid = df["sale_id"].notna() & df["sale_amount_usd"].notna()
+    if not keep_missing_keys:
+        valid &= df["customer_id"].notna() & df["product_id"].notna()
+    df = df[valid]
+
+    # ISO sale date plus the integer key joining the fact to date_dim
+    sale_date, sale_date_key = (date_parser or DateParser()).iso_and_keys(_column(df, "sale_date"))
+    return df.assign(sale_date=sale_date, sale_date_key=sale_date_key)
+
+
+def resolve_sales(
+    df: pd.DataFrame,
+    cursor: sqlite3.Cursor,
+    resolver: KeyResolver | None,
+    date_parser: DateParser | None = None,
+) -> pd.DataFrame:
+    """Prepare sale rows and, with a resolver, check their keys.
+
+    Orphans are written to sale_quarantine (or mapped to the Unknown
+    member) on ``cursor``; the rows to load are returned. Without a
+    resolver this is prepare_sales().
+    """
+    sales = prepare_sales(df, date_parser, keep_missing_keys=resolver is not None)
+    if resolver is None:
+        return sales
+    with stage("dw.resolve.sale", rows=len(sales)):
+        return resolver.apply(sales, cursor)
+
+
+# ---------------------------------------------------
+# COLUMN CONVERTERS
+# Column-wise equivalents of the per-row casts below:
+# int(x), float(x), str(x) and "None if pd.isna(x) else x".
+# ---------------------------------------------------
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """Return a column, or an all-missing column like row.get() would."""
+    if name in df.columns:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def _as_int(series: pd.Series) -> list:
+    return series.astype("int64").tolist()
+
+
+def _as_float(series: pd.Series) -> list:
+    return series.astype("float64").tolist()
+
+
+def _as_nullable(series: pd.Series) -> list:
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def _as_nullable_text(series: pd.Series) -> list:
+    return series.astype(str).astype(object).where(series.notna(), None).tolist()
+
+
+def _as_nullable_int(series: pd.Series) -> list:
+    return series.astype("Int64").astype(object).where(series.notna(), None).tolist()
+
+
+def _as_nullable_float(series: pd.Series) -> list:
+    return series.astype("float64").astype(object).where(series.notna(), None).tolist()
+
+
+def customer_records(df: pd.DataFrame) -> list[tuple]:
+    """Convert prepared customer rows to insert-ready tuples, column by column."""
+    return list(
+        zip(
+            _as_int(df["customer_id"]),
+            _as_nullable(_column(df, "name")),
+            _as_nullable(_column(df, "region")),
+            _as_nullable(_column(df, "join_date")),
+            # Do not cast invoices to int - keep as text to avoid 'Loyal' crashes
+            _as_nullable_text(_column(df, "open_invoices_num")),
+            _as_nullable(_column(df, "retention_category")),
+            strict=True,
+        )
+    )
+
+
+def product_records(df: pd.DataFrame) -> list[tuple]:
+    """Convert prepared product rows to insert-ready tuples, column by column."""
+    return list(
+        zip(
+            _as_int(df["product_id"]),
+            _as_nullable(_column(df, "product_name")),
+            _as_nullable(_column(df, "category")),
+            _as_nullable_float(df["unit_price_usd"]),
+            _as_nullable_int(df["restock_days"]),
+            _as_nullable(_column(df, "supplier")),
+            strict=True,
+        )
+    )
+
+
+def sale_columns(df: pd.DataFrame) -> list[list]:
+    """Convert prepared sale rows to insert-ready columns, in SALE_INSERT_SQL order."""
+    return [
+        _as_int(df["sale_id"]),
+        _as_int(df["customer_id"]),
+        _as_int(df["product_id"]),
+        _as_float(df["sale_amount_usd"]),
+        _as_nullable(_column(df, "sale_date")),
+        _as_nullable(_column(df, "payment_type")),
+        _as_nullable_int(df["sale_date_key"]),
+        _as_nullable_int(_column(df, "customer_key")),
+        _as_nullable_int(_column(df, "product_key")),
     ]
 
+
+def sale_records(df: pd.DataFrame) -> list[tuple]:
+    """Convert prepared sale rows to insert-ready tuples, column by column."""
+    return list(zip(*sale_columns(df), strict=True))
+
+
+# ---------------------------------------------------
+# BULK INSERT FUNCTIONS
+# ---------------------------------------------------
+
+CUSTOMER_INSERT_SQL = """
+    INSERT INTO customer (
+        customer_id,
+        name,
+        region,
+        join_date,
+        open_invoices_num,
+        retention_category
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+PRODUCT_INSERT_SQL = """
+    INSERT INTO product (
+        product_id,
+        product_name,
+        category,
+        unit_price_usd,
+        restock_days,
+        supplier
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SALE_INSERT_SQL = """
+    INSERT INTO sale (
+        sale_id,
+        customer_id,
+        product_id,
+        sale_amount_usd,
+        sale_date,
+        payment_type,
+        sale_date_key,
+        customer_key,
+        product_key
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Streaming loads let the sale primary key dedupe across chunk boundaries:
+# the first row seen for a sale_id wins, exactly like drop_duplicates().
+SALE_INSERT_FIRST_WINS_SQL = SALE_INSERT_SQL + "    ON CONFLICT(sale_id) DO NOTHING\n"
+
+
+def _chunks(records: Sequence[tuple], chunk_size: int) -> Iterable[Sequence[tuple]]:
+    for start in range(0, len(records), chunk_size):
+        yield records[start : start + chunk_size]
+
+
+def executemany_chunked(
+    cursor: sqlite3.Cursor,
+    sql: str,
+    records: Sequence[tuple],
+    table: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    read_chunk: int | None = None,
+) -> int:
+    """Insert records with one executemany() per chunk and log rows/sec.
+
+    Args:
+        cursor: Open cursor on the warehouse connection.
+        sql: Parameterized INSERT statement.
+        records: Insert-ready tuples.
+        table: Table name, used only for logging (and as the throttle key).
+        chunk_size: Maximum rows per executemany() call.
+        read_chunk: Number of the streamed input chunk, logged if given.
+
+    Returns:
+        int: Number of rows handed to SQLite.
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+
+    started = time.perf_counter()
+    for chunk in _chunks(records, chunk_size):
+        cursor.executemany(sql, chunk)
+    elapsed = time.perf_counter() - started
+
+    rate = len(records) / elapsed if elapsed > 0 else float("inf")
+    where, args = "{}", (table,)
+    if read_chunk is not None:
+        where, args = "{} chunk {}", (table, read_chunk)
+    # Streaming loads call this once per chunk: at most one line per table per second
+    throttled(
+        "INFO",
+        where + ": {} rows in {:.3f}s ({:,.0f} rows/sec)",
+        *args,
+        len(records),
+        elapsed,
+        rate,
+        per_second=1,
+        key=table,
+    )
+    return len(records)
+
+
+def insert_customers(
+    df: pd.DataFrame,
+    cursor: sqlite3.Cursor,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    track_history: bool = False,
+) -> None:
+    """
+    Insert cleaned customer rows into customer dimension table.
+
+    With ``track_history`` the rows are also versioned in customer_history.
+    """
+    with stage("dw.transform.customer", rows=len(df)):
+        rows = prepare_customers(df)
+        records = customer_records(rows)
+    with stage("dw.insert.customer", rows=len(records)):
+        executemany_chunked(cursor, CUSTOMER_INSERT_SQL, records, "customer", chunk_size)
+    if track_history:
+        with stage("dw.history.customer", rows=len(rows)):
+            update_history(cursor, "customer", rows)
+    logger.info("Customers inserted successfully.")
+
+
+def insert_products(
+    df: pd.DataFrame,
+    cursor: sqlite3.Cursor,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    track_history: bool = False,
+) -> None:
+    """
+    Insert cleaned product rows into product dimension table.
+
+    With ``track_history`` the rows are also versioned in product_history.
+    """
+    with stage("dw.transform.product", rows=len(df)):
+        rows = prepare_products(df)
+        records = product_records(rows)
+    with stage("dw.insert.product", rows=len(records)):
+        executemany_chunked(cursor, PRODUCT_INSERT_SQL, records, "product", chunk_size)
+    if track_history:
+        with stage("dw.history.product", rows=len(rows)):
+            update_history(cursor, "product", rows)
+    logger.info("Products inserted successfully.")
+
+
+def insert_sales(
+    df: pd.DataFrame,
+    cursor: sqlite3.Cursor,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolver: KeyResolver | None = None,
+) -> None:
+    """
+    Insert cleaned sales rows into sale fact table.
+
+    With a resolver, rows whose keys are missing or absent from the
+    dimensions are quarantined or mapped to the Unknown member.
+    """
+    with stage("dw.transform.sale", rows=len(df)):
+        records = sale_records(resolve_sales(df, cursor, resolver))
+    with stage("dw.insert.sale", rows=len(records)):
+        executemany_chunked(cursor, SALE_INSERT_SQL, records, "sale", chunk_size)
+    logger.info("Sales inserted successfully.")
+
+
+# ---------------------------------------------------
+# PER-ROW INSERT FUNCTIONS
+# Original iterrows() path, kept as the benchmark baseline.
+# ---------------------------------------------------
+
+
+def insert_customers_rowwise(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    """
+    Insert customer rows one cursor.execute() at a time.
+    """
+    df = prepare_customers(df)
+
     for _, row in df.iterrows():
         cursor.execute(
-            """
-            INSERT INTO sale (
-                sale_id,
-                customer_id,
-                product_id,
-                sale_amount_usd,
-                sale_date,
-                payment_type
-            )
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
+            CUSTOMER_INSERT_SQL,
+            (
+                int(row["customer_id"]),
+                row.get("name"),
+                row.get("region"),
+                None if pd.isna(row.get("join_date")) else str(row.get("join_date")),
+                # Do not cast invoices to int - keep as text to avoid 'Loyal' crashes
+                None
+                if pd.isna(row.get("open_invoices_num"))
+                else str(row.get("open_invoices_num")),
+                row.get("retention_category"),
+            ),
+        )
+
+    logger.info("Customers inserted successfully.")
+
+
+def insert_products_rowwise(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    """
+    Insert product rows one cursor.execute() at a time.
+    """
+    df = prepare_products(df)
+
+    for _, row in df.iterrows():
+        cursor.execute(
+            PRODUCT_INSERT_SQL,
+            (
+                int(row["product_id"]),
+                row.get("product_name"),
+                row.get("category"),
+                None if pd.isna(row.get("unit_price_usd")) else float(row.get("unit_price_usd")),
+                None if pd.isna(row.get("restock_days")) else int(row.get("restock_days")),
+                row.get("supplier"),
+            ),
+        )
+
+    logger.info("Products inserted successfully.")
+
+
+def insert_sales_rowwise(df: pd.DataFrame, cursor: sqlite3.Cursor) -> None:
+    """
+    Insert sale rows one cursor.execute() at a time.
+    """
+    df = prepare_sales(df)
+
+    for _, row in df.iterrows():
+        cursor.execute(
+            SALE_INSERT_SQL,
             (
                 int(row["sale_id"]),
                 int(row["customer_id"]),
                 int(row["product_id"]),
                 float(row["sale_amount_usd"]),
-                str(row.get("sale_date")),
+                None if pd.isna(row.get("sale_date")) else str(row.get("sale_date")),
                 row.get("payment_type"),
+                None if pd.isna(row["sale_date_key"]) else int(row["sale_date_key"]),
+                None if pd.isna(row.get("customer_key")) else int(row.get("customer_key")),
+                None if pd.isna(row.get("product_key")) else int(row.get("product_key")),
             ),
         )
 
     logger.info("Sales inserted successfully.")
 
 
+# ---------------------------------------------------
+# STREAMING LOAD
+# ---------------------------------------------------
+
+
+def load_sales_streaming(
+    csv_path: Path,
+    cursor: sqlite3.Cursor,
+    read_chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolver: KeyResolver | None = None,
+) -> tuple[int, int]:
+    """Stream a cleaned sales CSV into the sale table one chunk at a time.
+
+    Each chunk goes through prepare_sales() and is written before the next
+    chunk is read, so memory is bounded by ``read_chunk_rows`` rather than
+    by the file size. Duplicates inside a chunk are dropped by
+    prepare_sales(); duplicates across chunks are dropped by the sale
+    primary key (ON CONFLICT DO NOTHING), so no in-memory set of seen IDs
+    is kept. Note that this also skips sale_ids already in the table.
+
+    Args:
+        csv_path: Path to the cleaned sales CSV.
+        cursor: Open cursor on the warehouse connection.
+        read_chunk_rows: CSV rows parsed per chunk.
+        chunk_size: Rows per executemany() call.
+        resolver: Check each chunk's keys against the dimensions.
+
+    Returns:
+        tuple[int, int]: Rows inserted and duplicate rows skipped.
+    """
+    if read_chunk_rows <= 0:
+        raise ValueError(f"read_chunk_rows must be positive, got {read_chunk_rows}")
+
+    conn = cursor.connection
+    inserted = 0
+    skipped = 0
+    started = time.perf_counter()
+    date_parser = DateParser()
+
+    for chunk_number, chunk in enumerate(read_chunks(csv_path, read_chunk_rows)):
+        with stage("dw.transform.sale", rows=len(chunk), chunk=chunk_number):
+            records = sale_records(resolve_sales(chunk, cursor, resolver, date_parser))
+        before = conn.total_changes
+        with stage("dw.insert.sale", rows=len(records), chunk=chunk_number):
+            executemany_chunked(
+                cursor, SALE_INSERT_FIRST_WINS_SQL, records, "sale", chunk_size, chunk_number
+            )
+        written = conn.total_changes - before
+        inserted += written
+        skipped += len(records) - written
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"sale (streamed): {inserted} rows inserted, {skipped} duplicates skipped in {elapsed:.3f}s"
+    )
+    logger.info("Sales inserted successfully.")
+    return inserted, skipped
+
+
+# ---------------------------------------------------
+# PARALLEL LOAD
+# Worker processes parse and transform shards of the sales file into
+# insert-ready columns; one writer thread owns the SQLite connection and
+# drains them from a bounded queue in large transactions.
+# ---------------------------------------------------
+
+
+# Sale columns from sale_columns(), plus the orphan rows to quarantine (if any)
+SaleBatch = tuple[list[list], pd.DataFrame | None]
+
+
+# Key resolver of the parallel load this worker process serves (see _init_shard_worker)
+_shard_resolver: KeyResolver | None = None
+
+
+def _init_shard_worker(resolver: KeyResolver | None) -> None:
+    """Keep the load's resolver in the worker, so its lookup arrays are sent once."""
+    global _shard_resolver
+    _shard_resolver = resolver
+
+
+def transform_sale_shard(path: str, start: int, end: int) -> tuple[int, SaleBatch, Counter | None]:
+    """Read one shard of the sales file; return its row count, batch and key counts.
+
+    Runs in a worker process. The columns are plain lists, which pickle
+    back to the parent cheaply. With a resolver set by _init_shard_worker()
+    the keys are checked here too; its orphan counts come back for the
+    parent to record, and the orphan rows travel with the batch for the
+    writer to quarantine.
+    """
+    resolver = _shard_resolver
+    df = read_shard(Path(path), start, end)
+    sales = prepare_sales(df, keep_missing_keys=resolver is not None)
+    if resolver is None:
+        return len(df), (sale_columns(sales), None), None
+    load, orphans, counts = resolver.check(sales)
+    return len(df), (sale_columns(load), orphans), counts
+
+
+class SaleWriter(threading.Thread):
+    """Insert sale column batches taken from a queue, on one connection.
+
+    Each batch is a SaleBatch; None ends the load. A commit follows whenever
+    ``commit_rows`` rows have gone in since the last one; the remainder is
+    left for the caller to commit.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, batches: queue.Queue, commit_rows: int):
+        """Prepare the writer; the connection must allow use from this thread."""
+        super().__init__(name="sale-writer", daemon=True)
+        self.conn = conn
+        self.batches = batches
+        self.commit_rows = commit_rows
+        self.received = 0
+        self.inserted = 0
+        self.busy_seconds = 0.0
+        self.error: BaseException | None = None
+
+    def run(self) -> None:
+        """Drain the queue until None arrives or an insert fails."""
+        cursor = self.conn.cursor()
+        uncommitted = 0
+        try:
+            while (batch := self.batches.get()) is not None:
+                started = time.perf_counter()
+                columns, orphans = batch
+                rows = len(columns[0])
+                before = self.conn.total_changes
+                with stage("dw.insert.sale", rows=rows):
+                    cursor.executemany(SALE_INSERT_FIRST_WINS_SQL, zip(*columns, strict=True))
+                self.inserted += self.conn.total_changes - before
+                if orphans is not None:
+                    quarantine(cursor, orphans)
+                self.received += rows
+                uncommitted += rows
+                if uncommitted >= self.commit_rows:
+                    self.conn.commit()
+                    uncommitted = 0
+                self.busy_seconds += time.perf_counter() - started
+        except BaseException as error:  # noqa: BLE001 - re-raised by the producer
+            self.error = error
+
+
+def _put(batches: queue.Queue, item: SaleBatch | None, writer: SaleWriter) -> None:
+    """Block until the writer has room for ``item``; raise if the writer died."""
+    while True:
+        if writer.error is not None:
+            raise writer.error
+        if not writer.is_alive():
+            raise RuntimeError("sale writer stopped before the load finished")
+        try:
+            batches.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+
+def _first_done(running: deque[Future]) -> Future:
+    """Remove and return the earliest-submitted shard that has finished."""
+    done, _ = wait(running, return_when=FIRST_COMPLETED)
+    future = next(future for future in running if future in done)
+    running.remove(future)
+    return future
+
+
+def load_sales_parallel(
+    csv_path: Path,
+    cursor: sqlite3.Cursor,
+    workers: int | None = None,
+    shard_rows: int = DEFAULT_READ_CHUNK_ROWS,
+    queue_batches: int = DEFAULT_QUEUE_BATCHES,
+    ordered: bool = True,
+    commit_rows: int = DEFAULT_COMMIT_ROWS,
+    resolver: KeyResolver | None = None,
+) -> tuple[int, int]:
+    """Load a cleaned sales file with parallel transforms and a single writer.
+
+    The file (CSV or binary table) is split into shards of about
+    ``shard_rows`` rows. Up to ``workers`` shards are read and passed
+    through prepare_sales() at once in worker processes. A writer thread
+    inserts the finished shards from a queue of ``queue_batches`` batches.
+    When the queue is full no new shard is started, so memory stays at
+    about ``workers + queue_batches`` shards however large the file is.
+
+    Duplicates across shards are dropped by the sale primary key, as in
+    load_sales_streaming(). With ``ordered`` the shards are inserted in
+    file order, so the first occurrence of a sale_id wins and the result
+    equals a streaming load. Otherwise shards are inserted as they finish,
+    which keeps the writer busier when shard costs vary.
+
+    The writer commits every ``commit_rows`` rows. A failed load may leave
+    the rows of earlier commits in the table.
+
+    Args:
+        csv_path: Path to the cleaned sales CSV (a fresher binary copy is preferred).
+        cursor: Cursor on a connection opened with ``check_same_thread=False``;
+            the caller must not use it until this returns.
+        workers: Worker processes (default: CPU count).
+        shard_rows: Rows per shard.
+        queue_batches: Finished shards that may wait for the writer.
+        ordered: Insert shards in file order.
+        commit_rows: Rows per transaction.
+        resolver: Check each shard's keys in its worker; the writer
+            quarantines the orphans.
+
+    Returns:
+        tuple[int, int]: Rows inserted and duplicate rows skipped.
+    """
+    if queue_batches <= 0 or commit_rows <= 0:
+        raise ValueError("queue_batches and commit_rows must be positive")
+    path, bounds = shard_bounds(csv_path, shard_rows)
+    workers = workers or os.cpu_count() or 1
+    batches: queue.Queue = queue.Queue(maxsize=queue_batches)
+    writer = SaleWriter(cursor.connection, batches, commit_rows)
+    rows_read = 0
+    waited = 0.0
+    started = time.perf_counter()
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_shard_worker, initargs=(resolver,)
+    ) as executor:
+        shards = iter(bounds)
+        running: deque[Future] = deque()
+
+        def submit_next() -> None:
+            shard = next(shards, None)
+            if shard is None:
+                return
+            start, end = shard
+            running.append(executor.submit(transform_sale_shard, str(path), start, end))
+
+        for _ in range(workers):
+            submit_next()
+        # Started after the first submit, so the workers fork before this thread exists
+        writer.start()
+        try:
+            while running:
+                future = running.popleft() if ordered else _first_done(running)
+                shard_rows_read, batch, key_counts = future.result()
+                submit_next()
+                rows_read += shard_rows_read
+                if key_counts is not None:
+                    resolver.record(key_counts)
+                put_started = time.perf_counter()
+                _put(batches, batch, writer)
+                waited += time.perf_counter() - put_started
+            _put(batches, None, writer)
+        finally:
+            if writer.is_alive():
+                # Stop the writer after what is already queued
+                batches.put(None)
+            writer.join()
+            for future in running:
+                future.cancel()
+    if writer.error is not None:
+        raise writer.error
+
+    elapsed = time.perf_counter() - started
+    skipped = writer.received - writer.inserted
+    logger.info(
+        f"sale (parallel, {workers} workers, {len(bounds)} shards): {writer.inserted} rows "
+        f"inserted, {skipped} duplicates skipped, {rows_read - writer.received} rows "
+        f"dropped or quarantined in {elapsed:.3f}s ({writer.inserted / elapsed:,.0f} "
+        f"rows/sec). Writer busy {writer.busy_seconds / elapsed:.0%}, shards waited "
+        f"{waited:.2f}s for queue space"
+    )
+    logger.info("Sales inserted successfully.")
+    return writer.inserted, skipped
+
+
+# ---------------------------------------------------
+# INCREMENTAL LOAD
+# Dimensions are skipped when their source file checksum is unchanged and
+# otherwise upserted; only rows whose values differ are rewritten.
+# The sale fact is append-only above a sale_id high-water mark: rows at or
+# below the mark are never revisited, so a nightly run costs the delta.
+# ---------------------------------------------------
+
+TABLE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "customer": (
+        "customer_id",
+        "name",
+        "region",
+        "join_date",
+        "open_invoices_num",
+        "retention_category",
+    ),
+    "product": (
+        "product_id",
+        "product_name",
+        "category",
+        "unit_price_usd",
+        "restock_days",
+        "supplier",
+    ),
+    "sale": (
+        "sale_id",
+        "customer_id",
+        "product_id",
+        "sale_amount_usd",
+        "sale_date",
+        "payment_type",
+        "sale_date_key",
+        "customer_key",
+        "product_key",
+    ),
+}
+
+
+def upsert_sql(table: str) -> str:
+    """Build an INSERT ... ON CONFLICT DO UPDATE that skips unchanged rows.
+
+    The first column in TABLE_COLUMNS is the conflict key. The WHERE clause
+    on the update means identical rows produce no change at all, so
+    connection.total_changes counts only real inserts and updates.
+    """
+    key, *values = TABLE_COLUMNS[table]
+    columns = ", ".join(TABLE_COLUMNS[table])
+    placeholders = ", ".join("?" for _ in TABLE_COLUMNS[table])
+    assignments = ", ".join(f"{col} = excluded.{col}" for col in values)
+    changed = " OR ".join(f"{table}.{col} IS NOT excluded.{col}" for col in values)
+    return (
+        f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) "  # noqa: S608
+        f"ON CONFLICT({key}) DO UPDATE SET {assignments} WHERE {changed}"
+    )
+
+
+def file_checksum(path: Path, block_size: int = 1 << 20) -> str:
+    """Return the SHA-256 hex digest of a file (or a binary table folder), read in blocks."""
+    path = Path(path)
+    files = sorted(file for file in path.rglob("*") if file.is_file()) if path.is_dir() else [path]
+    digest = hashlib.sha256()
+    for file in files:
+        if path.is_dir():
+            digest.update(file.relative_to(path).as_posix().encode())
+        with file.open("rb") as f:
+            while block := f.read(block_size):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def get_load_state(cursor: sqlite3.Cursor, table: str) -> dict | None:
+    """Return the stored load state for a table, or None if never loaded."""
+    row = cursor.execute(
+        "SELECT high_water_mark, source_checksum, row_count, loaded_at "
+        "FROM etl_load_state WHERE table_name = ?",
+        (table,),
+    ).fetchone()
+    if row is None:
+        return None
+    return dict(
+        zip(("high_water_mark", "source_checksum", "row_count", "loaded_at"), row, strict=True)
+    )
+
+
+def save_load_state(cursor: sqlite3.Cursor, table: str, checksum: str | None) -> None:
+    """Record the table's current high-water mark, row count and source checksum."""
+    key = TABLE_COLUMNS[table][0]
+    high_water_mark, row_count = cursor.execute(
+        f"SELECT MAX({key}), COUNT(*) FROM {table}"  # noqa: S608
+    ).fetchone()
+    cursor.execute(
+        """
+        INSERT INTO etl_load_state (
+            table_name, high_water_mark, source_checksum, row_count, loaded_at
+        )
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(table_name) DO UPDATE SET
+            high_water_mark = excluded.high_water_mark,
+            source_checksum = excluded.source_checksum,
+            row_count = excluded.row_count,
+            loaded_at = excluded.loaded_at
+        """,
+        (table, high_water_mark, checksum, row_count, datetime.now(UTC).isoformat()),
+    )
+
+
+def upsert_records(
+    cursor: sqlite3.Cursor,
+    table: str,
+    records: list[tuple],
+    existing_keys: np.ndarray,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, int]:
+    """Upsert records and return inserted/updated/skipped counts.
+
+    Args:
+        cursor: Open cursor on the warehouse connection.
+        table: Target table (a key of TABLE_COLUMNS).
+        records: Insert-ready tuples with the key first, unique by key.
+        existing_keys: Keys already present in the table.
+        chunk_size: Rows per executemany() call.
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted", "updated" and "skipped".
+    """
+    if not records:
+        return {"inserted": 0, "updated": 0, "skipped": 0}
+
+    keys = np.fromiter((record[0] for record in records), dtype=np.int64, count=len(records))
+    inserted = int((~np.isin(keys, existing_keys)).sum())
+
+    conn = cursor.connection
+    before = conn.total_changes
+    executemany_chunked(cursor, upsert_sql(table), records, table, chunk_size)
+    changed = conn.total_changes - before
+
+    return {
+        "inserted": inserted,
+        "updated": changed - inserted,
+        "skipped": len(records) - changed,
+    }
+
+
+def _existing_keys(cursor: sqlite3.Cursor, table: str) -> np.ndarray:
+    key = TABLE_COLUMNS[table][0]
+    rows = cursor.execute(f"SELECT {key} FROM {table}").fetchall()  # noqa: S608
+    return np.array([row[0] for row in rows], dtype=np.int64)
+
+
+def load_dimension_incremental(
+    csv_path: Path,
+    cursor: sqlite3.Cursor,
+    table: str,
+    prepare: Callable[[pd.DataFrame], pd.DataFrame],
+    to_records: Callable[[pd.DataFrame], list[tuple]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    track_history: bool = False,
+) -> dict[str, int]:
+    """Upsert a dimension table, or skip it if its source file is unchanged.
+
+    Args:
+        csv_path: Cleaned CSV for the dimension.
+        cursor: Open cursor on the warehouse connection.
+        table: "customer" or "product".
+        prepare: prepare_customers or prepare_products.
+        to_records: customer_records or product_records.
+        chunk_size: Rows per executemany() call.
+        track_history: Version the loaded rows in the table's history.
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted", "updated" and "skipped".
+    """
+    checksum = file_checksum(source_path(csv_path))
+    state = get_load_state(cursor, table)
+
+    if state is not None and state["source_checksum"] == checksum:
+        counts = {"inserted": 0, "updated": 0, "skipped": state["row_count"] or 0}
+        logger.info(f"{table}: source unchanged, skipping ({counts})")
+        return counts
+
+    rows = prepare(read_frame(csv_path))
+    counts = upsert_records(
+        cursor, table, to_records(rows), _existing_keys(cursor, table), chunk_size
+    )
+    if track_history:
+        update_history(cursor, table, rows)
+    save_load_state(cursor, table, checksum)
+    logger.info(f"{table}: incremental load {counts}")
+    return counts
+
+
+def load_sales_incremental(
+    csv_path: Path,
+    cursor: sqlite3.Cursor,
+    read_chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolver: KeyResolver | None = None,
+) -> dict[str, int]:
+    """Append sales above the stored sale_id high-water mark.
+
+    The file is streamed in chunks. Rows at or below the mark count as
+    skipped without touching SQLite; a repeat of a sale_id within the new
+    rows keeps the first occurrence, as in the full load.
+
+    Args:
+        csv_path: Path to the cleaned sales CSV.
+        cursor: Open cursor on the warehouse connection.
+        read_chunk_rows: CSV rows parsed per chunk.
+        chunk_size: Rows per executemany() call.
+        resolver: Check the new rows' keys against the dimensions.
+
+    Returns:
+        dict[str, int]: Counts keyed by "inserted", "updated" and "skipped".
+    """
+    checksum = file_checksum(source_path(csv_path))
+    state = get_load_state(cursor, "sale")
+
+    if state is not None and state["source_checksum"] == checksum:
+        counts = {"inserted": 0, "updated": 0, "skipped": state["row_count"] or 0}
+        logger.info(f"sale: source unchanged, skipping ({counts})")
+        return counts
+
+    high_water_mark = state["high_water_mark"] if state and state["high_water_mark"] else 0
+    conn = cursor.connection
+    counts = {"inserted": 0, "updated": 0, "skipped": 0}
+    date_parser = DateParser()
+
+    for chunk in read_chunks(csv_path, read_chunk_rows):
+        sales = prepare_sales(chunk, date_parser, keep_missing_keys=resolver is not None)
+        new = sales[sales["sale_id"] > high_water_mark]
+        counts["skipped"] += len(sales) - len(new)
+        if resolver is not None:
+            new = resolver.apply(new, cursor)
+
+        records = sale_records(new)
+        before = conn.total_changes
+        executemany_chunked(cursor, SALE_INSERT_FIRST_WINS_SQL, records, "sale", chunk_size)
+        written = conn.total_changes - before
+        counts["inserted"] += written
+        counts["skipped"] += len(records) - written
+
+    save_load_state(cursor, "sale", checksum)
+    logger.info(f"sale: incremental load above sale_id {high_water_mark} {counts}")
+    return counts
+
+
 # ---------------------------------------------------
 # MAIN ETL FUNCTION
 # ---------------------------------------------------
 
 
-def create_and_load_dw() -> None:
-    """Create DW schema and load cleaned data."""
+def resolve_dimensions(
+    cursor: sqlite3.Cursor, orphan_policy: str | None, track_history: bool = True
+) -> KeyResolver | None:
+    """Index the loaded dimension keys for the sale load.
+
+    Runs between the dimension and fact loads. Returns None (no key checks
+    and no surrogate keys on the sales) when ``orphan_policy`` is None.
+    """
+    if orphan_policy == "unknown":
+        ensure_unknown_members(cursor)
+        if track_history:
+            # Version the Unknown rows too, so remapped sales get surrogate keys
+            for table in DIMENSIONS:
+                update_history(cursor, table, read_dimension(cursor, table, [UNKNOWN_MEMBER_ID]))
+    if orphan_policy is None:
+        return None
+    return KeyResolver.from_cursor(cursor, orphan_policy)
+
+
+def create_and_load_dw(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    stream_sales: bool = False,
+    read_chunk_rows: int = DEFAULT_READ_CHUNK_ROWS,
+    incremental: bool = False,
+    load_profile: str = DEFAULT_LOAD_PROFILE,
+    profile_overrides: dict[str, str | int | bool] | None = None,
+    build_cubes: bool = True,
+    workers: int | None = None,
+    orphan_policy: str | None = DEFAULT_ORPHAN_POLICY,
+    track_history: bool = True,
+) -> dict[str, dict[str, int]] | None:
+    """Create DW schema and load cleaned data.
+
+    A full load expects empty tables. An incremental load upserts changed
+    dimension rows and appends sales above the stored high-water mark, so
+    it can be rerun against an existing warehouse.
+
+    Args:
+        chunk_size: Rows per executemany() call for each table.
+        stream_sales: Read the sales CSV in chunks instead of all at once.
+        read_chunk_rows: CSV rows per chunk when streaming or incremental.
+        incremental: Load only new or changed rows.
+        load_profile: Connection tuning from LOAD_PROFILES ("safe" or "fast").
+            Deferring indexes rebuilds them over the whole table, so small
+            incremental loads into a large warehouse may prefer "safe".
+        profile_overrides: Individual profile settings to replace.
+        build_cubes: Refresh the pre-aggregated OLAP cuboids after loading.
+            Incremental loads fold in only the new sales unless a customer
+            or product row changed.
+        workers: Load the sales file with load_sales_parallel() on this
+            many worker processes (full loads only; overrides stream_sales).
+        orphan_policy: What to do with sales whose customer or product key
+            is missing or not in its dimension: "quarantine" moves them to
+            sale_quarantine, "unknown" points them at the Unknown member
+            rows, None loads them unchecked (rows without keys are dropped).
+        track_history: Version customer and product changes in the SCD2
+            history tables. Sales get the current surrogate keys unless
+            orphan_policy is None.
+
+    Returns:
+        dict | None: Per-table inserted/updated/skipped counts for
+        incremental loads, otherwise None.
+    """
     logger.info("Connecting to DW...")
-    conn = sqlite3.connect(DW_PATH)
+    # A parallel load hands the connection to its writer thread
+    conn = sqlite3.connect(DW_PATH, check_same_thread=workers is None)
     cursor = conn.cursor()
+    counts = None
 
     try:
+        settings = apply_load_profile(conn, load_profile, profile_overrides)
+
         logger.info("Creating tables...")
         create_tables(cursor)
+        if settings["defer_indexes"]:
+            drop_secondary_indexes(cursor)
+        else:
+            create_secondary_indexes(cursor)
+
+        if incremental:
+            logger.info("Loading cleaned CSVs incrementally...")
+            counts = {
+                "customer": load_dimension_incremental(
+                    CUSTOMERS_CSV,
+                    cursor,
+                    "customer",
+                    prepare_customers,
+                    customer_records,
+                    chunk_size,
+                    track_history,
+                ),
+                "product": load_dimension_incremental(
+                    PRODUCTS_CSV,
+                    cursor,
+                    "product",
+                    prepare_products,
+                    product_records,
+                    chunk_size,
+                    track_history,
+                ),
+            }
+            resolver = resolve_dimensions(cursor, orphan_policy, track_history)
+            counts["sale"] = load_sales_incremental(
+                SALES_CSV, cursor, read_chunk_rows, chunk_size, resolver
+            )
+        else:
+            logger.info("Loading cleaned CSVs...")
 
-        logger.info("Loading cleaned CSVs...")
+            with stage("dw.read.customer") as timer:
+                customers_df = read_frame(CUSTOMERS_CSV)
+                timer.rows = len(customers_df)
+            with stage("dw.read.product") as timer:
+                products_df = read_frame(PRODUCTS_CSV)
+                timer.rows = len(products_df)
 
-        customers_df = pd.read_csv(CUSTOMERS_CSV)
-        products_df = pd.read_csv(PRODUCTS_CSV)
-        sales_df = pd.read_csv(SALES_CSV)
+            insert_customers(customers_df, cursor, chunk_size, track_history)
+            insert_products(products_df, cursor, chunk_size, track_history)
+            resolver = resolve_dimensions(cursor, orphan_policy, track_history)
 
-        insert_customers(customers_df, cursor)
-        insert_products(products_df, cursor)
-        insert_sales(sales_df, cursor)
+            if workers is not None:
+                load_sales_parallel(SALES_CSV, cursor, workers, read_chunk_rows, resolver=resolver)
+            elif stream_sales:
+                load_sales_streaming(SALES_CSV, cursor, read_chunk_rows, chunk_size, resolver)
+            else:
+                with stage("dw.read.sale") as timer:
+                    sales_df = read_frame(SALES_CSV)
+                    timer.rows = len(sales_df)
+                insert_sales(sales_df, cursor, chunk_size, resolver)
+
+            # Record where this load ended so later incremental runs start there
+            save_load_state(cursor, "customer", file_checksum(source_path(CUSTOMERS_CSV)))
+            save_load_state(cursor, "product", file_checksum(source_path(PRODUCTS_CSV)))
+            save_load_state(cursor, "sale", file_checksum(source_path(SALES_CSV)))
+
+        if resolver:
+            resolver.report()
+        load_date_dimension(cursor)
+        finish_load(cursor)
+
+        if build_cubes:
+            dimensions_changed = counts is None or any(
+                counts[table]["updated"] for table in ("customer", "product")
+            )
+            refresh_cubes(cursor, full=dimensions_changed)
 
         conn.commit()
         logger.info("DW load complete.")
+        return counts
 
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        # Roll back the partial load and surface the failure to the caller
+        conn.rollback()
+        logger.error(f"DW load failed, rolled back: {e}")
+        raise
 
     finally:
         conn.close()
@@ -288,4 +1473,7 @@ def create_and_load_dw() -> None:
 
 
 if __name__ == "__main__":
+    from analytics_project.dw.export_snapshot import export_warehouse_snapshot
+
     create_and_load_dw()
+    export_warehouse_snapshot()
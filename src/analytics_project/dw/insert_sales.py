@@ -2,6 +2,8 @@ import pandas as pd
 import sqlite3
 from loguru import logger
 
+from analytics_project.dw.key_resolution import KeyResolver
+
 
 def insert_sales(df, cursor):
     """
@@ -28,9 +30,8 @@ def insert_sales(df, cursor):
     df["product_id"] = pd.to_numeric(df["product_id"], errors="coerce")
     df["sale_amount_usd"] = pd.to_numeric(df["sale_amount_usd"], errors="coerce")
 
-    # Convert bad/missing IDs to None instead of crashing
-    df["customer_id"] = df["customer_id"].fillna(-1)
-    df["product_id"] = df["product_id"].fillna(-1)
+    # Point missing or unknown IDs at the Unknown customer/product rows
+    df = KeyResolver.from_cursor(cursor, policy="unknown").apply(df, cursor)
 
     for _, row in df.iterrows():
         cursor.execute(
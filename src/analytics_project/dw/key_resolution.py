@@ -0,0 +1,293 @@
+"""
+Key Resolution (P4)
+Checks that every sale's customer_id and product_id exist in the dimension
+tables before the sale is loaded, routes the orphans elsewhere, and looks
+up the surrogate keys the sale will carry.
+
+SQLite only enforces the sale table's FOREIGN KEY clauses with
+PRAGMA foreign_keys=ON, and then row by row. Here the dimension IDs and
+their current surrogate keys (see dimension_history) are read once into
+NumPy: a lookup table over the ID range when the IDs are dense enough,
+otherwise a sorted array for searchsorted(). Each batch of prepared sales
+is resolved with one vectorized lookup per key column, so the check can
+run on every batch of every load. Orphan rows either go to the
+sale_quarantine table with a reason ("quarantine"), or are pointed at the
+"Unknown" member row of the dimension they miss ("unknown").
+"""
+
+from collections import Counter
+from datetime import UTC, datetime
+import sqlite3
+
+from loguru import logger
+import numpy as np
+import pandas as pd
+
+from analytics_project.dw.dimension_history import DIMENSIONS, current_keys
+
+ORPHAN_POLICIES = ("quarantine", "unknown")
+DEFAULT_ORPHAN_POLICY = "quarantine"
+
+# Key of the "Unknown" customer and product rows used by the "unknown" policy
+UNKNOWN_MEMBER_ID = -1
+
+# Sale columns checked, with the dimension table holding their keys
+KEY_COLUMNS = {"customer_id": "customer", "product_id": "product"}
+
+# Sale column receiving the current surrogate key of each key column
+SURROGATE_KEYS = {dim.natural_key: dim.surrogate_key for dim in DIMENSIONS.values()}
+
+QUARANTINE_COLUMNS = (
+    "sale_id",
+    "customer_id",
+    "product_id",
+    "sale_amount_usd",
+    "sale_date",
+    "payment_type",
+    "sale_date_key",
+)
+
+# ID ranges up to this many slots get a lookup table (four bytes per slot)
+DENSE_KEY_SPAN = 1 << 22
+
+_NO_KEY = np.iinfo(np.int64).min
+_REASONS = {1: "{column} missing", 2: "{column} not in {table}"}
+
+
+# ---------------------------------------------------
+# SCHEMA
+# ---------------------------------------------------
+
+
+def create_quarantine_table(cursor: sqlite3.Cursor) -> None:
+    """Create the table holding sales whose keys did not resolve.
+
+    One row per sale_id: a sale quarantined again by a later load keeps its
+    first reason and time.
+    """
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS sale_quarantine (
+            sale_id INTEGER PRIMARY KEY,
+            customer_id INTEGER,
+            product_id INTEGER,
+            sale_amount_usd REAL,
+            sale_date TEXT,
+            payment_type TEXT,
+            sale_date_key INTEGER,
+            reason TEXT NOT NULL,
+            quarantined_at TEXT NOT NULL
+        );
+        """
+    )
+
+
+def ensure_unknown_members(cursor: sqlite3.Cursor) -> None:
+    """Add the "Unknown" customer and product rows if they are missing."""
+    cursor.execute(
+        "INSERT OR IGNORE INTO customer (customer_id, name) VALUES (?, 'Unknown')",
+        (UNKNOWN_MEMBER_ID,),
+    )
+    cursor.execute(
+        "INSERT OR IGNORE INTO product (product_id, product_name) VALUES (?, 'Unknown')",
+        (UNKNOWN_MEMBER_ID,),
+    )
+
+
+def quarantine(cursor: sqlite3.Cursor, orphans: pd.DataFrame) -> int:
+    """Insert orphan sales (with their "reason" column) into sale_quarantine."""
+    if orphans.empty:
+        return 0
+    now = datetime.now(UTC).isoformat(timespec="seconds")
+    columns = [*QUARANTINE_COLUMNS, "reason"]
+    values = orphans.reindex(columns=columns).astype(object)
+    values = values.where(values.notna(), None)
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO sale_quarantine ({', '.join(columns)}, quarantined_at) "  # noqa: S608
+        f"VALUES ({', '.join('?' * len(columns))}, ?)",
+        [(*row, now) for row in values.itertuples(index=False, name=None)],
+    )
+    return len(orphans)
+
+
+# ---------------------------------------------------
+# RESOLVER
+# ---------------------------------------------------
+
+
+class KeyResolver:
+    """Validate sale keys against the dimension keys and count the orphans.
+
+    check() is pure, so it can run in worker processes; record() adds its
+    counts here. apply() does both and writes the quarantine rows.
+    """
+
+    def __init__(
+        self,
+        customer_ids: np.ndarray,
+        product_ids: np.ndarray,
+        policy: str = DEFAULT_ORPHAN_POLICY,
+        surrogate_keys: dict[str, np.ndarray] | None = None,
+    ):
+        """Index the IDs of each key column, with their surrogate keys if given.
+
+        ``surrogate_keys`` maps a key column to the surrogate key of each of
+        its IDs, in the same order (0 where there is none).
+        """
+        if policy not in ORPHAN_POLICIES:
+            raise ValueError(f"Unknown orphan policy '{policy}'. Choose from {ORPHAN_POLICIES}.")
+        self.policy = policy
+        self.keys: dict[str, np.ndarray] = {}
+        self.surrogates: dict[str, np.ndarray] = {}
+        self.tables: dict[str, tuple[int, np.ndarray]] = {}
+        surrogate_keys = surrogate_keys or {}
+        for column, ids in (("customer_id", customer_ids), ("product_id", product_ids)):
+            ids = np.asarray(ids, dtype=np.int64)
+            surrogates = np.asarray(surrogate_keys.get(column, np.zeros(len(ids))), dtype=np.int64)
+            if policy == "unknown" and UNKNOWN_MEMBER_ID not in ids:
+                ids = np.append(ids, UNKNOWN_MEMBER_ID)
+                surrogates = np.append(surrogates, 0)
+            ids, first = np.unique(ids, return_index=True)
+            self.keys[column] = ids
+            self.surrogates[column] = surrogates[first]
+            # Source IDs are usually a compact range; a table lookup avoids
+            # the cache misses of a binary search per row
+            if len(ids) and ids[-1] - ids[0] < DENSE_KEY_SPAN:
+                table = np.full(ids[-1] - ids[0] + 1, -1, dtype=np.int32)
+                table[ids - ids[0]] = np.arange(len(ids), dtype=np.int32)
+                self.tables[column] = (int(ids[0]), table)
+        self.counts: Counter = Counter()
+
+    @classmethod
+    def from_cursor(cls, cursor: sqlite3.Cursor, policy: str = DEFAULT_ORPHAN_POLICY):
+        """Read the current customer and product IDs (including uncommitted rows).
+
+        Each ID's current surrogate key comes from the dimension history.
+        With the "unknown" policy the Unknown member rows are added first.
+        """
+        if policy == "unknown":
+            ensure_unknown_members(cursor)
+        ids, surrogates = {}, {}
+        for column, table in KEY_COLUMNS.items():
+            ids[column], surrogates[column] = current_keys(cursor, table)
+        return cls(ids["customer_id"], ids["product_id"], policy, surrogates)
+
+    def _positions(self, column: str, values: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+        """Return (key present, position in self.keys or -1) for each row."""
+        present = values.notna().to_numpy()
+        ids = pd.to_numeric(values, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+        ids = np.where(present & np.isfinite(ids), ids, _NO_KEY).astype(np.int64)
+        if column in self.tables:
+            first, table = self.tables[column]
+            # Out-of-range ids (and _NO_KEY) fall outside the table
+            offset = ids - first
+            inside = (offset >= 0) & (offset < len(table))
+            position = np.full(len(ids), -1, dtype=np.int64)
+            position[inside] = table[offset[inside]]
+            return present, position
+        keys = self.keys[column]
+        if not len(keys):
+            return present, np.full(len(ids), -1, dtype=np.int64)
+        position = np.minimum(np.searchsorted(keys, ids), len(keys) - 1)
+        return present, np.where(keys[position] == ids, position, -1)
+
+    def check(self, sales: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame, Counter]:
+        """Split prepared sales into rows to load and orphans to quarantine.
+
+        Returns:
+            tuple: Rows to load, orphan rows with a "reason" column (empty
+            under the "unknown" policy, which rewrites their keys instead),
+            and counts of checked rows, orphan rows and orphans per column.
+        """
+        counts: Counter = Counter(checked=len(sales))
+        orphan = np.zeros(len(sales), dtype=bool)
+        misses = {}
+        surrogates = {}
+        for column in KEY_COLUMNS:
+            present, position = self._positions(column, sales[column])
+            found = position >= 0
+            counts[f"orphan_{column}"] = int(len(found) - found.sum())
+            if counts[f"orphan_{column}"]:
+                misses[column] = (present, found)
+                orphan |= ~found
+                if self.policy == "unknown":
+                    position[~found] = np.searchsorted(self.keys[column], UNKNOWN_MEMBER_ID)
+            # An empty dimension has no surrogate to take; every key stays 0
+            known = self.surrogates[column]
+            keys = np.zeros(len(position), dtype=np.int64)
+            if len(known):
+                keys = np.where(position >= 0, known.take(np.clip(position, 0, None)), 0)
+            surrogates[SURROGATE_KEYS[column]] = pd.Series(
+                keys, index=sales.index, dtype="Int64"
+            ).where(keys > 0)
+        counts["orphan_rows"] = int(orphan.sum())
+        # The surrogate keys current now, resolved in memory instead of by join
+        sales = sales.assign(**surrogates)
+
+        no_orphans = sales.iloc[:0].assign(reason=pd.Series(dtype=object))
+        if not misses:
+            return sales, no_orphans, counts
+        if self.policy == "unknown":
+            remapped = {
+                column: sales[column].where(found, UNKNOWN_MEMBER_ID).astype("int64")
+                for column, (_, found) in misses.items()
+            }
+            return sales.assign(**remapped), no_orphans, counts
+
+        # Each orphan row gets a state per column (0 found, 1 missing, 2 not in
+        # the dimension); the few distinct state combinations are then spelled out
+        code = np.zeros(counts["orphan_rows"], dtype=np.int64)
+        for present, found in misses.values():
+            state = np.where(found[orphan], 0, np.where(present[orphan], 2, 1))
+            code = code * 3 + state
+        texts = {}
+        for value in np.unique(code):
+            parts, rest = [], int(value)
+            for column in reversed(misses):
+                rest, state = divmod(rest, 3)
+                if state:
+                    parts.append(_REASONS[state].format(column=column, table=KEY_COLUMNS[column]))
+            texts[value] = "; ".join(reversed(parts))
+        reasons = pd.Series(code).map(texts).to_numpy()
+        orphans = sales[orphan].assign(reason=reasons)
+        return sales[~orphan], orphans, counts
+
+    def record(self, counts: Counter) -> None:
+        """Add one batch's counts (e.g. from a worker process) to the totals."""
+        self.counts.update(counts)
+
+    def apply(self, sales: pd.DataFrame, cursor: sqlite3.Cursor) -> pd.DataFrame:
+        """Check a batch, quarantine its orphans and return the rows to load."""
+        load, orphans, counts = self.check(sales)
+        quarantine(cursor, orphans)
+        self.record(counts)
+        return load
+
+    def report(self) -> dict[str, int | float]:
+        """Log and return the orphan counts and rates of everything checked so far."""
+        checked = self.counts["checked"]
+        summary: dict[str, int | float] = {
+            "checked": checked,
+            "orphan_rows": self.counts["orphan_rows"],
+        }
+        for column in KEY_COLUMNS:
+            summary[f"orphan_{column}"] = self.counts[f"orphan_{column}"]
+        summary["orphan_rate"] = summary["orphan_rows"] / checked if checked else 0.0
+        action = "quarantined" if self.policy == "quarantine" else "mapped to Unknown"
+        logger.info(
+            f"sale keys: {summary['orphan_rows']} of {checked} rows orphaned "
+            f"({summary['orphan_rate']:.3%}, {action}); "
+            + ", ".join(f"{column}: {summary[f'orphan_{column}']}" for column in KEY_COLUMNS)
+        )
+        return summary
+
+
+__all__ = [
+    "DEFAULT_ORPHAN_POLICY",
+    "ORPHAN_POLICIES",
+    "UNKNOWN_MEMBER_ID",
+    "KeyResolver",
+    "create_quarantine_table",
+    "ensure_unknown_members",
+    "quarantine",
+]
@@ -0,0 +1,257 @@
+"""
+OLAP Cubes (P6)
+Materializes pre-aggregated sales cuboids in the SQLite data warehouse and
+answers grouped queries from the smallest cuboid that can serve them.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime
+import sqlite3
+import time
+
+from loguru import logger
+import pandas as pd
+
+# ---------------------------------------------------
+# CUBE DEFINITION
+# ---------------------------------------------------
+
+# Dimension name -> SQL expression over sale s JOIN customer c JOIN product p.
+# month is YYYYMM derived from the integer date key.
+DIMENSIONS: dict[str, str] = {
+    "region": "c.region",
+    "payment_type": "s.payment_type",
+    "category": "p.category",
+    "month": "s.sale_date_key / 100",
+}
+
+# Finest cuboid first; every other cuboid is rolled up from it.
+# Covers ROLLUP(region, payment_type, category) plus the single-dimension
+# and region x category views used by the reporting notebooks.
+BASE_CUBOID = "cube_region_payment_category_month"
+CUBOIDS: dict[str, tuple[str, ...]] = {
+    BASE_CUBOID: ("region", "payment_type", "category", "month"),
+    "cube_region_payment_category": ("region", "payment_type", "category"),
+    "cube_region_payment": ("region", "payment_type"),
+    "cube_region_category": ("region", "category"),
+    "cube_region": ("region",),
+    "cube_category": ("category",),
+    "cube_month": ("month",),
+    "cube_all": (),
+}
+
+# Additive measures only, so cuboids can be merged and rolled up
+MEASURES = ("total_sales", "sale_count")
+
+
+# ---------------------------------------------------
+# SCHEMA CREATION
+# ---------------------------------------------------
+
+
+def create_cube_tables(cursor: sqlite3.Cursor) -> None:
+    """Create cuboid tables and the cube catalog if they do not exist."""
+    for name, dims in CUBOIDS.items():
+        columns = [f"{dim} {'INTEGER' if dim == 'month' else 'TEXT'}" for dim in dims]
+        columns += ["total_sales REAL", "sale_count INTEGER"]
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {name} ({', '.join(columns)})")
+        if dims:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{name} ON {name} ({', '.join(dims)})")
+
+    # One row per cuboid: size (used to pick the cheapest) and the highest
+    # sale_id already aggregated (used for incremental refresh)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS olap_cube_state (
+            cuboid TEXT PRIMARY KEY,
+            dimensions TEXT,
+            row_count INTEGER,
+            sale_id_mark INTEGER,
+            refreshed_at TEXT
+        );
+        """
+    )
+
+
+# ---------------------------------------------------
+# REFRESH
+# ---------------------------------------------------
+
+
+def _base_aggregate_sql(above_sale_id: int) -> tuple[str, tuple]:
+    dims = CUBOIDS[BASE_CUBOID]
+    select = ", ".join(f"{DIMENSIONS[dim]} AS {dim}" for dim in dims)
+    sql = f"""
+        SELECT {select},
+               SUM(s.sale_amount_usd) AS total_sales,
+               COUNT(*) AS sale_count
+        FROM sale s
+        JOIN customer c ON s.customer_id = c.customer_id
+        JOIN product p ON s.product_id = p.product_id
+        WHERE s.sale_id > ?
+        GROUP BY {", ".join(dims)}
+    """  # noqa: S608
+    return sql, (above_sale_id,)
+
+
+def _merge_into_base(cursor: sqlite3.Cursor, above_sale_id: int) -> None:
+    """Fold sales above ``above_sale_id`` into the base cuboid.
+
+    Existing cells and the delta are unioned and regrouped, so the cost is
+    proportional to the cuboid size plus the new sales, never the history.
+    GROUP BY treats NULL dimension values as one group, which a primary-key
+    upsert would not.
+    """
+    dims = ", ".join(CUBOIDS[BASE_CUBOID])
+    delta_sql, params = _base_aggregate_sql(above_sale_id)
+    cursor.execute("DROP TABLE IF EXISTS temp.cube_merge")
+    cursor.execute(
+        f"""
+        CREATE TEMP TABLE cube_merge AS
+        SELECT {dims}, SUM(total_sales) AS total_sales, SUM(sale_count) AS sale_count
+        FROM (
+            SELECT {dims}, total_sales, sale_count FROM {BASE_CUBOID}
+            UNION ALL
+            {delta_sql}
+        )
+        GROUP BY {dims}
+        """,  # noqa: S608
+        params,
+    )
+    cursor.execute(f"DELETE FROM {BASE_CUBOID}")  # noqa: S608
+    cursor.execute(f"INSERT INTO {BASE_CUBOID} SELECT * FROM temp.cube_merge")  # noqa: S608
+    cursor.execute("DROP TABLE temp.cube_merge")
+
+
+def _roll_up(cursor: sqlite3.Cursor, name: str) -> None:
+    """Rebuild a coarser cuboid from the base cuboid."""
+    dims = CUBOIDS[name]
+    select = ", ".join([*dims, "SUM(total_sales)", "SUM(sale_count)"])
+    group_by = f"GROUP BY {', '.join(dims)}" if dims else ""
+    cursor.execute(f"DELETE FROM {name}")  # noqa: S608
+    cursor.execute(f"INSERT INTO {name} SELECT {select} FROM {BASE_CUBOID} {group_by}")  # noqa: S608
+
+
+def refresh_cubes(cursor: sqlite3.Cursor, full: bool = False) -> dict[str, int]:
+    """Bring every cuboid up to date with the sale table.
+
+    An incremental refresh aggregates only sales above the stored sale_id
+    mark. Use ``full=True`` when existing sales or dimension attributes
+    (region, category) changed, since those are baked into the cells.
+
+    Args:
+        cursor: Open cursor on the warehouse connection.
+        full: Rebuild from all sales instead of folding in new ones.
+
+    Returns:
+        dict[str, int]: Row count per cuboid after the refresh.
+    """
+    started = time.perf_counter()
+    create_cube_tables(cursor)
+
+    state = cursor.execute(
+        "SELECT sale_id_mark FROM olap_cube_state WHERE cuboid = ?", (BASE_CUBOID,)
+    ).fetchone()
+    if full or state is None or state[0] is None:
+        cursor.execute(f"DELETE FROM {BASE_CUBOID}")  # noqa: S608
+        mark = 0
+    else:
+        mark = state[0]
+
+    new_mark = cursor.execute("SELECT MAX(sale_id) FROM sale").fetchone()[0] or 0
+    if new_mark > mark or full:
+        _merge_into_base(cursor, mark)
+        for name in CUBOIDS:
+            if name != BASE_CUBOID:
+                _roll_up(cursor, name)
+
+    sizes = {}
+    refreshed_at = datetime.now(UTC).isoformat()
+    for name, dims in CUBOIDS.items():
+        sizes[name] = cursor.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0]  # noqa: S608
+        cursor.execute(
+            """
+            INSERT INTO olap_cube_state (cuboid, dimensions, row_count, sale_id_mark, refreshed_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(cuboid) DO UPDATE SET
+                dimensions = excluded.dimensions,
+                row_count = excluded.row_count,
+                sale_id_mark = excluded.sale_id_mark,
+                refreshed_at = excluded.refreshed_at
+            """,
+            (name, ",".join(dims), sizes[name], new_mark, refreshed_at),
+        )
+
+    mode = "full" if full or mark == 0 else f"incremental above sale_id {mark}"
+    logger.info(f"OLAP cubes refreshed ({mode}) in {time.perf_counter() - started:.3f}s: {sizes}")
+    return sizes
+
+
+# ---------------------------------------------------
+# QUERY HELPER
+# ---------------------------------------------------
+
+
+def choose_cuboid(conn: sqlite3.Connection, dimensions: Sequence[str]) -> str:
+    """Return the smallest materialized cuboid containing all ``dimensions``."""
+    unknown = set(dimensions) - set(DIMENSIONS)
+    if unknown:
+        raise ValueError(f"Unknown dimensions {sorted(unknown)}. Choose from {list(DIMENSIONS)}.")
+
+    sizes = dict(conn.execute("SELECT cuboid, row_count FROM olap_cube_state").fetchall())
+    candidates = [
+        name for name, dims in CUBOIDS.items() if set(dimensions) <= set(dims) and name in sizes
+    ]
+    if not candidates:
+        raise LookupError("No materialized cuboid found. Run refresh_cubes() first.")
+    return min(candidates, key=lambda name: (sizes[name], len(CUBOIDS[name])))
+
+
+def query_cube(
+    conn: sqlite3.Connection,
+    group_by: Sequence[str],
+    filters: dict[str, object] | None = None,
+) -> pd.DataFrame:
+    """Aggregate total_sales and sale_count by ``group_by`` from the cube.
+
+    Args:
+        conn: Warehouse connection.
+        group_by: Dimensions to group by, e.g. ["region", "category"].
+            An empty list returns the grand total.
+        filters: Dimension -> value (or list of values) to slice/dice on,
+            e.g. {"payment_type": "Credit", "region": ["South", "East"]}.
+            None matches the cells whose dimension value is NULL, and an
+            empty list matches nothing.
+
+    Returns:
+        pd.DataFrame: One row per group with the group_by columns,
+        total_sales and sale_count, ordered by the group_by columns.
+    """
+    filters = filters or {}
+    cuboid = choose_cuboid(conn, [*group_by, *filters])
+
+    clauses = []
+    params: list[object] = []
+    for dim, value in filters.items():
+        values = list(value) if isinstance(value, list | tuple | set) else [value]
+        # NULL groups are kept in the cuboids, but IN (NULL) never matches them
+        matches = [f"{dim} IS NULL"] if None in values else []
+        values = [v for v in values if v is not None]
+        if values:
+            matches.insert(0, f"{dim} IN ({', '.join('?' for _ in values)})")
+            params += values
+        if not matches:
+            # An empty list, like SQL's IN (), selects no cells
+            clauses.append("0")
+        else:
+            clauses.append(matches[0] if len(matches) == 1 else f"({' OR '.join(matches)})")
+
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    group = f"GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}" if group_by else ""
+    select = ", ".join(
+        [*group_by, "SUM(total_sales) AS total_sales", "SUM(sale_count) AS sale_count"]
+    )
+    sql = f"SELECT {select} FROM {cuboid} {where} {group}"  # noqa: S608
+
+    logger.debug("query_cube: {} {} -> {}", list(group_by), filters, cuboid)
+    return pd.read_sql_query(sql, conn, params=params)
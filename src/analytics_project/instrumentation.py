@@ -0,0 +1,361 @@
+"""Time the hot paths of the pipeline and write a per-run JSON-lines report.
+
+Wrap a stage in ``with stage("dw.insert.sale", rows=n):`` or decorate a
+function with ``@instrumented("prep.clean")``. When instrumentation is on,
+each stage records wall time, CPU time, rows, rows per second and peak
+memory. write_report() appends the records, plus one summary line per
+stage name, to run_report.jsonl next to project.log.
+
+When instrumentation is off (the default), stage() returns a shared no-op
+context manager and instrumented() calls the function directly. The cost
+is one flag check per call, so the hooks can stay in production code.
+
+Module Information:
+    - Filename: instrumentation.py
+    - Module: instrumentation
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Turn on with enable() or by setting ANALYTICS_INSTRUMENT=1; the report
+      is written by write_report() and at interpreter exit
+    - CPU time is process CPU (all threads), so stages running in parallel
+      threads each see the others' work
+    - Peak memory is the process's peak RSS at the end of the stage (cheap,
+      never decreases); enable(trace_memory=True) adds the exact Python and
+      NumPy allocation peak inside the stage from tracemalloc, at a
+      noticeable slowdown
+    - Stages nest per thread; each record names its parent stage
+
+Example:
+    enable()
+    with stage("prep.read") as timer:
+        df = read_csv(path)
+        timer.rows = len(df)
+    write_report()
+"""
+
+import atexit
+from collections.abc import Callable, Iterator
+import contextlib
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+import functools
+import json
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Self
+import uuid
+
+from .utils_logger import get_log_file_path, logger
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_FILE_NAME = "run_report.jsonl"
+ENV_FLAG = "ANALYTICS_INSTRUMENT"
+
+_enabled = False
+_trace_memory = False
+_report_path: Path | None = None
+_run_id = ""
+_records: list["StageRecord"] = []
+_lock = threading.Lock()
+_local = threading.local()
+_atexit_registered = False
+
+
+@dataclass
+class StageRecord:
+    """Measurements for one execution of one stage."""
+
+    run_id: str
+    stage: str
+    parent: str | None
+    started_at: str
+    wall_seconds: float
+    cpu_seconds: float
+    rows: int | None
+    rows_per_second: float | None
+    peak_rss_mb: float | None
+    traced_peak_mb: float | None = None
+    error: str | None = None
+    labels: dict = field(default_factory=dict)
+
+
+def _peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class StageTimer:
+    """Context manager measuring one stage; set ``rows`` inside the block if not known up front."""
+
+    def __init__(self, name: str, rows: int | None = None, **labels):
+        """Prepare a timer for stage ``name``; it starts on ``__enter__``."""
+        self.name = name
+        self.rows = rows
+        self.labels = labels
+        self.child_traced_peak = 0
+
+    def __enter__(self) -> Self:
+        """Start the clocks and push this stage on the thread's stack."""
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        self.started_at = datetime.now(UTC).isoformat(timespec="milliseconds")
+        if _trace_memory and tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Record the measurements (also when the block raised)."""
+        wall = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        _stack().pop()
+
+        traced = None
+        if _trace_memory and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self.child_traced_peak)
+            traced = peak / 2**20
+            if self.parent is not None:
+                # The parent's own window was reset by this stage
+                self.parent.child_traced_peak = max(self.parent.child_traced_peak, peak)
+
+        rows = None if self.rows is None else int(self.rows)
+        record = StageRecord(
+            run_id=_run_id,
+            stage=self.name,
+            parent=self.parent.name if self.parent else None,
+            started_at=self.started_at,
+            wall_seconds=round(wall, 6),
+            cpu_seconds=round(cpu, 6),
+            rows=rows,
+            rows_per_second=round(rows / wall, 1) if rows is not None and wall > 0 else None,
+            peak_rss_mb=_peak_rss_mb(),
+            traced_peak_mb=traced,
+            error=None if exc is None else f"{exc_type.__name__}: {exc}",
+            labels=self.labels,
+        )
+        with _lock:
+            _records.append(record)
+        # Formatted by loguru only when DEBUG is enabled; stages run per batch
+        logger.debug("stage {}: {:.3f}s wall, {:.3f}s cpu, rows={}", self.name, wall, cpu, rows)
+
+
+class _NullTimer:
+    """Stand-in returned while disabled; accepts ``rows`` and does nothing."""
+
+    rows = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def __setattr__(self, name, value) -> None:
+        # Shared by every caller, so it must not keep state
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _stack() -> list[StageTimer]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def is_enabled() -> bool:
+    """Return True while stages are being recorded."""
+    return _enabled
+
+
+def stage(name: str, rows: int | None = None, **labels) -> StageTimer | _NullTimer:
+    """Return a context manager timing stage ``name`` (a no-op while disabled).
+
+    Args:
+        name: Dotted stage name, e.g. "dw.insert.sale"; the summary groups by it.
+        rows: Rows the stage handles, if known before it runs.
+        labels: Extra JSON-serializable fields for the record (file, table, ...).
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return StageTimer(name, rows, **labels)
+
+
+def instrumented(name: str, rows: Callable[[object], int | None] | None = None) -> Callable:
+    """Decorate a function so each call is recorded as stage ``name``.
+
+    Args:
+        name: Stage name.
+        rows: Gets the row count from the return value; by default an int
+            result or the len() of a result that has one is used.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with StageTimer(name) as timer:
+                result = func(*args, **kwargs)
+                timer.rows = rows(result) if rows else _default_rows(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def _default_rows(result: object) -> int | None:
+    if isinstance(result, int) and not isinstance(result, bool):
+        return result
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+# ---------------- Switching on and off ----------------
+
+
+def enable(report_path: Path | None = None, trace_memory: bool = False) -> str:
+    """Start recording stages for a new run; return its run id.
+
+    Args:
+        report_path: JSON-lines file to append to (default: run_report.jsonl
+            next to the active project.log).
+        trace_memory: Also measure each stage's allocation peak with tracemalloc.
+    """
+    global _enabled, _trace_memory, _report_path, _run_id, _atexit_registered
+    with _lock:
+        _records.clear()
+    _run_id = f"{datetime.now(UTC):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+    _report_path = Path(report_path) if report_path else None
+    _trace_memory = trace_memory
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+    if not _atexit_registered:
+        atexit.register(write_report)
+        _atexit_registered = True
+    return _run_id
+
+
+def disable() -> None:
+    """Stop recording; records already taken stay until write_report()."""
+    global _enabled, _trace_memory
+    _enabled = False
+    if _trace_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _trace_memory = False
+
+
+@contextlib.contextmanager
+def recording(report_path: Path | None = None, trace_memory: bool = False) -> Iterator[str]:
+    """Enable instrumentation for a block, then write the report and disable it."""
+    run_id = enable(report_path, trace_memory)
+    try:
+        yield run_id
+    finally:
+        write_report()
+        disable()
+
+
+# ---------------- Report ----------------
+
+
+def report_path() -> Path:
+    """Return where write_report() appends."""
+    return _report_path or get_log_file_path().with_name(REPORT_FILE_NAME)
+
+
+def summarize(records: list[StageRecord]) -> dict[str, dict]:
+    """Aggregate records by stage name: calls, totals, rows/s and peak memory."""
+    summary: dict[str, dict] = {}
+    for record in records:
+        item = summary.setdefault(
+            record.stage,
+            {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "rows": 0, "peak_rss_mb": None},
+        )
+        item["calls"] += 1
+        item["wall_seconds"] += record.wall_seconds
+        item["cpu_seconds"] += record.cpu_seconds
+        item["rows"] += record.rows or 0
+        if record.peak_rss_mb is not None:
+            item["peak_rss_mb"] = max(item["peak_rss_mb"] or 0.0, record.peak_rss_mb)
+    for item in summary.values():
+        seconds = item["wall_seconds"]
+        item["rows_per_second"] = round(item["rows"] / seconds, 1) if seconds > 0 else None
+        item["wall_seconds"] = round(seconds, 6)
+        item["cpu_seconds"] = round(item["cpu_seconds"], 6)
+    return summary
+
+
+def write_report() -> Path | None:
+    """Append the recorded stages and their summary to the report; return its path.
+
+    Records are cleared once written, so calling this again appends only
+    the stages recorded since. Returns None when nothing was recorded.
+    """
+    with _lock:
+        records = list(_records)
+        _records.clear()
+    if not records:
+        return None
+
+    path = report_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    summary = summarize(records)
+    with path.open("a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({"type": "stage", **asdict(record)}, default=str) + "\n")
+        for name, item in summary.items():
+            f.write(
+                json.dumps({"type": "summary", "run_id": _run_id, "stage": name, **item}) + "\n"
+            )
+
+    lines = [f"{'stage':<28}{'calls':>6}{'wall s':>9}{'cpu s':>9}{'rows':>10}{'rows/s':>13}"]
+    for name, item in summary.items():
+        rate = item["rows_per_second"]
+        lines.append(
+            f"{name:<28}{item['calls']:>6}{item['wall_seconds']:>9.3f}{item['cpu_seconds']:>9.3f}"
+            f"{item['rows']:>10}{'' if rate is None else f'{rate:,.0f}':>13}"
+        )
+    logger.info(f"Run report {_run_id} -> {path}\n" + "\n".join(lines))
+    return path
+
+
+if os.environ.get(ENV_FLAG, "").lower() in ("1", "true", "yes"):
+    enable()
+
+
+__all__ = [
+    "ENV_FLAG",
+    "REPORT_FILE_NAME",
+    "StageRecord",
+    "StageTimer",
+    "disable",
+    "enable",
+    "instrumented",
+    "is_enabled",
+    "recording",
+    "report_path",
+    "stage",
+    "summarize",
+    "write_report",
+]
@@ -0,0 +1,221 @@
+"""Write and read the tables handed from one pipeline stage to the next.
+
+data_prep and the prepare engine write CSV by default, and every loader
+used to parse it again (tokenizing text and re-inferring types). With
+``output_format="npy"`` a stage writes the frame as a columnar_store table
+instead: one typed .npy file per column in a folder next to where the CSV
+would go (data/processed/sales_data_cleaned.cols/). ``"both"`` writes the
+binary table plus the CSV as an export.
+
+Loaders pass the CSV path to read_frame() or read_chunks(). These
+memory-map the binary table when it is at least as new as the CSV, and
+fall back to schemas.read_csv otherwise. Existing CSV-only folders keep
+working unchanged.
+
+Module Information:
+    - Filename: intermediate.py
+    - Module: intermediate
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - The manifest records each column's pandas dtype (Int32, category,
+      datetime64, ...), so the frame a loader gets has the same dtypes the
+      stage wrote, without a read-time schema
+    - Text columns are dictionary-encoded, so repeated values cost 4 bytes
+      per row on disk
+    - shard_bounds() and read_shard() split either format into row or byte
+      ranges that worker processes parse independently
+
+Example:
+    write_frame(df, PROCESSED_DIR / "sales_data_cleaned.csv", "npy")
+    sales = read_frame(PROCESSED_DIR / "sales_data_cleaned.csv")
+"""
+
+from collections.abc import Iterator, Sequence
+import io
+from itertools import pairwise
+from pathlib import Path
+
+import pandas as pd
+
+from .columnar_store import MANIFEST_NAME, read_manifest, read_table, write_table
+from .schemas import read_csv, schema_for
+
+OUTPUT_FORMATS = ("csv", "npy", "both")
+DEFAULT_OUTPUT_FORMAT = "csv"
+BINARY_SUFFIX = ".cols"
+
+
+def check_output_format(output_format: str) -> str:
+    """Return ``output_format`` or raise ValueError if it is not in OUTPUT_FORMATS."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}, got {output_format!r}")
+    return output_format
+
+
+def binary_path(csv_path: Path) -> Path:
+    """Return the columnar table folder that stands in for a CSV path."""
+    return Path(csv_path).with_suffix(BINARY_SUFFIX)
+
+
+def output_paths(csv_path: Path, output_format: str = DEFAULT_OUTPUT_FORMAT) -> list[Path]:
+    """Return the files or folders write_frame() creates for ``output_format``."""
+    check_output_format(output_format)
+    paths = []
+    if output_format in ("csv", "both"):
+        paths.append(Path(csv_path))
+    if output_format in ("npy", "both"):
+        paths.append(binary_path(csv_path))
+    return paths
+
+
+def write_frame(
+    df: pd.DataFrame, csv_path: Path, output_format: str = DEFAULT_OUTPUT_FORMAT
+) -> list[Path]:
+    """Write a stage's output as CSV, a binary columnar table, or both.
+
+    Returns:
+        list[Path]: What was written (see output_paths()).
+    """
+    paths = output_paths(csv_path, output_format)
+    for path in paths:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == BINARY_SUFFIX:
+            write_table(df.reset_index(drop=True), path)
+        else:
+            df.to_csv(path, index=False)
+    return paths
+
+
+def source_path(csv_path: Path) -> Path:
+    """Return what read_frame() will read: the binary table if fresh, else the CSV."""
+    csv_path = Path(csv_path)
+    manifest = binary_path(csv_path) / MANIFEST_NAME
+    if manifest.exists() and (
+        not csv_path.exists() or manifest.stat().st_mtime_ns >= csv_path.stat().st_mtime_ns
+    ):
+        return manifest.parent
+    return csv_path
+
+
+def _read_binary(
+    path: Path, columns: Sequence[str] | None, mmap: bool, rows: tuple[int, int] | None = None
+) -> pd.DataFrame:
+    dtypes = read_manifest(path).get("dtypes", {})
+    categorical = {col for col, dtype in dtypes.items() if dtype == "category"}
+    df = read_table(path, columns=columns, mmap=mmap, categorical=categorical, rows=rows)
+    if rows is not None:
+        # Row labels as if the whole table had been read and sliced
+        df.index = pd.RangeIndex(rows[0], rows[0] + len(df))
+    # e.g. an Int32 column without NULLs comes back as plain int32
+    restore = {
+        col: dtypes[col]
+        for col in df.columns
+        if col in dtypes and dtypes[col] not in ("object", str(df[col].dtype))
+    }
+    return df.astype(restore) if restore else df
+
+
+def read_frame(
+    csv_path: Path, columns: Sequence[str] | None = None, mmap: bool = True
+) -> pd.DataFrame:
+    """Read a stage's output, preferring the memory-mapped binary table.
+
+    Args:
+        csv_path: The stage's CSV path, whether or not the CSV was written.
+        columns: Columns to read (default: all).
+        mmap: Memory-map the binary column files.
+    """
+    path = source_path(csv_path)
+    if path.suffix == BINARY_SUFFIX:
+        return _read_binary(path, columns, mmap)
+    return read_csv(path, usecols=columns)
+
+
+def read_chunks(csv_path: Path, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Yield a stage's output in chunks of ``chunk_rows`` rows.
+
+    Each chunk of a binary table is read as its own memory-mapped row
+    range, so only the rows of the current chunk are paged in and decoded;
+    a CSV is parsed chunk by chunk.
+    """
+    path = source_path(csv_path)
+    if path.suffix != BINARY_SUFFIX:
+        yield from read_csv(path, chunksize=chunk_rows)
+        return
+    rows = read_manifest(path)["row_count"]
+    for start in range(0, rows, chunk_rows):
+        yield _read_binary(path, None, mmap=True, rows=(start, min(start + chunk_rows, rows)))
+
+
+# ---------------- Shards for parallel readers ----------------
+
+
+def csv_shard_offsets(path: Path, shards: int) -> tuple[bytes, list[tuple[int, int]]]:
+    """Return the header line and (start, end) byte ranges ending on line breaks.
+
+    Shards are split on newlines, so quoted fields must not contain line breaks.
+    """
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        header = f.readline()
+        offsets = [f.tell()]
+        for i in range(1, shards):
+            f.seek(max(offsets[-1], size * i // shards))
+            f.readline()
+            offsets.append(min(f.tell(), size))
+    offsets.append(size)
+    ranges = [(start, end) for start, end in pairwise(offsets) if end > start]
+    return header, ranges
+
+
+def shard_bounds(csv_path: Path, shard_rows: int) -> tuple[Path, list[tuple[int, int]]]:
+    """Split a stage's output into pieces of about ``shard_rows`` rows.
+
+    Returns the path read_frame() would read and the pieces: row ranges of
+    a binary table, or byte ranges of a CSV (sized from the average length
+    of its first lines). Pass each piece to read_shard(), e.g. in a worker
+    process.
+    """
+    if shard_rows <= 0:
+        raise ValueError(f"shard_rows must be positive, got {shard_rows}")
+    path = source_path(csv_path)
+    if path.suffix == BINARY_SUFFIX:
+        rows = read_manifest(path)["row_count"]
+        return path, [
+            (start, min(start + shard_rows, rows)) for start in range(0, rows, shard_rows)
+        ]
+    with path.open("rb") as f:
+        sample = f.read(1 << 16)
+    bytes_per_row = len(sample) / max(sample.count(b"\n"), 1)
+    shards = max(1, round(path.stat().st_size / bytes_per_row / shard_rows))
+    return path, csv_shard_offsets(path, shards)[1]
+
+
+def read_shard(path: Path, start: int, end: int) -> pd.DataFrame:
+    """Read one piece returned by shard_bounds() (``path`` is the path it returned)."""
+    path = Path(path)
+    if path.suffix == BINARY_SUFFIX:
+        return _read_binary(path, None, mmap=True, rows=(start, end))
+    with path.open("rb") as f:
+        header = f.readline()
+        f.seek(start)
+        body = f.read(end - start)
+    return read_csv(io.BytesIO(header + body), schema=schema_for(path))
+
+
+__all__ = [
+    "BINARY_SUFFIX",
+    "DEFAULT_OUTPUT_FORMAT",
+    "OUTPUT_FORMATS",
+    "binary_path",
+    "check_output_format",
+    "csv_shard_offsets",
+    "output_paths",
+    "read_chunks",
+    "read_frame",
+    "read_shard",
+    "shard_bounds",
+    "source_path",
+    "write_frame",
+]
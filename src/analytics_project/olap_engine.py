@@ -0,0 +1,316 @@
+"""Run OLAP slice, dice, drill-down and rollup queries in-process.
+
+This module loads the warehouse star schema from SQLite once into columnar
+NumPy arrays (dimension codes plus float measures) and answers grouped
+queries with vectorized bincount group-bys, replacing the Spark session and
+JDBC round-trip used by the reporting notebooks for single-node data.
+
+Module Information:
+    - Filename: olap_engine.py
+    - Module: olap_engine
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Columnar storage: one array per attribute, dictionary-encoded strings
+    - Star join resolved once with index lookups instead of per query
+    - Group-by as mixed-radix key + np.bincount
+    - Slice/dice return filtered cubes that share the dictionaries
+
+Example:
+    cube = SalesCube.from_warehouse()
+    cube.slice("payment_type", "Credit").aggregate(["region", "category"])
+    cube.rollup(["region", "payment_type", "category"])
+"""
+
+from collections.abc import Iterable, Sequence
+import math
+from pathlib import Path
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .utils_logger import logger
+
+# olap_engine.py is at: src/analytics_project/olap_engine.py
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DW_PATH = PROJECT_ROOT / "data_warehouse" / "datawarehouse.db"
+
+AGGREGATIONS = ("sum", "count", "mean")
+
+# Above this many possible key combinations, group keys are compacted with
+# np.unique before counting instead of sizing bincount to every combination
+_DENSE_KEY_LIMIT = 1 << 24
+
+
+class SalesCube:
+    """Sales facts joined to customer, product and date, stored column-wise.
+
+    Dimensions are held as integer codes into a sorted array of labels
+    (missing values get their own code, sorted last). Measures are float
+    arrays where NaN means NULL.
+    """
+
+    def __init__(
+        self,
+        codes: dict[str, np.ndarray],
+        labels: dict[str, np.ndarray],
+        measures: dict[str, np.ndarray],
+    ):
+        """Initialize from pre-encoded columns (use from_warehouse() normally)."""
+        self._codes = codes
+        self._labels = labels
+        self._measures = measures
+
+    # ---------------- Loading ----------------
+
+    @classmethod
+    def from_frame(cls, facts: pd.DataFrame, dimensions: Iterable[str], measures: Iterable[str]):
+        """Build a cube from a denormalized DataFrame (one row per fact)."""
+        codes = {}
+        labels = {}
+        for dim in dimensions:
+            dim_codes, dim_labels = pd.factorize(facts[dim], sort=True, use_na_sentinel=False)
+            codes[dim] = dim_codes.astype(np.int64)
+            labels[dim] = np.asarray(dim_labels, dtype=object)
+        values = {
+            name: pd.to_numeric(facts[name], errors="coerce").to_numpy(dtype=np.float64)
+            for name in measures
+        }
+        return cls(codes, labels, values)
+
+    @classmethod
+    def from_connection(cls, conn: sqlite3.Connection) -> "SalesCube":
+        """Read sale, customer and product once and join them in memory.
+
+        Sales whose customer or product is missing are dropped, matching
+        the inner joins used in the reporting notebooks.
+        """
+        sale_columns = {row[1] for row in conn.execute("PRAGMA table_info(sale)")}
+        if "sale_date_key" in sale_columns:
+            date_key_sql = "sale_date_key"
+        else:
+            logger.warning("sale has no sale_date_key (older warehouse); month/year will be NULL")
+            date_key_sql = "NULL AS sale_date_key"
+        sales = pd.read_sql_query(
+            "SELECT customer_id, product_id, sale_amount_usd, payment_type, "  # noqa: S608
+            f"{date_key_sql} FROM sale",
+            conn,
+        )
+        customers = pd.read_sql_query(
+            "SELECT customer_id, name, region, retention_category, open_invoices_num FROM customer",
+            conn,
+        )
+        products = pd.read_sql_query(
+            "SELECT product_id, product_name, category, supplier, unit_price_usd FROM product",
+            conn,
+        )
+
+        customer_row = pd.Index(customers["customer_id"]).get_indexer(sales["customer_id"])
+        product_row = pd.Index(products["product_id"]).get_indexer(sales["product_id"])
+        keep = (customer_row >= 0) & (product_row >= 0)
+        customer_row = customer_row[keep]
+        product_row = product_row[keep]
+        sales = sales[keep]
+
+        date_key = sales["sale_date_key"].astype("Int64")
+        facts = pd.DataFrame(
+            {
+                "region": customers["region"].to_numpy()[customer_row],
+                "customer_name": customers["name"].to_numpy()[customer_row],
+                "retention_category": customers["retention_category"].to_numpy()[customer_row],
+                "category": products["category"].to_numpy()[product_row],
+                "product_name": products["product_name"].to_numpy()[product_row],
+                "supplier": products["supplier"].to_numpy()[product_row],
+                "payment_type": sales["payment_type"].to_numpy(),
+                "month": (date_key // 100).to_numpy(dtype=object, na_value=None),
+                "year": (date_key // 10_000).to_numpy(dtype=object, na_value=None),
+                "sale_amount_usd": sales["sale_amount_usd"].to_numpy(),
+                # TRY_CAST(open_invoices_num AS DOUBLE): non-numeric text becomes NULL
+                "open_invoices": pd.to_numeric(
+                    customers["open_invoices_num"], errors="coerce"
+                ).to_numpy()[customer_row],
+                "unit_price_usd": products["unit_price_usd"].to_numpy()[product_row],
+            }
+        )
+        cube = cls.from_frame(
+            facts,
+            dimensions=[
+                "region",
+                "customer_name",
+                "retention_category",
+                "category",
+                "product_name",
+                "supplier",
+                "payment_type",
+                "month",
+                "year",
+            ],
+            measures=["sale_amount_usd", "open_invoices", "unit_price_usd"],
+        )
+        logger.info(
+            f"SalesCube loaded {len(cube)} facts ({int((~keep).sum())} orphan sales dropped)"
+        )
+        return cube
+
+    @classmethod
+    def from_warehouse(cls, db_path: Path = DW_PATH) -> "SalesCube":
+        """Open the SQLite warehouse read-only and load the cube."""
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            return cls.from_connection(conn)
+        finally:
+            conn.close()
+
+    # ---------------- Introspection ----------------
+
+    def __len__(self) -> int:
+        """Return the number of facts in the cube."""
+        return len(next(iter(self._measures.values())))
+
+    @property
+    def dimensions(self) -> list[str]:
+        """Names of the dimensions that can be grouped or filtered on."""
+        return list(self._codes)
+
+    @property
+    def measures(self) -> list[str]:
+        """Names of the numeric measures that can be aggregated."""
+        return list(self._measures)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Decode the cube back to one row per fact."""
+        columns = {dim: self._labels[dim][codes] for dim, codes in self._codes.items()}
+        return pd.DataFrame({**columns, **self._measures})
+
+    # ---------------- Slice and dice ----------------
+
+    def _filtered(self, mask: np.ndarray) -> "SalesCube":
+        return SalesCube(
+            {dim: codes[mask] for dim, codes in self._codes.items()},
+            self._labels,
+            {name: values[mask] for name, values in self._measures.items()},
+        )
+
+    def _mask_for(self, dimension: str, values: Sequence[object]) -> np.ndarray:
+        self._check_dimensions([dimension])
+        labels = self._labels[dimension]
+        wanted = np.flatnonzero(pd.Index(labels).isin(values))
+        return np.isin(self._codes[dimension], wanted)
+
+    def slice(self, dimension: str, value: object) -> "SalesCube":
+        """Fix one dimension to a single value."""
+        return self._filtered(self._mask_for(dimension, [value]))
+
+    def dice(self, filters: dict[str, object]) -> "SalesCube":
+        """Restrict several dimensions at once; list values mean "any of"."""
+        mask = np.ones(len(self), dtype=bool)
+        for dimension, value in filters.items():
+            values = list(value) if isinstance(value, list | tuple | set) else [value]
+            mask &= self._mask_for(dimension, values)
+        return self._filtered(mask)
+
+    # ---------------- Aggregation ----------------
+
+    def _check_dimensions(self, dimensions: Iterable[str]) -> None:
+        unknown = set(dimensions) - set(self._codes)
+        if unknown:
+            raise ValueError(
+                f"Unknown dimensions {sorted(unknown)}. Choose from {self.dimensions}."
+            )
+
+    def aggregate(
+        self,
+        group_by: Sequence[str],
+        measure: str = "sale_amount_usd",
+        agg: str = "sum",
+    ) -> pd.DataFrame:
+        """Group facts by ``group_by`` and aggregate one measure.
+
+        NULL measure values are ignored, as in SQL: a group whose values are
+        all NULL has a NULL sum or mean and a count of 0.
+
+        Args:
+            group_by: Dimension names; an empty list gives the grand total.
+            measure: Measure to aggregate.
+            agg: "sum", "count" or "mean".
+
+        Returns:
+            pd.DataFrame: group_by columns plus ``{agg}_{measure}``, one
+            row per non-empty group, ordered by the group_by columns.
+        """
+        self._check_dimensions(group_by)
+        if measure not in self._measures:
+            raise ValueError(f"Unknown measure '{measure}'. Choose from {self.measures}.")
+        if agg not in AGGREGATIONS:
+            raise ValueError(f"Unknown aggregation '{agg}'. Choose from {AGGREGATIONS}.")
+
+        sizes = [len(self._labels[dim]) for dim in group_by]
+        key = np.zeros(len(self), dtype=np.int64)
+        for dim, size in zip(group_by, sizes, strict=True):
+            key = key * size + self._codes[dim]
+
+        n_keys = math.prod(sizes)
+        if n_keys > _DENSE_KEY_LIMIT:
+            unique_keys, key = np.unique(key, return_inverse=True)
+            n_keys = len(unique_keys)
+        else:
+            unique_keys = None
+
+        values = self._measures[measure]
+        valid = ~np.isnan(values)
+        rows = np.bincount(key, minlength=n_keys)
+        counts = np.bincount(key, weights=valid, minlength=n_keys)
+        sums = np.bincount(key, weights=np.where(valid, values, 0.0), minlength=n_keys)
+
+        present = np.flatnonzero(rows)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if agg == "sum":
+                result = np.where(counts[present] > 0, sums[present], np.nan)
+            elif agg == "count":
+                result = counts[present].astype(np.int64)
+            else:
+                result = sums[present] / counts[present]
+
+        # Decode the mixed-radix key back to one code per dimension
+        remaining = present if unique_keys is None else unique_keys[present]
+        columns = {}
+        for dim, size in zip(reversed(group_by), reversed(sizes), strict=True):
+            columns[dim] = self._labels[dim][remaining % size]
+            remaining = remaining // size
+
+        frame = pd.DataFrame({dim: columns[dim] for dim in group_by})
+        frame[f"{agg}_{measure}"] = result
+        return frame
+
+    def drill_down(
+        self,
+        group_by: Sequence[str],
+        into: str,
+        measure: str = "sale_amount_usd",
+        agg: str = "sum",
+    ) -> pd.DataFrame:
+        """Split each ``group_by`` group one level further by ``into``."""
+        return self.aggregate([*group_by, into], measure, agg)
+
+    def rollup(
+        self,
+        dimensions: Sequence[str],
+        measure: str = "sale_amount_usd",
+        agg: str = "sum",
+    ) -> pd.DataFrame:
+        """Aggregate like SQL GROUP BY ROLLUP(dimensions).
+
+        Returns every prefix level from all dimensions down to the grand
+        total; rolled-up columns are None, as in Spark's output.
+        """
+        levels = []
+        for depth in range(len(dimensions), -1, -1):
+            level = self.aggregate(dimensions[:depth], measure, agg)
+            for dim in dimensions[depth:]:
+                level[dim] = None
+            levels.append(level[[*dimensions, f"{agg}_{measure}"]])
+        return pd.concat(levels, ignore_index=True)
+
+
+__all__ = ["AGGREGATIONS", "DW_PATH", "SalesCube"]
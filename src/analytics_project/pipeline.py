@@ -0,0 +1,357 @@
+"""Run the project's stages as a dependency graph in one process.
+
+Each Stage names the files it reads and writes. A stage depends on every
+stage that writes one of its inputs, plus any stage it must run
+``after`` (e.g. two loaders sharing the warehouse database). Stages whose
+dependencies are done run together on a thread pool, so the cleaning and
+preparation of customers, products and sales overlap. Because everything
+runs in one long-lived process, imports and pandas start-up are paid once.
+
+Module Information:
+    - Filename: pipeline.py
+    - Module: pipeline
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Up-to-date check: after a run, the size and mtime of every stage's
+      inputs and outputs are saved in .cache/pipeline_state.json. A stage is
+      skipped while its outputs exist and those signatures still match
+    - A failed stage blocks its dependents; independent stages still run
+    - Per-stage timing is logged as a table at the end of every run
+
+Example:
+    uv run python -m analytics_project.pipeline --workers 4
+    uv run python -m analytics_project.pipeline load_dw --force
+"""
+
+import argparse
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import runpy
+import time
+
+from .data_prep import CLEANING_JOBS, PROCESSED_DIR, RAW_DIR, process_file
+from .data_preparation.prepare_engine import PREPARED_DATA_DIR, TABLE_SPECS, prepare_table
+from .dw.etl_to_dw import DW_PATH, create_and_load_dw
+from .dw.export_snapshot import SNAPSHOT_DIR, export_warehouse_snapshot
+from .intermediate import DEFAULT_OUTPUT_FORMAT, OUTPUT_FORMATS, output_paths
+from .pipeline_cache import StageCache, path_stat
+from .utils_logger import init_logger, logger, project_root
+
+DEFAULT_STATE_PATH = project_root / ".cache" / "pipeline_state.json"
+LOAD_DATA_SCRIPT = project_root / "data_warehouse" / "load_data.py"
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One step of the pipeline and the files it reads and writes."""
+
+    name: str
+    run: Callable[[], object]
+    inputs: tuple[Path, ...] = ()
+    outputs: tuple[Path, ...] = ()
+    after: tuple[str, ...] = ()
+
+
+@dataclass
+class StageResult:
+    """Outcome of one stage: "ran", "skipped", "failed" or "blocked"."""
+
+    name: str
+    status: str
+    seconds: float = 0.0
+    result: object = None
+    error: str | None = None
+
+
+@dataclass
+class Pipeline:
+    """A validated graph of stages."""
+
+    stages: Sequence[Stage]
+    state_path: Path = DEFAULT_STATE_PATH
+    depends_on: dict[str, set[str]] = field(init=False)
+
+    def __post_init__(self):
+        """Work out each stage's dependencies and reject unknown names and cycles."""
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate stage names in {names}")
+        writers: dict[Path, set[str]] = {}
+        for stage in self.stages:
+            for path in stage.outputs:
+                writers.setdefault(Path(path), set()).add(stage.name)
+
+        self.depends_on = {}
+        for stage in self.stages:
+            unknown = set(stage.after) - set(names)
+            if unknown:
+                raise ValueError(f"{stage.name} runs after unknown stage(s) {sorted(unknown)}")
+            needed = set(stage.after)
+            for path in stage.inputs:
+                needed |= writers.get(Path(path), set())
+            self.depends_on[stage.name] = needed - {stage.name}
+        self.order()
+
+    def order(self) -> list[str]:
+        """Return the stage names in a valid run order (raises ValueError on cycles)."""
+        done: list[str] = []
+        remaining = dict(self.depends_on)
+        while remaining:
+            ready = [name for name, needs in remaining.items() if needs <= set(done)]
+            if not ready:
+                raise ValueError(f"Stages form a cycle: {sorted(remaining)}")
+            for name in ready:
+                done.append(name)
+                del remaining[name]
+        return done
+
+    def upstream(self, targets: Iterable[str]) -> set[str]:
+        """Return the targets plus every stage they depend on."""
+        selected: set[str] = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in self.depends_on:
+                raise KeyError(f"Unknown stage {name!r}")
+            if name not in selected:
+                selected.add(name)
+                pending.extend(self.depends_on[name])
+        return selected
+
+    # ---------------- Up-to-date check ----------------
+
+    @staticmethod
+    def _signature(stage: Stage) -> dict[str, list[int]] | None:
+        """Return size/mtime of the stage's files, or None if an output is missing."""
+        if not all(Path(path).exists() for path in stage.outputs):
+            return None
+        return {
+            str(path): list(path_stat(Path(path)))
+            for path in (*stage.inputs, *stage.outputs)
+            if Path(path).exists()
+        }
+
+    def _load_state(self) -> dict:
+        try:
+            return json.loads(Path(self.state_path).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: dict) -> None:
+        path = Path(self.state_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True))
+        tmp.replace(path)
+
+    # ---------------- Run ----------------
+
+    def _run_stage(self, stage: Stage) -> StageResult:
+        started = time.perf_counter()
+        try:
+            result = stage.run()
+        except Exception as error:  # noqa: BLE001 - reported in the run summary
+            logger.exception(f"Stage {stage.name} failed")
+            return StageResult(
+                stage.name, "failed", time.perf_counter() - started, error=str(error)
+            )
+        return StageResult(stage.name, "ran", time.perf_counter() - started, result=result)
+
+    def _next_step(
+        self, name: str, selected: set[str], results: dict, state: dict, force: bool
+    ) -> str | None:
+        """Return "run", "skipped", "blocked", or None while dependencies are running."""
+        needs = self.depends_on[name] & selected
+        statuses = {results[dep].status for dep in needs if dep in results}
+        if statuses & {"failed", "blocked"}:
+            return "blocked"
+        if not needs <= set(results):
+            return None
+        stage = next(stage for stage in self.stages if stage.name == name)
+        # A dependency that rewrote one of the inputs changes the signature
+        if not force and state.get(name) is not None and state[name] == self._signature(stage):
+            logger.info(f"Stage {name}: up to date, skipped")
+            return "skipped"
+        return "run"
+
+    def run(
+        self, targets: Iterable[str] | None = None, workers: int | None = None, force: bool = False
+    ) -> dict[str, StageResult]:
+        """Run the selected stages, dependencies first; return results in run order.
+
+        Args:
+            targets: Stages to bring up to date, with what they depend on
+                (default: all).
+            workers: Stages run at once (default: CPU count).
+            force: Run every selected stage even if it looks up to date.
+        """
+        by_name = {stage.name: stage for stage in self.stages}
+        selected = self.upstream(targets) if targets else set(by_name)
+        state = self._load_state()
+        results: dict[str, StageResult] = {}
+        running: dict[Future, str] = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            while len(results) < len(selected):
+                for name in self.order():
+                    if name not in selected or name in results or name in running.values():
+                        continue
+                    step = self._next_step(name, selected, results, state, force)
+                    if step == "run":
+                        logger.info(f"Stage {name}: running")
+                        running[executor.submit(self._run_stage, by_name[name])] = name
+                    elif step is not None:
+                        results[name] = StageResult(name, step)
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results[running.pop(future)] = result
+                    logger.info(f"Stage {result.name}: {result.status} in {result.seconds:.2f}s")
+
+        # Record signatures only now: later stages may rewrite a shared output
+        for name, result in results.items():
+            if result.status in ("ran", "skipped"):
+                state[name] = self._signature(by_name[name])
+            else:
+                state.pop(name, None)
+        self._save_state(state)
+
+        ordered = {name: results[name] for name in self.order() if name in results}
+        logger.info(
+            f"Pipeline finished in {time.perf_counter() - started:.2f}s\n" + timing_report(ordered)
+        )
+        return ordered
+
+
+def timing_report(results: dict[str, StageResult]) -> str:
+    """Format status and seconds for every stage."""
+    lines = [f"{'stage':<20}{'status':<9}{'seconds':>9}", "-" * 38]
+    for result in results.values():
+        line = f"{result.name:<20}{result.status:<9}{result.seconds:>9.2f}"
+        lines.append(f"{line}  {result.error}" if result.error else line)
+    return "\n".join(lines)
+
+
+# ---------------- The project's stages ----------------
+
+
+def _load_warehouse() -> None:
+    # Incremental loads also fill an empty warehouse and can be rerun
+    create_and_load_dw(incremental=True)
+
+
+def _run_load_data_script() -> None:
+    runpy.run_path(str(LOAD_DATA_SCRIPT), run_name="__main__")
+
+
+def build_pipeline(
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+    cache: StageCache | None = None,
+    state_path: Path = DEFAULT_STATE_PATH,
+) -> Pipeline:
+    """Declare the project's stages: clean, prepare, load the warehouse, export.
+
+    Args:
+        output_format: Intermediate format for the cleaned and prepared tables.
+        cache: Stage cache handed to the cleaning and preparation stages.
+        state_path: Where the up-to-date signatures are kept.
+    """
+    stages = []
+    cleaned = []
+    for job in CLEANING_JOBS:
+        processed = PROCESSED_DIR / job["file_name"].replace(".csv", "_cleaned.csv")
+        outputs = tuple(output_paths(processed, output_format))
+        cleaned.extend(outputs)
+        stages.append(
+            Stage(
+                f"clean_{job['file_name'].split('_')[0]}",
+                lambda job=job: process_file(**job, cache=cache, output_format=output_format),
+                inputs=(RAW_DIR / job["file_name"],),
+                outputs=outputs,
+            )
+        )
+
+    prepared = []
+    for spec in TABLE_SPECS:
+        outputs = tuple(output_paths(PREPARED_DATA_DIR / spec.prepared_file, output_format))
+        prepared.extend(outputs)
+        stages.append(
+            Stage(
+                f"prepare_{spec.name}",
+                lambda spec=spec: (
+                    prepare_table(spec, cache=cache, output_format=output_format).rows
+                ),
+                inputs=(RAW_DIR / spec.raw_file,),
+                outputs=outputs,
+            )
+        )
+
+    stages += [
+        Stage("load_dw", _load_warehouse, inputs=tuple(cleaned), outputs=(DW_PATH,)),
+        # load_data.py writes its own tables into the same database file
+        Stage(
+            "load_prepared",
+            _run_load_data_script,
+            inputs=tuple(prepared),
+            outputs=(DW_PATH,),
+            after=("load_dw",),
+        ),
+        Stage(
+            "export_snapshot",
+            export_warehouse_snapshot,
+            inputs=(DW_PATH,),
+            outputs=(SNAPSHOT_DIR,),
+        ),
+    ]
+    return Pipeline(stages, state_path)
+
+
+def main(
+    targets: Sequence[str] = (),
+    workers: int | None = None,
+    force: bool = False,
+    use_cache: bool = True,
+    output_format: str = DEFAULT_OUTPUT_FORMAT,
+    json_log: bool = False,
+) -> int:
+    """Run the pipeline; return 0 if no stage failed, else 1."""
+    init_logger(json_file_name="project.jsonl" if json_log else None)
+    cache = StageCache() if use_cache else None
+    results = build_pipeline(output_format, cache).run(targets or None, workers, force)
+    if cache is not None:
+        cache.log_stats()
+    return 1 if any(result.status in ("failed", "blocked") for result in results.values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the pipeline stages as a dependency graph.")
+    parser.add_argument(
+        "targets", nargs="*", help="stages to run with their dependencies (default: all)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="stages run at once")
+    parser.add_argument("--force", action="store_true", help="run stages even if up to date")
+    parser.add_argument("--no-cache", action="store_true", help="do not reuse cached stage outputs")
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default=DEFAULT_OUTPUT_FORMAT,
+        help="format of the cleaned and prepared tables",
+    )
+    parser.add_argument(
+        "--json-log", action="store_true", help="also log JSON lines to project.jsonl"
+    )
+    args = parser.parse_args()
+    raise SystemExit(
+        main(args.targets, args.workers, args.force, not args.no_cache, args.format, args.json_log)
+    )
+
+
+__all__ = ["Pipeline", "Stage", "StageResult", "build_pipeline", "main", "timing_report"]
@@ -0,0 +1,283 @@
+"""Skip pipeline stages whose inputs and parameters have not changed.
+
+A stage (clean one raw CSV, prepare one table, ...) is identified by a key
+hashed from the contents of its input files, its parameters and a code
+version. After a run the stage's output files are copied into the cache
+under that key; the next run with the same key restores (or simply keeps)
+the outputs and skips the work.
+
+Module Information:
+    - Filename: pipeline_cache.py
+    - Module: pipeline_cache
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Content hashing: input files are hashed with SHA-256; the digest is
+      remembered per path with its size and mtime, so unchanged files are
+      not re-read on every lookup
+    - One folder per entry (``<key>/entry.json`` + output copies), so
+      worker processes cleaning different files never share an index file
+    - Least-recently-used eviction bounded by entry count and total bytes
+
+Example:
+    cache = StageCache()
+    rows = cache.run(
+        "data_prep",
+        inputs=[raw_path],
+        outputs=[processed_path],
+        params={"numeric_limits": limits, "fill_value": 0},
+        compute=lambda: clean(raw_path, processed_path),
+    )
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+import hashlib
+import json
+from pathlib import Path
+import shutil
+import time
+from types import ModuleType
+import uuid
+
+from .utils_logger import logger, project_root
+
+DEFAULT_CACHE_DIR = project_root / ".cache" / "pipeline"
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+ENTRY_NAME = "entry.json"
+_HASH_BLOCK = 1024 * 1024
+
+
+def source_version(*modules: ModuleType) -> str:
+    """Return a short digest of the modules' source files (the "code version").
+
+    Editing any of the modules changes the digest and so invalidates every
+    entry computed with the old code.
+    """
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    # Write then rename so a concurrent reader never sees half a file
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp.write_text(json.dumps(data, indent=2, sort_keys=True, default=str))
+    tmp.replace(path)
+
+
+def path_stat(path: Path) -> tuple[int, int]:
+    """Return (bytes, newest mtime_ns) of an output file or folder."""
+    if not path.is_dir():
+        stat = path.stat()
+        return stat.st_size, stat.st_mtime_ns
+    stats = [file.stat() for file in path.rglob("*") if file.is_file()]
+    return sum(stat.st_size for stat in stats), max((stat.st_mtime_ns for stat in stats), default=0)
+
+
+def _copy_output(source: Path, target: Path) -> None:
+    if source.is_dir():
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.copytree(source, target)
+    else:
+        shutil.copyfile(source, target)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class StageCache:
+    """Content-addressed cache of stage outputs with LRU eviction.
+
+    Args:
+        cache_dir: Folder holding the entries (created on first use).
+        max_entries: Evict least-recently-used entries beyond this count.
+        max_bytes: Evict least-recently-used entries while their output
+            copies take more than this many bytes in total.
+
+    Hit, miss and eviction counts are kept in ``stats`` for this instance.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """Create a cache rooted at ``cache_dir``."""
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    # ---------------- Keys ----------------
+
+    def file_digest(self, path: Path) -> str:
+        """Return the SHA-256 of a file, reusing the last digest if size and mtime match."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        memo_path = (
+            self.cache_dir / "digests" / f"{hashlib.sha256(str(path).encode()).hexdigest()}.json"
+        )
+        memo = _read_json(memo_path)
+        if memo and memo["size"] == stat.st_size and memo["mtime_ns"] == stat.st_mtime_ns:
+            return memo["sha256"]
+
+        digest = hashlib.sha256()
+        with path.open("rb") as f:
+            while block := f.read(_HASH_BLOCK):
+                digest.update(block)
+        memo_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_json(
+            memo_path,
+            {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()},
+        )
+        return digest.hexdigest()
+
+    def key(
+        self, stage: str, inputs: Iterable[Path], params: dict | None = None, code_version: str = ""
+    ) -> str:
+        """Return the cache key for one run of a stage."""
+        payload = {
+            "stage": stage,
+            "inputs": [self.file_digest(path) for path in inputs],
+            "params": params or {},
+            "code_version": code_version,
+        }
+        text = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+    # ---------------- Lookup / store ----------------
+
+    def _restore(self, entry: dict, folder: Path, outputs: Sequence[Path]) -> bool:
+        """Make ``outputs`` match the cached copies; False if a copy is missing."""
+        for index, output in enumerate(outputs):
+            output = Path(output)
+            recorded = entry["outputs"][index]
+            if output.exists() and path_stat(output) == (recorded["size"], recorded["mtime_ns"]):
+                continue  # still the file this entry produced
+            copy = folder / f"output_{index}"
+            if not copy.exists():
+                return False
+            output.parent.mkdir(parents=True, exist_ok=True)
+            _copy_output(copy, output)
+            size, mtime_ns = path_stat(output)
+            recorded.update(size=size, mtime_ns=mtime_ns)
+        return True
+
+    def _store(self, key: str, stage: str, outputs: Sequence[Path], result: object) -> None:
+        folder = self.cache_dir / key
+        tmp = self.cache_dir / f".{key}.{uuid.uuid4().hex}"
+        tmp.mkdir(parents=True)
+        recorded = []
+        for index, output in enumerate(outputs):
+            _copy_output(Path(output), tmp / f"output_{index}")
+            size, mtime_ns = path_stat(Path(output))
+            recorded.append({"path": str(output), "size": size, "mtime_ns": mtime_ns})
+        now = time.time()
+        entry = {
+            "stage": stage,
+            "outputs": recorded,
+            "result": result,
+            "bytes": sum(item["size"] for item in recorded),
+            "created": now,
+            "last_used": now,
+        }
+        _write_json(tmp / ENTRY_NAME, entry)
+        shutil.rmtree(folder, ignore_errors=True)
+        tmp.replace(folder)
+
+    def run(
+        self,
+        stage: str,
+        inputs: Sequence[Path],
+        outputs: Sequence[Path],
+        compute: Callable[[], object],
+        params: dict | None = None,
+        code_version: str = "",
+    ) -> object:
+        """Return the stage's result, running ``compute`` only on a cache miss.
+
+        Args:
+            stage: Stage name, used in the key and in log messages.
+            inputs: Files the stage reads.
+            outputs: Files (or folders, e.g. columnar tables) ``compute`` writes.
+            compute: Runs the stage; its return value must be JSON-serializable
+                (e.g. a row count), since hits return the stored value.
+            params: Parameters that change the output (JSON-serializable).
+            code_version: E.g. source_version(module) of the stage code.
+        """
+        key = self.key(stage, inputs, params, code_version)
+        folder = self.cache_dir / key
+        entry = _read_json(folder / ENTRY_NAME)
+        label = f"{stage} [{', '.join(Path(path).name for path in inputs)}]"
+
+        if entry is not None and self._restore(entry, folder, outputs):
+            entry["last_used"] = time.time()
+            _write_json(folder / ENTRY_NAME, entry)
+            self.stats["hits"] += 1
+            logger.info(f"Stage cache hit: {label} ({key[:12]})")
+            return entry["result"]
+
+        self.stats["misses"] += 1
+        logger.info(f"Stage cache miss: {label} ({key[:12]})")
+        result = compute()
+        self._store(key, stage, outputs, result)
+        self.evict()
+        return result
+
+    # ---------------- Eviction ----------------
+
+    def entries(self) -> list[tuple[Path, dict]]:
+        """Return (folder, entry) pairs, least recently used first."""
+        if not self.cache_dir.exists():
+            return []
+        found = []
+        for folder in self.cache_dir.iterdir():
+            entry = _read_json(folder / ENTRY_NAME) if folder.is_dir() else None
+            if entry is not None:
+                found.append((folder, entry))
+        return sorted(found, key=lambda item: item[1]["last_used"])
+
+    def evict(self) -> int:
+        """Drop least-recently-used entries until both limits hold; return how many."""
+        entries = self.entries()
+        total = sum(entry["bytes"] for _, entry in entries)
+        evicted = 0
+        while entries and (len(entries) > self.max_entries or total > self.max_bytes):
+            folder, entry = entries.pop(0)
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= entry["bytes"]
+            evicted += 1
+        if evicted:
+            self.stats["evictions"] += evicted
+            logger.info(f"Stage cache evicted {evicted} entr{'y' if evicted == 1 else 'ies'}")
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every entry and remembered digest."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def add_stats(self, stats: dict[str, int]) -> None:
+        """Add counts from another instance, e.g. a copy used in a worker process."""
+        for name, count in stats.items():
+            self.stats[name] += count
+
+    def log_stats(self) -> dict[str, int]:
+        """Log and return this instance's hit/miss/eviction counts."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        rate = self.stats["hits"] / lookups if lookups else 0.0
+        logger.info(
+            f"Stage cache: {self.stats['hits']} hit(s), {self.stats['misses']} miss(es), "
+            f"{self.stats['evictions']} eviction(s), hit rate {rate:.0%}"
+        )
+        return dict(self.stats)
+
+
+__all__ = ["DEFAULT_CACHE_DIR", "StageCache", "path_stat", "source_version"]
@@ -0,0 +1,191 @@
+"""Profile a DataFrame in one pass with mergeable sketches.
+
+A DataProfile collects, per column, null and non-null counts, a distinct
+count (HyperLogLog), min/max/mean/stddev (RunningMoments) and quantiles
+(QuantileSketch), plus a duplicate-row count from a HyperLogLog of row
+hashes. Profiles of chunks or of worker processes' shards merge into the
+profile of the whole data set.
+
+Module Information:
+    - Filename: profiling.py
+    - Module: profiling
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - One traversal per column: the column hash feeds both the column's
+      distinct count and the row hash used for duplicates
+    - Exact while small: distinct and duplicate counts are exact below the
+      HyperLogLog exact limit, quantiles below the sketch's level size
+    - Mergeable: update() per chunk, merge() across processes
+
+Example:
+    profile = DataProfile.from_frame(df)
+    profile.null_counts, profile.duplicate_rows
+    print(profile.describe())
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .sketches import HyperLogLog, QuantileSketch, RunningMoments, hash_column, mix_hashes
+
+QUANTILES = (0.25, 0.5, 0.75)
+
+# Row hashes are kept exactly up to this many distinct rows (8 bytes each)
+ROW_EXACT_LIMIT = 1 << 20
+
+
+class ColumnProfile:
+    """Sketches for one column."""
+
+    def __init__(self, name: str):
+        """Start an empty profile for column ``name``."""
+        self.name = name
+        self.dtypes: set[str] = set()
+        self.count = 0
+        self.nulls = 0
+        self.distinct = HyperLogLog()
+        self.moments = RunningMoments()
+        self.quantiles = QuantileSketch()
+
+    @property
+    def is_numeric(self) -> bool:
+        """True if any non-null values were numeric."""
+        return self.moments.count > 0
+
+    def update(self, values: pd.Series, hashes: np.ndarray) -> None:
+        """Fold in a column chunk and its hash_column() hashes."""
+        missing = values.isna().to_numpy()
+        self.dtypes.add(str(values.dtype))
+        self.nulls += int(missing.sum())
+        self.count += len(values) - int(missing.sum())
+        self.distinct.update(hashes[~missing])
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            self.moments.update(numeric)
+            self.quantiles.update(numeric)
+
+    def merge(self, other: "ColumnProfile") -> None:
+        """Fold in another profile of the same column."""
+        self.dtypes |= other.dtypes
+        self.count += other.count
+        self.nulls += other.nulls
+        self.distinct.merge(other.distinct)
+        self.moments.merge(other.moments)
+        self.quantiles.merge(other.quantiles)
+
+    @property
+    def dtype(self) -> str:
+        """The column dtype, or all dtypes seen if chunks disagreed."""
+        return "/".join(sorted(self.dtypes))
+
+
+class DataProfile:
+    """Mergeable one-pass profile of a table."""
+
+    def __init__(self):
+        """Start an empty profile."""
+        self.rows = 0
+        self.columns: dict[str, ColumnProfile] = {}
+        self.row_distinct = HyperLogLog(exact_limit=ROW_EXACT_LIMIT)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "DataProfile":
+        """Profile one DataFrame."""
+        return cls().update(df)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[pd.DataFrame]) -> "DataProfile":
+        """Profile a stream of DataFrames, e.g. pd.read_csv(..., chunksize=n)."""
+        profile = cls()
+        for chunk in chunks:
+            profile.update(chunk)
+        return profile
+
+    def update(self, df: pd.DataFrame) -> "DataProfile":
+        """Fold in a chunk of rows."""
+        row_hashes = np.zeros(len(df), dtype=np.uint64)
+        for position, name in enumerate(df.columns):
+            values = df.iloc[:, position]
+            hashes = hash_column(values)
+            row_hashes = mix_hashes(row_hashes, hashes)
+            self.columns.setdefault(name, ColumnProfile(name)).update(values, hashes)
+        self.row_distinct.update(row_hashes)
+        self.rows += len(df)
+        return self
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """Fold in the profile of other rows with the same columns."""
+        for name, column in other.columns.items():
+            self.columns.setdefault(name, ColumnProfile(name)).merge(column)
+        self.row_distinct.merge(other.row_distinct)
+        self.rows += other.rows
+        return self
+
+    # ---------------- Results ----------------
+
+    @property
+    def null_counts(self) -> pd.Series:
+        """Nulls per column, like df.isnull().sum()."""
+        return pd.Series(
+            {name: column.nulls for name, column in self.columns.items()}, dtype="int64"
+        )
+
+    @property
+    def duplicates_exact(self) -> bool:
+        """True if duplicate_rows is exact rather than estimated."""
+        return self.row_distinct.is_exact
+
+    @property
+    def duplicate_rows(self) -> int:
+        """Rows that repeat an earlier row, like df.duplicated().sum()."""
+        return max(self.rows - round(self.row_distinct.estimate()), 0)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per column: dtype, counts, distinct estimate and numeric stats."""
+        records = {}
+        for name, column in self.columns.items():
+            low, median, high = column.quantiles.quantiles(QUANTILES)
+            records[name] = {
+                "dtype": column.dtype,
+                "count": column.count,
+                "nulls": column.nulls,
+                "distinct": round(column.distinct.estimate()),
+                "mean": column.moments.mean if column.is_numeric else np.nan,
+                "std": column.moments.std,
+                "min": column.moments.min,
+                "25%": low,
+                "50%": median,
+                "75%": high,
+                "max": column.moments.max,
+            }
+        return pd.DataFrame.from_dict(records, orient="index")
+
+    def describe(self) -> pd.DataFrame:
+        """Numeric columns' statistics laid out like DataFrame.describe()."""
+        summary = self.summary()
+        numeric = [name for name, column in self.columns.items() if column.is_numeric]
+        if not numeric:
+            return summary[["count", "nulls", "distinct"]].T
+        stats = ["count", "mean", "std", "min", "25%", "50%", "75%", "max", "distinct", "nulls"]
+        return summary.loc[numeric, stats].T.astype(float)
+
+    def info_text(self) -> str:
+        """Column listing in the spirit of DataFrame.info()."""
+        lines = [
+            f"{self.rows} entries, {len(self.columns)} columns",
+            f"{'#':>3}  {'Column':<24}{'Non-Null Count':>16}{'Distinct':>10}  Dtype",
+        ]
+        for position, column in enumerate(self.columns.values()):
+            lines.append(
+                f"{position:>3}  {column.name!s:<24}{column.count:>16}"
+                f"{round(column.distinct.estimate()):>10}  {column.dtype}"
+            )
+        duplicates = "" if self.duplicates_exact else "~"
+        lines.append(f"duplicate rows: {duplicates}{self.duplicate_rows}")
+        return "\n".join(lines) + "\n"
+
+
+__all__ = ["QUANTILES", "ColumnProfile", "DataProfile"]
@@ -0,0 +1,235 @@
+"""Declare compact read-time dtypes for the three source tables.
+
+pd.read_csv infers int64/float64 for every number and Python-object
+strings for every text column. The registry below gives each source
+column an explicit dtype instead: nullable 32-bit (or smaller) integers for
+IDs, ``category`` for low-cardinality text, and a fixed format for date
+columns. Every CSV reader in the project goes through read_csv() here.
+
+Module Information:
+    - Filename: schemas.py
+    - Module: schemas
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Columns that hold dirty values in the raw files (OpenInvoices_num
+      "Loyal"/"A", RestockTime_days_num "DCD", SaleAmount "?",
+      DiscountPct_num "Cash") stay text (``category`` when few distinct
+      values) so reading never loses a value; the cleaning rules coerce them
+    - Amounts stay float64: prices with cents do not survive a float32
+      round trip through CSV (969.31 -> 969.3099975585938)
+    - Dates are read as ``category`` text by default, so cleaned files and
+      the warehouse keep the source spelling; parse_dates=True parses them
+      with the declared format (unparseable values such as 2023-13-01 -> NaT)
+    - The raw, processed and prepared copies of a table share one schema;
+      the table is picked from the file name
+
+Example:
+    sales = read_csv(RAW_DIR / "sales_data.csv")
+    sales = read_csv(RAW_DIR / "sales_data.csv", parse_dates=True)
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .dates import parse_dates
+from .utils_logger import logger
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    """Read-time dtypes and date formats for one source table."""
+
+    name: str
+    dtypes: dict[str, object]
+    date_formats: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def nullable_ints(self) -> dict[str, str]:
+        """Columns cast to nullable integers after parsing rather than by the parser."""
+        return {
+            col: dtype
+            for col, dtype in self.dtypes.items()
+            if isinstance(dtype, str) and dtype.startswith(("Int", "UInt"))
+        }
+
+    def read_csv_kwargs(self) -> dict:
+        """Return the dtype argument for pd.read_csv (absent columns are ignored).
+
+        Nullable integer columns are left out: the C parser reads them about
+        twice as slowly as int64, and cast_ints() narrows them afterwards.
+        """
+        ints = self.nullable_ints
+        return {"dtype": {col: dtype for col, dtype in self.dtypes.items() if col not in ints}}
+
+    def cast_ints(self, df: pd.DataFrame, skip=()) -> pd.DataFrame:
+        """Narrow the parsed ID columns in place; columns holding text stay as read."""
+        for col, dtype in self.nullable_ints.items():
+            if col in df.columns and col not in skip:
+                narrowed = _narrow_int(df[col], dtype)
+                if narrowed is None:
+                    logger.warning(
+                        f"{self.name}.{col} does not fit {dtype}; left as {df[col].dtype}"
+                    )
+                else:
+                    df[col] = narrowed
+        return df
+
+    def parse_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Parse the date columns in place with their fixed formats (bad values -> NaT)."""
+        for col, fmt in self.date_formats.items():
+            if col in df.columns:
+                df[col] = parse_dates(df[col], fmt)
+        return df
+
+
+def _narrow_int(series: pd.Series, dtype: str) -> pd.Series | None:
+    """Cast parsed int64/float64 values to a nullable int dtype, or None if they do not fit.
+
+    Builds the masked array directly: Series.astype("Int32") re-checks every
+    value in Python-level loops and costs about as much as parsing.
+    """
+    numbers = series.to_numpy()
+    if numbers.dtype.kind not in "iuf":
+        return None
+    target = np.dtype(dtype.lower())
+    limits = np.iinfo(target)
+    mask = np.isnan(numbers) if numbers.dtype.kind == "f" else np.zeros(len(numbers), dtype=bool)
+    valid = numbers[~mask]
+    if len(valid) and (valid.min() < limits.min or valid.max() > limits.max):
+        return None
+    if numbers.dtype.kind == "f" and not np.array_equal(valid, np.trunc(valid)):
+        return None
+    values = np.where(mask, 0, numbers).astype(target)
+    return pd.Series(pd.arrays.IntegerArray(values, mask), index=series.index, name=series.name)
+
+
+CUSTOMERS_SCHEMA = TableSchema(
+    name="customers",
+    dtypes={
+        "CustomerID": "Int32",
+        "Name": object,
+        "Region": "category",
+        "JoinDate": "category",
+        "OpenInvoices_num": "category",
+        "RetentionCategory_Cat": "category",
+    },
+    date_formats={"JoinDate": "%m/%d/%y"},
+)
+
+PRODUCTS_SCHEMA = TableSchema(
+    name="products",
+    dtypes={
+        "ProductID": "Int32",
+        "ProductName": object,
+        "Category": "category",
+        "UnitPrice": "float64",
+        "RestockTime_days_num": "category",
+        "Supplier_cat": "category",
+    },
+)
+
+SALES_SCHEMA = TableSchema(
+    name="sales",
+    dtypes={
+        "TransactionID": "Int32",
+        "SaleDate": "category",
+        "CustomerID": "Int32",
+        "ProductID": "Int32",
+        "StoreID": "Int16",
+        "CampaignID": "Int8",
+        "SaleAmount": object,
+        "DiscountPct_num": "category",
+        "PaymentType_cat": "category",
+    },
+    date_formats={"SaleDate": "%m/%d/%y"},
+)
+
+SCHEMAS: dict[str, TableSchema] = {
+    schema.name: schema for schema in (CUSTOMERS_SCHEMA, PRODUCTS_SCHEMA, SALES_SCHEMA)
+}
+
+
+def schema_for(path: Path | str) -> TableSchema | None:
+    """Return the schema for a source file by name, or None.
+
+    customers_data.csv, customers_data_cleaned.csv and customers_prepared.csv
+    all match the customers schema.
+    """
+    name = Path(path).name
+    for table, schema in SCHEMAS.items():
+        if name.startswith(f"{table}_"):
+            return schema
+    return None
+
+
+def read_csv(path, schema: TableSchema | None = None, parse_dates: bool = False, **kwargs):
+    """pd.read_csv with the table's compact dtypes.
+
+    The schema is looked up from the file name unless given; files with no
+    schema read with inferred dtypes. Other keyword arguments (chunksize,
+    usecols, ...) pass through, and explicit ``dtype`` entries win. With
+    ``parse_dates`` the date columns come back as datetime64 (also per
+    chunk when reading in chunks).
+
+    If a whole-file read does not fit the schema (e.g. text in an ID
+    column), a warning is logged and the file is read with inferred dtypes.
+    """
+    # Buffers have no name: pass their schema explicitly
+    schema = schema or (schema_for(path) if isinstance(path, str | Path) else None)
+    if schema is None:
+        return pd.read_csv(path, **kwargs)
+
+    explicit = kwargs.pop("dtype", None) or {}
+    schema_kwargs = schema.read_csv_kwargs()
+    schema_kwargs["dtype"].update(explicit)
+    chunked = bool(kwargs.get("chunksize") or kwargs.get("iterator"))
+    try:
+        result = pd.read_csv(path, **schema_kwargs, **kwargs)
+    except (TypeError, ValueError) as error:
+        if chunked:
+            raise
+        logger.warning(
+            f"{path} does not match the {schema.name} schema ({error}); inferring dtypes"
+        )
+        return pd.read_csv(path, dtype=explicit or None, **kwargs)
+
+    def finish(df: pd.DataFrame) -> pd.DataFrame:
+        schema.cast_ints(df, skip=explicit)
+        return schema.parse_dates(df) if parse_dates else df
+
+    if chunked:
+        return (finish(chunk) for chunk in result)
+    return finish(result)
+
+
+def fill_missing(series: pd.Series, fill_value) -> pd.Series:
+    """Fill missing values like fillna, also in the category and nullable-int columns.
+
+    A fill value that is not yet a category is added first; a value the
+    dtype cannot hold (e.g. "N/A" in an Int32 column) turns the column into
+    object, as pandas does for "N/A" in an int64 column with NaN.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        if fill_value not in series.cat.categories:
+            series = series.cat.add_categories([fill_value])
+        return series.fillna(fill_value)
+    try:
+        return series.fillna(fill_value)
+    except (TypeError, ValueError):
+        return series.astype(object).fillna(fill_value)
+
+
+__all__ = [
+    "CUSTOMERS_SCHEMA",
+    "PRODUCTS_SCHEMA",
+    "SALES_SCHEMA",
+    "SCHEMAS",
+    "TableSchema",
+    "fill_missing",
+    "read_csv",
+    "schema_for",
+]
@@ -0,0 +1,295 @@
+"""Provide mergeable streaming sketches for profiling large data sets.
+
+Each sketch consumes NumPy arrays batch by batch, has bounded memory, and
+can be merged with another sketch of the same kind, so partial results
+from chunks or worker processes combine into one answer.
+
+Module Information:
+    - Filename: sketches.py
+    - Module: sketches
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - RunningMoments: count/mean/variance/min/max (Welford, Chan et al. merge)
+    - HyperLogLog: distinct-count estimate; exact below a size limit
+    - QuantileSketch: KLL-style compactors for approximate quantiles
+    - hash_column / hash_rows / mix_hashes: dtype-stable 64-bit hashes
+
+Example:
+    moments = RunningMoments()
+    for chunk in chunks:
+        moments.update(chunk["SaleAmount"].to_numpy())
+    moments.mean, moments.std
+"""
+
+from collections.abc import Sequence
+import math
+
+import numpy as np
+import pandas as pd
+
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+DEFAULT_HASH_KEY = "0123456789123456"  # pandas' own default key
+
+
+# ---------------- Hashing ----------------
+
+
+def hash_column(values: pd.Series, hash_key: str = DEFAULT_HASH_KEY) -> np.ndarray:
+    """Hash one column so equal values match across chunks with different dtypes.
+
+    Numeric columns are hashed by their float value, so 5 in an int64 chunk
+    matches 5.0 in a chunk that a missing value made float64. Other columns
+    are hashed by their exact text and type, as df.duplicated() compares
+    them: "7", "07" and "7.0" stay distinct. Nulls share one hash. Text
+    columns hash only their unique values.
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numeric = values.to_numpy(dtype="float64", na_value=np.nan)
+        hashes = pd.util.hash_array(numeric, hash_key=hash_key)
+        return np.where(np.isnan(numeric), _NULL_HASH, hashes)
+
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    if pd.api.types.infer_dtype(uniques) == "string":
+        text = "str:" + uniques.astype(str)
+    else:
+        # The type name keeps 5 and "5" apart in mixed object columns
+        text = uniques.map(lambda value: type(value).__name__) + ":" + uniques.astype(str)
+    hashes = pd.util.hash_array(text.to_numpy(dtype=object), hash_key=hash_key)
+    return np.where(codes < 0, _NULL_HASH, hashes[codes])
+
+
+def mix_hashes(row_hashes: np.ndarray, column_hashes: np.ndarray) -> np.ndarray:
+    """Fold one column's hashes into running row hashes (order-sensitive)."""
+    with np.errstate(over="ignore"):
+        return row_hashes * np.uint64(0x100000001B3) ^ column_hashes
+
+
+def hash_rows(columns: Sequence[pd.Series], hash_key: str = DEFAULT_HASH_KEY) -> np.ndarray:
+    """Combine per-column hashes (see hash_column) into one 64-bit hash per row."""
+    combined = np.zeros(len(columns[0]) if len(columns) else 0, dtype=np.uint64)
+    for col in columns:
+        combined = mix_hashes(combined, hash_column(col, hash_key))
+    return combined
+
+
+# ---------------- Moments ----------------
+
+
+class RunningMoments:
+    """Count, mean, sample variance, min and max of a stream of numbers.
+
+    NaNs are ignored. Batches are summarized with NumPy and folded in with
+    the pairwise update of Chan et al., the batch form of Welford's method.
+    """
+
+    def __init__(self):
+        """Start with no values."""
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.nan
+        self.max = math.nan
+
+    def _combine(self, count: int, mean: float, m2: float, low: float, high: float) -> None:
+        if count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.min, self.max = count, mean, m2, low, high
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+
+    def update(self, values: np.ndarray) -> "RunningMoments":
+        """Fold a batch of values in."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = float(values.mean())
+            m2 = float(((values - mean) ** 2).sum())
+            self._combine(len(values), mean, m2, float(values.min()), float(values.max()))
+        return self
+
+    def merge(self, other: "RunningMoments") -> "RunningMoments":
+        """Fold another RunningMoments in."""
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), as pandas reports it."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1)."""
+        return math.sqrt(self.variance) if self.count > 1 else math.nan
+
+
+# ---------------- Distinct counts ----------------
+
+
+class HyperLogLog:
+    """Estimate the number of distinct 64-bit hashes seen.
+
+    Up to ``exact_limit`` distinct hashes are kept as an array, so
+    small inputs are counted exactly; past that the sketch switches to
+    2**precision registers (about 1.04 / sqrt(2**precision) relative error,
+    0.8% at the default precision of 14, in 16 KB).
+    """
+
+    def __init__(self, precision: int = 14, exact_limit: int = 1 << 16):
+        """Create an empty sketch."""
+        if not 4 <= precision <= 18:
+            raise ValueError(f"precision must be between 4 and 18, got {precision}")
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self.exact: np.ndarray | None = np.empty(0, dtype=np.uint64)
+        self.registers: np.ndarray | None = None
+
+    @property
+    def is_exact(self) -> bool:
+        """True while the sketch still holds every distinct hash."""
+        return self.exact is not None
+
+    def _registers_for(self, hashes: np.ndarray) -> np.ndarray:
+        m = 1 << self.precision
+        registers = np.zeros(m, dtype=np.uint8)
+        if not len(hashes):
+            return registers
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        rest = hashes << np.uint64(self.precision)
+        # Leading zeros of ``rest``: frexp is exact on the top 53 bits
+        _, exponent = np.frexp((rest >> np.uint64(11)).astype(np.float64))
+        leading_zeros = np.where(rest >> np.uint64(11) > 0, 53 - exponent, 64 - self.precision)
+        rank = np.minimum(leading_zeros + 1, 64 - self.precision + 1).astype(np.uint8)
+        np.maximum.at(registers, index, rank)
+        return registers
+
+    def _to_registers(self) -> None:
+        if self.exact is not None:
+            self.registers = self._registers_for(self.exact)
+            self.exact = None
+
+    def update(self, hashes: np.ndarray) -> "HyperLogLog":
+        """Add a batch of uint64 hashes (see hash_column / hash_rows)."""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if self.exact is not None:
+            self.exact = pd.unique(np.concatenate([self.exact, hashes]))
+            if len(self.exact) > self.exact_limit:
+                self._to_registers()
+        else:
+            np.maximum(self.registers, self._registers_for(hashes), out=self.registers)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch with the same precision in."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        if other.exact is not None:
+            return self.update(other.exact)
+        self._to_registers()
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self) -> float:
+        """Return the (estimated) number of distinct hashes."""
+        if self.exact is not None:
+            return float(len(self.exact))
+        m = 1 << self.precision
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int((self.registers == 0).sum())
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small sets
+        return float(raw)
+
+
+# ---------------- Quantiles ----------------
+
+
+class QuantileSketch:
+    """Approximate quantiles with KLL-style compactors.
+
+    Level h holds values that each stand for 2**h inputs. When a level
+    exceeds ``k`` items it is sorted and every other item moves up a level,
+    so memory is about k * log2(n / k) values and rank error is O(1 / k).
+    While everything still fits in level 0 the quantiles are exact.
+    """
+
+    def __init__(self, k: int = 512):
+        """Create an empty sketch keeping about ``k`` values per level."""
+        self.k = k
+        self.levels: list[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self._offset = 0
+        self.count = 0
+
+    def _compact(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.k:
+                level = np.sort(level)
+                # Keep an odd leftover at this level; alternate which half moves up
+                keep = level[-1:] if len(level) % 2 else level[:0]
+                pairs = level[: len(level) - len(keep)]
+                promoted = pairs[self._offset :: 2]
+                self._offset ^= 1
+                self.levels[h] = keep
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype=np.float64))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """Add a batch of values; NaNs are ignored."""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch in."""
+        for h, level in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0, dtype=np.float64))
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self._compact()
+        return self
+
+    def quantiles(self, qs: Sequence[float]) -> list[float]:
+        """Return the value at each quantile in ``qs`` (0 to 1)."""
+        if self.count == 0:
+            return [math.nan for _ in qs]
+        if len(self.levels) == 1:
+            # Nothing compacted yet: exact, interpolated like pandas.describe()
+            return [float(value) for value in np.quantile(self.levels[0], qs)]
+        values = np.concatenate(self.levels)
+        weights = np.concatenate(
+            [np.full(len(level), 1 << h, dtype=np.float64) for h, level in enumerate(self.levels)]
+        )
+        order = np.argsort(values, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        picks = np.minimum(np.searchsorted(cumulative, ranks), len(values) - 1)
+        return [float(value) for value in values[order][picks]]
+
+
+__all__ = [
+    "DEFAULT_HASH_KEY",
+    "HyperLogLog",
+    "QuantileSketch",
+    "RunningMoments",
+    "hash_column",
+    "hash_rows",
+    "mix_hashes",
+]
@@ -0,0 +1,346 @@
+"""Generate seeded customers, products and sales files at any scale.
+
+The files have the same columns and value formats as data/raw, so
+data_prep, the prepare engine and the warehouse ETL read them unchanged.
+Each table has dirty values at configurable rates, modelled on what the
+2,000-row sample contains:
+    - blank cells in nullable columns
+    - exact duplicate rows
+    - SaleAmount below zero or above the 100,000 limit, and many zero sales
+    - non-numeric OpenInvoices_num ("Loyal", "A")
+    - junk category labels ("2024", "WRONG", "1998") and inconsistent
+      Region spellings
+    - impossible dates ("2023-13-01")
+    - sales pointing at customers or products that do not exist
+
+Module Information:
+    - Filename: synthetic_data.py
+    - Module: synthetic_data
+    - Location: src/analytics_project/
+
+Key Concepts:
+    - Rows are generated column-wise with NumPy, one block of
+      BLOCK_ROWS at a time. Sales are written block by block, so memory
+      stays at about one block even for 100M rows
+    - Each block draws from its own generator, seeded from (seed, table,
+      block). The same seed and row counts always give byte-identical
+      files
+
+Example:
+    uv run python -m analytics_project.synthetic_data --rows 1000000 --out data/synthetic
+"""
+
+import argparse
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .utils_logger import init_logger, logger
+
+BLOCK_ROWS = 100_000
+FIRST_CUSTOMER_ID = 1000
+FIRST_PRODUCT_ID = 2000
+
+FIRST_NAMES = np.array(
+    (  # noqa: SIM905
+        "Robert John Jessica Mark David Kerry Maria Linda James Sarah Michael Emily Daniel Laura "
+        "Kevin Anna Brian Nancy Jason Karen"
+    ).split(),
+    dtype=object,
+)
+LAST_NAMES = np.array(
+    (  # noqa: SIM905
+        "Gomez Silva Mora Marshall Brennan Collins Smith Johnson Lee Walker Young Allen King "
+        "Wright Scott Green Baker Adams Nelson Hill"
+    ).split(),
+    dtype=object,
+)
+REGIONS = np.array(["North", "South", "East", "West", "Central"], dtype=object)
+MESSY_REGIONS = np.array(["EAST", "east", "south-west"], dtype=object)
+RETENTION = np.array(["New", "Recovered", "AtRisk", "Loyal"], dtype=object)
+BAD_RETENTION = np.array(["2024", "WRONG"], dtype=object)
+BAD_INVOICES = np.array(["Loyal", "A"], dtype=object)
+CATEGORIES = np.array(["Electronics", "Clothing", "Office", "Home"], dtype=object)
+NAME_WORDS = np.array(
+    "Be Candidate Training Where Huge Class Prime Basic Smart Classic Lite Max".split(),  # noqa: SIM905
+    dtype=object,
+)
+SUPPLIERS = np.array(
+    ["NutriSource", "FreshHarvest", "GreenFarm", "DairyPure", "AgriCo", "UrbanGoods"],
+    dtype=object,
+)
+BAD_SUPPLIERS = np.array(["2025"], dtype=object)
+PAYMENT_TYPES = np.array(["Credit", "Cash", "PayPal", "GiftCard"], dtype=object)
+BAD_PAYMENT_TYPES = np.array(["1998", "56743956993"], dtype=object)
+BAD_DATES = np.array(["2023-13-01", "00/00/00"], dtype=object)
+STORE_IDS = np.array([401, 402, 403, 404])
+
+SALE_DATE_RANGE = (date(2023, 1, 1), date(2025, 12, 31))
+JOIN_DATE_RANGE = (date(2019, 1, 1), date(2025, 6, 30))
+
+
+@dataclass(frozen=True)
+class DirtyRates:
+    """Share of rows (0-1) given each kind of bad value."""
+
+    nulls: float = 0.001
+    duplicates: float = 0.01
+    zero_amounts: float = 0.14
+    bad_amounts: float = 0.005
+    bad_invoices: float = 0.01
+    bad_labels: float = 0.005
+    messy_regions: float = 0.3
+    bad_dates: float = 0.0005
+    orphan_keys: float = 0.001
+
+
+CLEAN = DirtyRates(0, 0, 0, 0, 0, 0, 0, 0, 0)
+DEFAULT_RATES = DirtyRates()
+
+_TABLE_SEED = {"customers": 1, "products": 2, "sales": 3}
+
+
+def _rng(seed: int, table: str, block: int) -> np.random.Generator:
+    return np.random.default_rng([seed, _TABLE_SEED[table], block])
+
+
+def _short_dates(first: date, last: date) -> np.ndarray:
+    """Return every day in the range as "m/d/yy", the raw files' format."""
+    days = (last - first).days + 1
+    return np.array(
+        [
+            f"{d.month}/{d.day}/{d.year % 100:02d}"
+            for d in (first + timedelta(days=i) for i in range(days))
+        ],
+        dtype=object,
+    )
+
+
+def _choice(rng: np.random.Generator, values: np.ndarray, n: int) -> np.ndarray:
+    return values[rng.integers(0, len(values), n)]
+
+
+def _dirty(rng: np.random.Generator, column: np.ndarray, rate: float, bad: np.ndarray) -> None:
+    """Overwrite about ``rate`` of ``column`` in place with values from ``bad``."""
+    if rate <= 0:
+        return
+    hit = rng.random(len(column)) < rate
+    column[hit] = _choice(rng, bad, int(hit.sum()))
+
+
+def _finish(frame: pd.DataFrame, rng: np.random.Generator, rates: DirtyRates, key: str):
+    """Blank nullable cells and copy rows over others to make exact duplicates."""
+    n = len(frame)
+    if rates.nulls > 0:
+        for column in frame.columns.drop(key):
+            hit = rng.random(n) < rates.nulls
+            if hit.any():
+                frame[column] = frame[column].astype(object)
+                frame.loc[hit, column] = None
+    if rates.duplicates > 0 and n > 1:
+        copies = np.flatnonzero(rng.random(n) < rates.duplicates)
+        copies = copies[copies > 0]
+        # Each chosen row repeats an earlier row of the block exactly
+        frame.iloc[copies] = frame.iloc[rng.integers(0, copies)].to_numpy()
+    return frame
+
+
+# ---------------- Tables ----------------
+
+
+def customer_block(
+    start: int, n: int, seed: int = 42, rates: DirtyRates = DEFAULT_RATES
+) -> pd.DataFrame:
+    """Return customers ``start`` to ``start + n`` (0-based) of the seeded sequence."""
+    rng = _rng(seed, "customers", start // BLOCK_ROWS)
+    regions = _choice(rng, REGIONS, n)
+    _dirty(rng, regions, rates.messy_regions, MESSY_REGIONS)
+    invoices = rng.integers(0, 9, n).astype(str).astype(object)
+    _dirty(rng, invoices, rates.bad_invoices, BAD_INVOICES)
+    retention = _choice(rng, RETENTION, n)
+    _dirty(rng, retention, rates.bad_labels, BAD_RETENTION)
+    frame = pd.DataFrame(
+        {
+            "CustomerID": np.arange(start, start + n) + FIRST_CUSTOMER_ID,
+            "Name": _choice(rng, FIRST_NAMES, n) + " " + _choice(rng, LAST_NAMES, n),
+            "Region": regions,
+            "JoinDate": _choice(rng, _short_dates(*JOIN_DATE_RANGE), n),
+            "OpenInvoices_num": invoices,
+            "RetentionCategory_Cat": retention,
+        }
+    )
+    return _finish(frame, rng, rates, "CustomerID")
+
+
+def product_block(
+    start: int, n: int, seed: int = 42, rates: DirtyRates = DEFAULT_RATES
+) -> pd.DataFrame:
+    """Return products ``start`` to ``start + n`` (0-based) of the seeded sequence."""
+    rng = _rng(seed, "products", start // BLOCK_ROWS)
+    categories = _choice(rng, CATEGORIES, n)
+    suppliers = _choice(rng, SUPPLIERS, n)
+    _dirty(rng, suppliers, rates.bad_labels, BAD_SUPPLIERS)
+    frame = pd.DataFrame(
+        {
+            "ProductID": np.arange(start, start + n) + FIRST_PRODUCT_ID,
+            "ProductName": _choice(rng, CATEGORIES, n) + "-" + _choice(rng, NAME_WORDS, n),
+            "Category": categories,
+            "UnitPrice": rng.uniform(5, 1000, n).round(2),
+            "RestockTime_days_num": rng.integers(1, 31, n),
+            "Supplier_cat": suppliers,
+        }
+    )
+    return _finish(frame, rng, rates, "ProductID")
+
+
+def sale_block(
+    start: int,
+    n: int,
+    customers: int,
+    products: int,
+    seed: int = 42,
+    rates: DirtyRates = DEFAULT_RATES,
+) -> pd.DataFrame:
+    """Return sales ``start`` to ``start + n`` (0-based) referencing the generated keys."""
+    rng = _rng(seed, "sales", start // BLOCK_ROWS)
+    dates = _choice(rng, _short_dates(*SALE_DATE_RANGE), n)
+    _dirty(rng, dates, rates.bad_dates, BAD_DATES)
+
+    customer_ids = rng.integers(0, customers, n) + FIRST_CUSTOMER_ID
+    product_ids = rng.integers(0, products, n) + FIRST_PRODUCT_ID
+    if rates.orphan_keys > 0:
+        # Keys past the end of the dimension, like CustomerID 9999 in the sample
+        customer_ids[rng.random(n) < rates.orphan_keys] = FIRST_CUSTOMER_ID + customers + 9999
+        product_ids[rng.random(n) < rates.orphan_keys] = FIRST_PRODUCT_ID + products + 9999
+
+    # Skewed like the sample: median about 730, long tail up to several thousand
+    amounts = rng.gamma(1.0, 1000.0, n).round(2)
+    amounts[rng.random(n) < rates.zero_amounts] = 0.0
+    bad = np.flatnonzero(rng.random(n) < rates.bad_amounts)
+    # Half refunds keyed as negative sales, half typos far above the 100,000 limit
+    amounts[bad] = np.where(
+        rng.random(len(bad)) < 0.5,
+        -rng.uniform(1, 5000, len(bad)),
+        rng.uniform(100_001, 10_000_000, len(bad)),
+    ).round(2)
+
+    payments = _choice(rng, PAYMENT_TYPES, n)
+    _dirty(rng, payments, rates.bad_labels, BAD_PAYMENT_TYPES)
+    frame = pd.DataFrame(
+        {
+            "TransactionID": np.arange(start, start + n) + 1,
+            "SaleDate": dates,
+            "CustomerID": customer_ids,
+            "ProductID": product_ids,
+            "StoreID": _choice(rng, STORE_IDS, n),
+            "CampaignID": rng.integers(0, 4, n),
+            "SaleAmount": amounts,
+            "DiscountPct_num": rng.integers(0, 21, n) / 100,
+            "PaymentType_cat": payments,
+        }
+    )
+    return _finish(frame, rng, rates, "TransactionID")
+
+
+def blocks(rows: int) -> Iterator[tuple[int, int]]:
+    """Yield (start, rows) for each generation block of a table with ``rows`` rows."""
+    for start in range(0, rows, BLOCK_ROWS):
+        yield start, min(BLOCK_ROWS, rows - start)
+
+
+def default_dimension_sizes(sales_rows: int) -> tuple[int, int]:
+    """Return (customers, products) for a sales table, scaled like the sample."""
+    return max(200, sales_rows // 100), max(100, sales_rows // 20_000)
+
+
+# ---------------- Files ----------------
+
+
+def write_dataset(
+    folder: Path,
+    sales_rows: int,
+    customers: int | None = None,
+    products: int | None = None,
+    seed: int = 42,
+    rates: DirtyRates = DEFAULT_RATES,
+) -> dict[str, Path]:
+    """Write customers_data.csv, products_data.csv and sales_data.csv into ``folder``.
+
+    Args:
+        folder: Output folder, created if missing; files there are replaced.
+        sales_rows: Rows in the sales file.
+        customers: Rows in the customers file (default scales with sales).
+        products: Rows in the products file (default scales with sales).
+        seed: Seed for every random draw.
+        rates: Dirty-value rates; CLEAN writes no bad values.
+
+    Returns:
+        dict: Table name to the path written.
+    """
+    default_customers, default_products = default_dimension_sizes(sales_rows)
+    customers = default_customers if customers is None else customers
+    products = default_products if products is None else products
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    makers = {
+        "customers": (customers, lambda start, n: customer_block(start, n, seed, rates)),
+        "products": (products, lambda start, n: product_block(start, n, seed, rates)),
+        "sales": (
+            sales_rows,
+            lambda start, n: sale_block(start, n, customers, products, seed, rates),
+        ),
+    }
+    paths = {}
+    for table, (rows, make) in makers.items():
+        path = folder / f"{table}_data.csv"
+        with path.open("w", encoding="utf-8", newline="") as f:
+            for i, (start, n) in enumerate(blocks(rows)):
+                make(start, n).to_csv(f, index=False, header=i == 0)
+        paths[table] = path
+        logger.info(f"Wrote {rows} {table} rows to {path}")
+    return paths
+
+
+def main() -> None:
+    """Write a synthetic dataset from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="sales rows")
+    parser.add_argument("--customers", type=int, default=None)
+    parser.add_argument("--products", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--clean", action="store_true", help="write no dirty values")
+    parser.add_argument("--out", type=Path, required=True, help="output folder")
+    args = parser.parse_args()
+
+    init_logger()
+    write_dataset(
+        args.out,
+        args.rows,
+        args.customers,
+        args.products,
+        args.seed,
+        CLEAN if args.clean else DEFAULT_RATES,
+    )
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = [
+    "BLOCK_ROWS",
+    "CLEAN",
+    "DEFAULT_RATES",
+    "DirtyRates",
+    "blocks",
+    "customer_block",
+    "default_dimension_sizes",
+    "product_block",
+    "sale_block",
+    "write_dataset",
+]
@@ -13,6 +13,10 @@ Key Concepts:
     - Log levels (DEBUG, INFO, WARNING, ERROR)
     - File-based log persistence
     - Colorized console output with Loguru
+    - One backend: stdlib ``logging`` records are routed into Loguru
+    - Optional JSON-lines sink written in batches from a bounded queue
+    - Lazy formatting (``logger.debug("{} rows", n)``) and per-call-site
+      throttling for logging inside hot loops
 
 Professional Applications:
     - Production debugging and troubleshooting
@@ -21,14 +25,25 @@ Professional Applications:
     - Error tracking in data pipelines
 """
 
+from collections import Counter
+from datetime import UTC, datetime
+import json
+import logging
+import os
 import pathlib
+import queue
 import sys
+import threading
+import time
 
 from loguru import logger
 
 _is_configured: bool = False
 _log_file_path: pathlib.Path | None = None
 
+# Records at or above this level wait for queue space instead of being dropped
+NEVER_DROP_LEVEL = logging.WARNING
+
 
 def _project_root(start: pathlib.Path | None = None) -> pathlib.Path:
     """Find the project root by walking up until we see a pyproject.toml or .git.
@@ -53,25 +68,204 @@ def get_log_file_path() -> pathlib.Path:
     return project_root / "project.log"
 
 
+class InterceptHandler(logging.Handler):
+    """Forward stdlib ``logging`` records to the Loguru sinks."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Log the record through Loguru, attributed to its original caller."""
+        try:
+            level: str | int = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+        # Skip the logging module's own frames to report the real call site
+        frame, depth = sys._getframe(1), 1
+        while frame is not None and frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+        logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+
+
+class JsonLinesSink:
+    """Loguru sink appending one JSON object per record, from a background thread.
+
+    The logging thread only puts the record on a bounded queue; a writer
+    thread serializes and appends records in batches. When the queue is
+    full, records below NEVER_DROP_LEVEL are dropped and counted per level,
+    and the counts are written as one line once the writer catches up.
+    Records at or above it wait for room, so warnings and errors are kept.
+    """
+
+    def __init__(self, path: str | pathlib.Path, max_queue: int = 10_000, batch_size: int = 500):
+        """Start the writer thread for ``path``."""
+        self.path = pathlib.Path(path)
+        self.batch_size = batch_size
+        self.dropped: Counter = Counter()
+        self._dropped_lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._pid = os.getpid()
+        self._writer = threading.Thread(target=self._drain, name="json-log-writer", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def to_json(record: dict) -> str:
+        """Serialize the fields of a Loguru record kept in the JSON log."""
+        fields = {
+            "time": record["time"].isoformat(),
+            "level": record["level"].name,
+            "module": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+            "message": record["message"],
+        }
+        if record["extra"]:
+            fields["extra"] = record["extra"]
+        if record["exception"] is not None:
+            fields["exception"] = repr(record["exception"].value)
+        return json.dumps(fields, default=str)
+
+    def write(self, message) -> None:
+        """Queue one Loguru message (called by Loguru for each record)."""
+        record = message.record
+        if os.getpid() != self._pid:
+            # A forked worker did not inherit the writer thread
+            self._append([self.to_json(record)])
+        elif record["level"].no >= NEVER_DROP_LEVEL:
+            self._queue.put(record)
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped[record["level"].name] += 1
+
+    def join(self) -> None:
+        """Wait until every queued record has been written."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Write what is queued and end the writer thread (Loguru calls this on remove)."""
+        if os.getpid() == self._pid and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _append(self, lines: list[str]) -> None:
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _drain(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = [self.to_json(record) for record in batch if record is not None]
+            with self._dropped_lock:
+                dropped, self.dropped = self.dropped, Counter()
+            if dropped:
+                lines.append(
+                    json.dumps(
+                        {
+                            "time": datetime.now(UTC).astimezone().isoformat(),
+                            "level": "WARNING",
+                            "module": __name__,
+                            "message": f"log queue full: dropped {dropped.total()} records",
+                            "dropped": dict(dropped),
+                        }
+                    )
+                )
+            if lines:
+                self._append(lines)
+            for _ in batch:
+                self._queue.task_done()
+            if batch[-1] is None:
+                return
+
+
+class Throttle:
+    """Decide which of one call site's repeated records are logged.
+
+    The first record passes, then every ``every``-th one; with
+    ``per_second``, no more than that many pass per second.
+    """
+
+    def __init__(self, every: int = 1, per_second: float | None = None):
+        """Set the sampling rate and optional rate limit."""
+        if every < 1:
+            raise ValueError(f"every must be at least 1, got {every}")
+        self.every = every
+        self.interval = 1 / per_second if per_second else 0.0
+        self.seen = 0
+        self.suppressed = 0
+        self._next_time = 0.0
+
+    def allow(self) -> int | None:
+        """Count one record; return how many were suppressed before it if it passes, else None."""
+        self.seen += 1
+        if (self.seen - 1) % self.every == 0:
+            now = time.monotonic() if self.interval else 0.0
+            if now >= self._next_time:
+                self._next_time = now + self.interval
+                suppressed, self.suppressed = self.suppressed, 0
+                return suppressed
+        self.suppressed += 1
+        return None
+
+
+_throttles: dict[tuple, Throttle] = {}
+
+
+def throttled(
+    level: str,
+    message: str,
+    *args,
+    every: int = 1,
+    per_second: float | None = None,
+    key: object = None,
+) -> None:
+    """Log like ``logger.log(level, message, *args)``, as often as the call site's Throttle allows.
+
+    Each call site (and ``key``, e.g. a table name) keeps its own Throttle,
+    created with the first call's ``every`` and ``per_second``. ``args`` are
+    formatted only for records that pass, which note how many were suppressed.
+    """
+    caller = sys._getframe(1)  # cheapest way to identify the call site
+    site = (caller.f_code, caller.f_lineno, key)
+    throttle = _throttles.get(site)
+    if throttle is None:
+        throttle = _throttles[site] = Throttle(every, per_second)
+    suppressed = throttle.allow()
+    if suppressed is None:
+        return
+    if suppressed:
+        message += f" (+{suppressed} suppressed)"
+    logger.opt(depth=1).log(level, message, *args)
+
+
 def init_logger(
     level: str = "INFO",
     *,
     log_dir: str | pathlib.Path = project_root,
     log_file_name: str = "project.log",
+    json_file_name: str | None = None,
 ) -> pathlib.Path:
     """Initialize the logger and return the log file path.
 
     Ensures the log folder exists and configures logging to write to a file.
+    Records sent through the stdlib ``logging`` module go to the same sinks.
 
     Args:
         level (str): Logging level (e.g., "INFO", "DEBUG").
         log_dir: Directory where the log file will be written.
         log_file_name: File name for the log file.
+        json_file_name: If given, also write JSON lines to this file in
+            ``log_dir`` (see JsonLinesSink).
 
     Returns:
         pathlib.Path: The resolved path to the log file.
     """
-    global _is_configured
+    global _is_configured, _log_file_path
     if _is_configured:
         # If already configured once for this process
         return pathlib.Path(log_dir) / log_file_name
@@ -91,6 +285,8 @@ def init_logger(
         # Remove any existing Loguru handlers to avoid duplicate output
         logger.remove()
         logger.add(sys.stderr, level=level, format=fmt)
+        # enqueue=True: forked workers share this sink, and only the parent's
+        # writer may rotate the file
         logger.add(
             log_file,
             level=level,
@@ -102,6 +298,10 @@ def init_logger(
             encoding="utf-8",
             format=fmt,
         )
+        if json_file_name:
+            logger.add(JsonLinesSink(log_folder / json_file_name), level=level, format="{message}")
+        # stdlib loggers skip records below the level before building them
+        logging.basicConfig(handlers=[InterceptHandler()], level=logger.level(level).no, force=True)
         logger.info(f"Logging to file: {log_file.resolve()}")
         _is_configured = True
         _log_file_path = log_file  # cache for retrieval
@@ -128,4 +328,13 @@ def main() -> None:
 if __name__ == "__main__":
     main()
 
-__all__ = ["get_log_file_path", "init_logger", "log_example", "logger"]
+__all__ = [
+    "InterceptHandler",
+    "JsonLinesSink",
+    "Throttle",
+    "get_log_file_path",
+    "init_logger",
+    "log_example",
+    "logger",
+    "throttled",
+]
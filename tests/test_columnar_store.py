@@ -0,0 +1,89 @@
+"""Test the columnar snapshot store.
+
+Module Information:
+    - Filename: test_columnar_store.py
+    - Module: test_columnar_store
+    - Location: tests/
+
+Tables must round-trip through write_table/read_table, including NULLs,
+and reads must open only the projected columns and matching partitions.
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_project.columnar_store import read_manifest, read_table, write_table
+from analytics_project.dw import etl_to_dw
+from analytics_project.dw.export_snapshot import export_warehouse_snapshot
+
+
+@pytest.fixture
+def sales():
+    return pd.DataFrame(
+        {
+            "sale_id": [1, 2, 3, 4, 5],
+            "payment_type": ["Credit", "Cash", None, "Credit", "PayPal"],
+            "amount": [10.0, np.nan, 30.0, 40.0, 50.0],
+            "store_id": pd.array([7, None, 9, 9, 7], dtype="Int64"),
+            "year": pd.array([2024, 2025, 2025, 2025, None], dtype="Int64"),
+            "month": pd.array([12, 1, 1, 2, None], dtype="Int64"),
+        }
+    )
+
+
+def test_round_trip_with_nulls(tmp_path, sales):
+    write_table(sales, tmp_path / "sale", partition_by=["year", "month"])
+    result = read_table(tmp_path / "sale").sort_values("sale_id").reset_index(drop=True)
+
+    assert list(result.columns) == list(sales.columns)
+    assert result["payment_type"].tolist() == ["Credit", "Cash", None, "Credit", "PayPal"]
+    assert result["amount"].isna().tolist() == [False, True, False, False, False]
+    assert result["store_id"].isna().tolist() == [False, True, False, False, False]
+    assert result["store_id"].dropna().astype(int).tolist() == [7, 9, 9, 7]
+    assert result["year"].tolist() == [2024, 2025, 2025, 2025, None]
+
+
+def test_projection_and_partition_pruning(tmp_path, sales):
+    manifest = write_table(sales, tmp_path / "sale", partition_by=["year", "month"])
+    assert len(manifest["partitions"]) == 4
+
+    result = read_table(
+        tmp_path / "sale", columns=["sale_id", "amount"], filters={"year": 2025, "month": [1]}
+    )
+    assert list(result.columns) == ["sale_id", "amount"]
+    assert sorted(result["sale_id"]) == [2, 3]
+
+    # Pruned partitions and unprojected columns are never opened
+    (tmp_path / "sale" / "year=2024" / "month=12" / "amount.npy").unlink()
+    (tmp_path / "sale" / "year=2025" / "month=1" / "payment_type.npy").unlink()
+    assert len(read_table(tmp_path / "sale", ["amount"], {"year": 2025})) == 3
+
+    with pytest.raises(ValueError):
+        read_table(tmp_path / "sale", filters={"amount": 10.0})
+
+
+def test_export_warehouse_snapshot(tmp_path):
+    db_path = tmp_path / "dw.db"
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.insert_customers(pd.read_csv(etl_to_dw.CUSTOMERS_CSV), cursor)
+    etl_to_dw.insert_products(pd.read_csv(etl_to_dw.PRODUCTS_CSV), cursor)
+    etl_to_dw.insert_sales(pd.read_csv(etl_to_dw.SALES_CSV), cursor)
+    conn.commit()
+    expected = pd.read_sql_query("SELECT sale_id, sale_amount_usd FROM sale", conn)
+    conn.close()
+
+    rows = export_warehouse_snapshot(db_path, tmp_path / "snapshot")
+    assert rows["sale"] == len(expected)
+    assert "etl_load_state" not in rows
+
+    sale = tmp_path / "snapshot" / "sale"
+    assert read_manifest(sale)["partition_by"] == ["year", "month"]
+    result = read_table(sale, columns=["sale_id", "sale_amount_usd"]).sort_values("sale_id")
+    np.testing.assert_allclose(
+        result["sale_amount_usd"], expected.sort_values("sale_id")["sale_amount_usd"]
+    )
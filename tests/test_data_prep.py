@@ -0,0 +1,74 @@
+"""Test parallel and sharded cleaning in data_prep.
+
+Module Information:
+    - Filename: test_data_prep.py
+    - Module: test_data_prep
+    - Location: tests/
+
+Sharded and pooled runs must write exactly what the sequential
+process_file() writes, including duplicates that span shards.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics_project import data_prep
+from analytics_project.pipeline_cache import StageCache
+
+LIMITS = {"CampaignID": (0, 2)}
+
+
+def _raw_sales(raw_dir, copies=20):
+    df = pd.read_csv(data_prep.RAW_DIR / "sales_data.csv")
+    # Repeating the file puts every duplicate of a row in a different shard
+    df = pd.concat([df] * copies, ignore_index=True)
+    df.loc[::7, "StoreID"] = np.nan
+    df.to_csv(raw_dir / "sales_data.csv", index=False)
+
+
+def test_sharded_matches_sequential(tmp_path):
+    raw, sequential, sharded = (tmp_path / name for name in ("raw", "seq", "sharded"))
+    for folder in (raw, sequential, sharded):
+        folder.mkdir()
+    _raw_sales(raw)
+
+    rows = data_prep.process_file("sales_data.csv", LIMITS, 0, raw, sequential)
+    sharded_rows = data_prep.process_file_sharded(
+        "sales_data.csv", LIMITS, 0, raw, sharded, shards=4
+    )
+
+    assert sharded_rows == rows
+    assert (sharded / "sales_data_cleaned.csv").read_bytes() == (
+        sequential / "sales_data_cleaned.csv"
+    ).read_bytes()
+
+
+def test_process_files_in_pool(tmp_path):
+    raw, out = tmp_path / "raw", tmp_path / "out"
+    raw.mkdir()
+    out.mkdir()
+    _raw_sales(raw, copies=3)
+    (raw / "customers_data.csv").write_bytes(
+        (data_prep.RAW_DIR / "customers_data.csv").read_bytes()
+    )
+
+    jobs = [
+        {"file_name": "sales_data.csv", "numeric_limits": LIMITS, "fill_value": 0},
+        {"file_name": "customers_data.csv", "fill_value": "N/A"},
+    ]
+    for job in jobs:
+        # chunk_rows=None as main() sets it; the large sales file is still sharded
+        job.update(raw_dir=raw, processed_dir=out, chunk_rows=None)
+    results = data_prep.process_files(jobs, workers=2, shard_bytes=10_000)
+
+    assert set(results) == {"sales_data.csv", "customers_data.csv"}
+    cleaned = pd.read_csv(out / "sales_data_cleaned.csv")
+    assert len(cleaned) == results["sales_data.csv"]
+    assert not cleaned.duplicated().any()
+
+    # Cache lookups made in the workers count in the parent's cache
+    cache = StageCache(tmp_path / "cache")
+    for expected in ({"hits": 0, "misses": 2}, {"hits": 2, "misses": 2}):
+        jobs = [{**job, "cache": cache} for job in jobs]
+        assert data_prep.process_files(jobs, workers=2, shard_bytes=10_000) == results
+        assert {name: cache.stats[name] for name in expected} == expected
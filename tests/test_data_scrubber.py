@@ -0,0 +1,140 @@
+"""Test the lazy, fused DataScrubber plan.
+
+Module Information:
+    - Filename: test_data_scrubber.py
+    - Module: test_data_scrubber
+    - Location: tests/
+
+LazyDataScrubber.execute() must return exactly what the same calls
+return when run eagerly on DataScrubber, whatever the step order, and
+ChunkedDataScrubber must write the same CSV while streaming the file.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_project import data_prep
+from analytics_project.data_scrubber import ChunkedDataScrubber, DataScrubber, LazyDataScrubber
+
+
+@pytest.fixture
+def dirty():
+    rng = np.random.default_rng(1)
+    rows = 3000
+    df = pd.DataFrame(
+        {
+            "id": rng.integers(0, 300, rows),
+            "name": rng.choice(np.array([" Ann", "ann ", "BOB", None, "bob"], dtype=object), rows),
+            "amount": np.where(rng.random(rows) < 0.1, np.nan, rng.integers(0, 10, rows)),
+            "date": rng.choice(np.array(["5/4/25", "bad", None], dtype=object), rows),
+            "kind": rng.choice(["x", "y"], rows),
+        }
+    )
+    return pd.concat([df, df.iloc[:500]], ignore_index=True)
+
+
+PLANS = {
+    "process_file": [
+        ("remove_duplicate_records", ()),
+        ("handle_missing_data", (False, 0)),
+        ("filter_column_outliers", ("amount", 1, 8)),
+    ],
+    "strings_around_dedupe": [
+        ("format_column_strings_to_lower_and_trim", ("name",)),
+        ("remove_duplicate_records", ()),
+        ("format_column_strings_to_upper_and_trim", ("name",)),
+        ("filter_column_outliers", ("amount", 2, 5)),
+        ("parse_dates_to_add_standard_datetime", ("date",)),
+    ],
+    "column_edits": [
+        ("filter_column_outliers", ("amount", 2, 5)),
+        ("handle_missing_data", (True,)),
+        ("remove_duplicate_records", ()),
+        ("drop_columns", (["id"],)),
+        ("remove_duplicate_records", ()),
+        ("rename_columns", ({"kind": "Kind"},)),
+        ("convert_column_to_new_data_type", ("amount", int)),
+        ("reorder_columns", (["Kind", "amount", "name"],)),
+    ],
+    "fill_makes_duplicates": [
+        ("handle_missing_data", (False, "N/A")),
+        ("format_column_strings_to_lower_and_trim", ("name",)),
+        ("remove_duplicate_records", ()),
+    ],
+}
+
+
+@pytest.mark.filterwarnings("ignore:Could not infer format")
+@pytest.mark.parametrize("plan", PLANS.values(), ids=PLANS.keys())
+def test_lazy_matches_eager(dirty, plan):
+    eager = DataScrubber(dirty.copy())
+    lazy = LazyDataScrubber(dirty.copy())
+    for method, args in plan:
+        getattr(eager, method)(*args)
+        assert getattr(lazy, method)(*args) is lazy
+
+    pd.testing.assert_frame_equal(lazy.execute(), eager.df)
+
+
+def test_checks_execute_pending_plan(dirty):
+    lazy = LazyDataScrubber(dirty.copy())
+    lazy.handle_missing_data(fill_value=0).remove_duplicate_records()
+
+    counts = lazy.check_data_consistency_after_cleaning()
+    assert counts["duplicate_count"] == 0
+    assert lazy.steps == []
+    with pytest.raises(ValueError):
+        lazy.convert_column_to_new_data_type("missing", int)
+
+
+def test_chunked_matches_eager(tmp_path):
+    raw = pd.read_csv(data_prep.RAW_DIR / "sales_data.csv")
+    raw = pd.concat([raw] * 3, ignore_index=True)
+    raw.loc[::7, "StoreID"] = np.nan
+    raw.to_csv(tmp_path / "sales.csv", index=False)
+    raw = pd.read_csv(tmp_path / "sales.csv")
+
+    eager = DataScrubber(raw.copy())
+    expected_before = eager.check_data_consistency_before_cleaning()
+    eager.remove_duplicate_records()
+    eager.handle_missing_data(fill_value=0)
+    eager.filter_column_outliers("CampaignID", 0, 2)
+    eager.format_column_strings_to_lower_and_trim("PaymentType_cat")
+    eager.df.to_csv(tmp_path / "eager.csv", index=False)
+
+    # Columns with dirty values are pinned to str so every chunk formats them alike
+    chunked = ChunkedDataScrubber(
+        tmp_path / "sales.csv",
+        chunk_rows=700,
+        partitions=8,
+        dtype={"DiscountPct_num": str, "SaleAmount": str},
+    )
+    before = chunked.check_data_consistency_before_cleaning()
+    assert before["duplicate_count"] == expected_before["duplicate_count"]
+    assert before["null_counts"].tolist() == expected_before["null_counts"].tolist()
+
+    (
+        chunked.remove_duplicate_records()
+        .handle_missing_data(fill_value=0)
+        .filter_column_outliers("CampaignID", 0, 2)
+        .format_column_strings_to_lower_and_trim("PaymentType_cat")
+    )
+    assert chunked.execute(tmp_path / "chunked.csv") == len(eager.df)
+    assert (tmp_path / "chunked.csv").read_bytes() == (tmp_path / "eager.csv").read_bytes()
+    assert chunked.check_data_consistency_after_cleaning()["duplicate_count"] == 0
+
+
+def test_chunked_dedupe_keeps_numeric_looking_text(tmp_path):
+    codes = ["7", "07", "7.0", "7", " 7", "07"] * 50
+    pd.DataFrame({"code": codes, "qty": 1}).to_csv(tmp_path / "codes.csv", index=False)
+
+    eager = DataScrubber(pd.read_csv(tmp_path / "codes.csv", dtype=str))
+    eager.remove_duplicate_records()
+    eager.df.to_csv(tmp_path / "eager.csv", index=False)
+
+    chunked = ChunkedDataScrubber(tmp_path / "codes.csv", chunk_rows=7, partitions=4, dtype=str)
+    assert chunked.check_data_consistency_before_cleaning()["duplicate_count"] == len(codes) - 4
+    chunked.remove_duplicate_records()
+    assert chunked.execute(tmp_path / "chunked.csv") == len(eager.df) == 4
+    assert (tmp_path / "chunked.csv").read_bytes() == (tmp_path / "eager.csv").read_bytes()
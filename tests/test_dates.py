@@ -0,0 +1,60 @@
+"""Test date normalization with format detection and the unique-value cache.
+
+Module Information:
+    - Filename: test_dates.py
+    - Module: test_dates
+    - Location: tests/
+"""
+
+import pandas as pd
+
+from analytics_project.dates import DateParser, parse_dates, to_date_keys, to_iso_dates
+
+
+def test_detected_format_with_fallback_and_bad_values():
+    values = pd.Series(["5/4/25", "12/31/24", "2025-01-02", "2023-13-01", "bad", None] * 3)
+
+    parser = DateParser()
+    parsed = parser.parse(values)
+
+    assert parser.format == "%m/%d/%y"
+    assert parsed.iloc[:3].tolist() == [
+        pd.Timestamp("2025-05-04"),
+        pd.Timestamp("2024-12-31"),
+        pd.Timestamp("2025-01-02"),
+    ]
+    assert parsed.iloc[3:6].isna().all()
+    assert to_date_keys(values).iloc[:6].tolist() == [
+        20250504,
+        20241231,
+        20250102,
+        pd.NA,
+        pd.NA,
+        pd.NA,
+    ]
+    assert to_iso_dates(values).iloc[:6].tolist() == [
+        "2025-05-04",
+        "2024-12-31",
+        "2025-01-02",
+        None,
+        None,
+        None,
+    ]
+
+
+def test_category_and_datetime_input_match_text():
+    text = pd.Series(["5/4/25", None, "1/2/25", "5/4/25"], index=[10, 11, 12, 13])
+
+    expected = parse_dates(text)
+    assert parse_dates(text.astype("category")).equals(expected)
+    assert parse_dates(expected).equals(expected)
+    assert DateParser().keys(expected).tolist() == [20250504, pd.NA, 20250102, 20250504]
+    assert expected.index.tolist() == [10, 11, 12, 13]
+
+
+def test_format_is_kept_across_chunks():
+    parser = DateParser()
+    parser.keys(pd.Series(["2025-05-04"]))
+    # Later chunks start from the format the first chunk detected
+    assert parser.format == "%Y-%m-%d"
+    assert parser.iso(pd.Series(["2025-01-02", "5/4/25"])).tolist() == ["2025-01-02", "2025-05-04"]
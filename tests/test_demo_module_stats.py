@@ -0,0 +1,65 @@
+"""Test the statistics functions and StreamingStats.
+
+Module Information:
+    - Filename: test_demo_module_stats.py
+    - Module: test_demo_module_stats
+    - Location: tests/
+
+Array inputs and streamed chunks must give the statistics module's answers
+(within floating-point tolerance, and within the sketch error for quantiles).
+"""
+
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_project.demo_module_stats import (
+    StreamingStats,
+    calculate_max,
+    calculate_mean,
+    calculate_min,
+    calculate_standard_deviation,
+)
+
+
+def test_array_inputs_match_the_statistics_module():
+    scores = [3.5, 4.0, 4.8, 2.9, 3.7, 4.3, 3.8]
+    for values in (np.array(scores), pd.Series(scores)):
+        assert calculate_min(values) == min(scores)
+        assert calculate_max(values) == max(scores)
+        assert math.isclose(calculate_mean(values), statistics.mean(scores))
+        assert math.isclose(calculate_standard_deviation(values), statistics.stdev(scores))
+
+    with pytest.raises(statistics.StatisticsError):
+        calculate_mean(np.array([]))
+    with pytest.raises(statistics.StatisticsError):
+        calculate_standard_deviation(np.array([1.0]))
+
+
+def test_streamed_and_merged_stats_match_the_whole_sequence():
+    amounts = np.round(np.random.default_rng(0).lognormal(4.0, 1.0, 100_000), 2)
+    scores = amounts.tolist()
+
+    chunks = [scores[i : i + 7_000] for i in range(0, len(scores), 7_000)]
+    streamed = StreamingStats.from_chunks(chunks)
+    # Two workers each see half the chunks; a NaN (missing amount) is skipped
+    merged = StreamingStats.from_chunks(chunks[::2]).merge(
+        StreamingStats.from_chunks([*chunks[1::2], [math.nan]])
+    )
+
+    for stats in (streamed, merged):
+        assert stats.count == len(scores)
+        assert stats.min == min(scores)
+        assert stats.max == max(scores)
+        assert math.isclose(stats.mean, statistics.mean(scores), rel_tol=1e-12)
+        assert math.isclose(stats.stdev, statistics.stdev(scores), rel_tol=1e-12)
+        # Quantiles are sketched: the value returned sits within 1% of the right rank
+        rank = np.searchsorted(np.sort(amounts), stats.quantile(0.5)) / len(amounts)
+        assert abs(rank - 0.5) < 0.01
+
+    single = StreamingStats().update(2.5)
+    assert (single.count, single.mean, single.quantile(0.5)) == (1, 2.5, 2.5)
+    assert math.isnan(single.stdev)
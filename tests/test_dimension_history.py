@@ -0,0 +1,122 @@
+"""Test the SCD2 dimension history and the surrogate keys on sales.
+
+Module Information:
+    - Filename: test_dimension_history.py
+    - Module: test_dimension_history
+    - Location: tests/
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.dw.dimension_history import OPEN_END, read_dimension, update_history
+
+
+def _versions(conn, customer_id):
+    return conn.execute(
+        "SELECT region, effective_date, expiry_date, is_current FROM customer_history "
+        "WHERE customer_id = ? ORDER BY customer_key",
+        (customer_id,),
+    ).fetchall()
+
+
+def test_changed_rows_get_a_new_version():
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    customers = pd.DataFrame(
+        {
+            "CustomerID": [1, 2, 3, 2],
+            "Name": ["a", "b", "c", "b"],
+            "Region": ["West", "East", "North", None],
+        }
+    )
+    etl_to_dw.insert_customers(customers, cursor)
+    # The last line of a repeated ID is its latest state
+    assert conn.execute("SELECT region FROM customer WHERE customer_id = 2").fetchone() == (None,)
+
+    rows = etl_to_dw.prepare_customers(customers)
+    assert update_history(cursor, "customer", rows, "2025-01-01") == {
+        "inserted": 3,
+        "changed": 0,
+        "unchanged": 0,
+    }
+    rows = pd.concat(
+        [
+            rows.assign(region=["South", "North", "East"]),
+            pd.DataFrame({"customer_id": [4], "name": ["d"]}),
+        ]
+    )
+    assert update_history(cursor, "customer", rows, "2025-02-01") == {
+        "inserted": 1,
+        "changed": 2,
+        "unchanged": 1,
+    }
+    assert _versions(conn, 1) == [
+        ("West", "2025-01-01", "2025-02-01", 0),
+        ("South", "2025-02-01", OPEN_END, 1),
+    ]
+    assert _versions(conn, 2)[-1] == ("East", "2025-02-01", OPEN_END, 1)
+    assert _versions(conn, 3) == [("North", "2025-01-01", OPEN_END, 1)]
+
+    # Equal values hash equally whatever dtype they arrive in, including
+    # rows read back from SQLite
+    assert update_history(cursor, "customer", rows.astype({"customer_id": float}))["unchanged"] == 4
+    products = pd.DataFrame(
+        {
+            "ProductID": [7, 8],
+            "ProductName": ["p", "q"],
+            "UnitPrice": [9.5, None],
+            "RestockTime_days_num": ["3", None],
+        }
+    )
+    etl_to_dw.insert_products(products, cursor, track_history=True)
+    assert update_history(cursor, "product", read_dimension(cursor, "product", [7, 8])) == {
+        "inserted": 0,
+        "changed": 0,
+        "unchanged": 2,
+    }
+
+
+def test_sales_carry_the_keys_current_when_loaded(monkeypatch, tmp_path):
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+    for name, df in (
+        ("CUSTOMERS_CSV", customers),
+        ("PRODUCTS_CSV", products),
+        ("SALES_CSV", sales.iloc[:1000]),
+    ):
+        monkeypatch.setattr(etl_to_dw, name, tmp_path / f"{name.lower()}.csv")
+        df.to_csv(tmp_path / f"{name.lower()}.csv", index=False)
+    monkeypatch.setattr(etl_to_dw, "DW_PATH", tmp_path / "dw.db")
+    etl_to_dw.create_and_load_dw()
+
+    # The busiest customer moves region before the next 1000 sales arrive
+    moved = int(sales["CustomerID"].mode()[0])
+    customers.loc[customers["CustomerID"] == moved, "Region"] = "Moved"
+    customers.to_csv(etl_to_dw.CUSTOMERS_CSV, index=False)
+    sales.to_csv(etl_to_dw.SALES_CSV, index=False)
+    etl_to_dw.create_and_load_dw(incremental=True)
+
+    conn = sqlite3.connect(tmp_path / "dw.db")
+    regions = conn.execute(
+        "SELECT s.sale_id > 1000, h.region, COUNT(*) FROM sale s "
+        "JOIN customer_history h ON h.customer_key = s.customer_key "
+        "WHERE s.customer_id = ? GROUP BY 1, 2 ORDER BY 1",
+        (moved,),
+    ).fetchall()
+    assert [(late, region == "Moved") for late, region, _ in regions] == [(0, False), (1, True)]
+
+    # Every sale's keys point at a version of its own customer and product
+    assert (
+        conn.execute(
+            "SELECT COUNT(*) FROM sale s "
+            "JOIN customer_history c ON c.customer_key = s.customer_key "
+            "JOIN product_history p ON p.product_key = s.product_key "
+            "WHERE c.customer_id = s.customer_id AND p.product_id = s.product_id"
+        ).fetchone()
+        == conn.execute("SELECT COUNT(*) FROM sale").fetchone()
+    )
@@ -0,0 +1,253 @@
+"""Test the warehouse ETL load paths.
+
+Module Information:
+    - Filename: test_etl_to_dw.py
+    - Module: test_etl_to_dw
+    - Location: tests/
+
+The bulk executemany() path must store exactly what the original
+per-row iterrows() path stores, so both are loaded and compared.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project import utils_logger
+from analytics_project.dw import etl_to_dw
+from analytics_project.dw.key_resolution import KeyResolver
+from analytics_project.intermediate import write_frame
+
+
+def _load(customers, products, sales, *, rowwise: bool, chunk_size: int = 7, orphans=None):
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    if rowwise:
+        etl_to_dw.insert_customers_rowwise(customers, cursor)
+        etl_to_dw.insert_products_rowwise(products, cursor)
+        etl_to_dw.insert_sales_rowwise(sales, cursor)
+    else:
+        etl_to_dw.insert_customers(customers, cursor, chunk_size)
+        etl_to_dw.insert_products(products, cursor, chunk_size)
+        resolver = orphans and KeyResolver.from_cursor(cursor, orphans)
+        etl_to_dw.insert_sales(sales, cursor, chunk_size, resolver)
+    conn.commit()
+    return conn
+
+
+def _dump(conn, table):
+    return conn.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()
+
+
+def test_bulk_load_matches_rowwise_load():
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+
+    bulk = _load(customers, products, sales, rowwise=False)
+    rowwise = _load(customers, products, sales, rowwise=True)
+
+    for table in ("customer", "product", "sale"):
+        assert _dump(bulk, table) == _dump(rowwise, table)
+        assert len(_dump(bulk, table)) > 0
+
+
+def test_bulk_load_maps_missing_values_to_null():
+    products = pd.DataFrame(
+        {
+            "ProductID": [1, 2, "x"],
+            "ProductName": ["a", "b", "c"],
+            "Category": ["Home", None, "Home"],
+            "UnitPrice": [9.5, "?", 1.0],
+            "RestockTime_days_num": [3, None, 4],
+            "Supplier_cat": ["s", "t", "u"],
+        }
+    )
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.insert_products(products, cursor, chunk_size=1)
+
+    assert _dump(conn, "product") == [
+        (1, "a", "Home", 9.5, 3, "s"),
+        (2, "b", None, None, None, "t"),
+    ]
+
+
+def test_streaming_sales_load_dedupes_across_chunks(tmp_path):
+    sales = pd.read_csv(etl_to_dw.SALES_CSV).head(50)
+    # Repeat the first rows at the end so duplicates straddle chunk boundaries
+    with_dupes = pd.concat([sales, sales.head(10)], ignore_index=True)
+    csv_path = tmp_path / "sales.csv"
+    with_dupes.to_csv(csv_path, index=False)
+
+    conn = sqlite3.connect(":memory:")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    inserted, skipped = etl_to_dw.load_sales_streaming(csv_path, cursor, read_chunk_rows=8)
+
+    expected = sqlite3.connect(":memory:")
+    etl_to_dw.create_tables(expected.cursor())
+    etl_to_dw.insert_sales(sales, expected.cursor())
+    valid = len(etl_to_dw.prepare_sales(sales))
+    assert inserted == valid
+    assert skipped == len(etl_to_dw.prepare_sales(sales.head(10)))
+    assert _dump(conn, "sale") == _dump(expected, "sale")
+
+    # Every chunk's progress line shares one throttle, keyed on the table
+    sites = {site for site in utils_logger._throttles if site[0].co_name == "executemany_chunked"}
+    assert {key for _, _, key in sites} <= {"customer", "product", "sale"}
+
+
+def test_parallel_sales_load_matches_streaming_load(tmp_path):
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+    csv_path = tmp_path / "sales_data_cleaned.csv"
+    pd.concat([sales, sales.head(300)], ignore_index=True).to_csv(csv_path, index=False)
+
+    def load(loader, **kwargs):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        etl_to_dw.create_tables(conn.cursor())
+        inserted, _ = loader(csv_path, conn.cursor(), **kwargs)
+        return inserted, _dump(conn, "sale")
+
+    streamed = load(etl_to_dw.load_sales_streaming, read_chunk_rows=500)
+    parallel = {"workers": 2, "shard_rows": 400, "queue_batches": 1, "commit_rows": 500}
+    assert load(etl_to_dw.load_sales_parallel, **parallel) == streamed
+    unordered = load(etl_to_dw.load_sales_parallel, **parallel, ordered=False)
+    assert unordered[0] == streamed[0]
+    assert [row[0] for row in unordered[1]] == [row[0] for row in streamed[1]]
+
+    # A fresher binary copy is split into row ranges instead of byte ranges
+    write_frame(pd.read_csv(csv_path), csv_path, "npy")
+    assert load(etl_to_dw.load_sales_parallel, **parallel) == streamed
+
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    with pytest.raises(sqlite3.OperationalError, match="no such table"):
+        etl_to_dw.load_sales_parallel(csv_path, conn.cursor(), workers=1, shard_rows=400)
+
+
+def _point_etl_at(monkeypatch, tmp_path, customers, products, sales):
+    paths = {}
+    for name, df in (
+        ("CUSTOMERS_CSV", customers),
+        ("PRODUCTS_CSV", products),
+        ("SALES_CSV", sales),
+    ):
+        paths[name] = tmp_path / f"{name.lower()}.csv"
+        df.to_csv(paths[name], index=False)
+        monkeypatch.setattr(etl_to_dw, name, paths[name])
+    monkeypatch.setattr(etl_to_dw, "DW_PATH", tmp_path / "dw.db")
+    return paths
+
+
+def test_incremental_load_only_touches_the_delta(monkeypatch, tmp_path):
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+    old_sales = sales.iloc[:1500]
+    paths = _point_etl_at(monkeypatch, tmp_path, customers, products, old_sales)
+
+    assert etl_to_dw.create_and_load_dw() is None
+
+    # Nothing changed: every table is skipped on checksum
+    counts = etl_to_dw.create_and_load_dw(incremental=True)
+    assert all(c["inserted"] == 0 and c["updated"] == 0 for c in counts.values())
+
+    # One customer moves region, one new customer, 500 new sales
+    changed = customers.copy()
+    changed.loc[0, "Region"] = "Moved"
+    new_customer = changed.iloc[[1]].assign(CustomerID=99999)
+    pd.concat([changed, new_customer]).to_csv(paths["CUSTOMERS_CSV"], index=False)
+    sales.to_csv(paths["SALES_CSV"], index=False)
+
+    counts = etl_to_dw.create_and_load_dw(incremental=True)
+
+    assert counts["customer"]["inserted"] == 1
+    assert counts["customer"]["updated"] == 1
+    assert counts["product"] == {
+        "inserted": 0,
+        "updated": 0,
+        "skipped": len(etl_to_dw.prepare_products(products)),
+    }
+    assert counts["sale"]["inserted"] == len(etl_to_dw.prepare_sales(sales.iloc[1500:]))
+    assert counts["sale"]["updated"] == 0
+
+    all_customers = pd.concat([changed, new_customer])
+    full = _load(all_customers, products, sales, rowwise=False, orphans="quarantine")
+    incremental = sqlite3.connect(tmp_path / "dw.db")
+    for table in ("customer", "product"):
+        assert _dump(incremental, table) == _dump(full, table)
+    # Surrogate keys depend on the order versions were made, so compare source columns
+    natural = (
+        "SELECT sale_id, customer_id, product_id, sale_amount_usd, sale_date, payment_type, "
+        "sale_date_key FROM sale ORDER BY 1"
+    )
+    assert incremental.execute(natural).fetchall() == full.execute(natural).fetchall()
+    quarantined = "SELECT sale_id, reason FROM sale_quarantine ORDER BY 1"
+    assert incremental.execute(quarantined).fetchall() == full.execute(quarantined).fetchall()
+
+
+def test_date_dimension_and_covering_indexes(monkeypatch, tmp_path):
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+    _point_etl_at(monkeypatch, tmp_path, customers, products, sales)
+    etl_to_dw.create_and_load_dw(load_profile="fast")
+
+    conn = sqlite3.connect(tmp_path / "dw.db")
+    # 5/4/25 in the source becomes key 20250504 with a matching calendar row
+    assert conn.execute(
+        "SELECT d.full_date, d.quarter, d.day_name FROM sale s "
+        "JOIN date_dim d ON d.date_key = s.sale_date_key WHERE s.sale_id = 1"
+    ).fetchone() == ("2025-05-04", 2, "Sunday")
+
+    first, last, days = conn.execute(
+        "SELECT MIN(date_key), MAX(date_key), COUNT(*) FROM date_dim"
+    ).fetchone()
+    assert (first, last) == conn.execute(
+        "SELECT MIN(sale_date_key), MAX(sale_date_key) FROM sale"
+    ).fetchone()
+    assert days >= 1
+
+    plan = " ".join(
+        row[-1]
+        for row in conn.execute(
+            "EXPLAIN QUERY PLAN SELECT SUM(sale_amount_usd) FROM sale "
+            "WHERE sale_date_key BETWEEN 20250101 AND 20250331"
+        )
+    )
+    assert "COVERING INDEX idx_sale_date_key" in plan
+
+    # The fast profile drops the secondary indexes for the load; finish_load rebuilds them all
+    indexes = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+    }
+    assert set(etl_to_dw.SECONDARY_INDEXES) <= indexes
+
+
+def test_load_profiles_set_the_connection_pragmas(tmp_path):
+    conn = sqlite3.connect(tmp_path / "dw.db")
+
+    def pragma(name):
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    settings = etl_to_dw.apply_load_profile(conn, "fast")
+    assert settings["defer_indexes"] is True
+    assert (pragma("journal_mode"), pragma("synchronous")) == ("wal", 0)
+
+    etl_to_dw.apply_load_profile(conn, "safe", {"synchronous": "NORMAL"})
+    assert (pragma("journal_mode"), pragma("synchronous")) == ("delete", 1)
+    assert pragma("cache_size") == etl_to_dw.LOAD_PROFILES["safe"]["cache_size"]
+
+    with pytest.raises(ValueError, match="Unknown load profile"):
+        etl_to_dw.apply_load_profile(conn, "turbo")
+
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.drop_secondary_indexes(cursor)
+    indexes = "SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx_%'"
+    assert not set(etl_to_dw.SECONDARY_INDEXES) & {row[0] for row in conn.execute(indexes)}
+    etl_to_dw.finish_load(cursor)
+    assert set(etl_to_dw.SECONDARY_INDEXES) <= {row[0] for row in conn.execute(indexes)}
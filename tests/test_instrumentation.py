@@ -0,0 +1,91 @@
+"""Test the stage instrumentation and its run report.
+
+Module Information:
+    - Filename: test_instrumentation.py
+    - Module: test_instrumentation
+    - Location: tests/
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from analytics_project import instrumentation
+from analytics_project.data_prep import process_file
+from analytics_project.instrumentation import instrumented, recording, stage
+
+
+@pytest.fixture(autouse=True)
+def _disabled_afterwards():
+    yield
+    instrumentation.disable()
+    instrumentation.write_report()  # drop anything left over
+
+
+def _report(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_disabled_stages_record_nothing(tmp_path):
+    assert not instrumentation.is_enabled()
+    with stage("noop", rows=5) as timer:
+        timer.rows = 10
+    assert timer.rows is None
+
+    @instrumented("noop.func")
+    def double(x):
+        return 2 * x
+
+    assert double(4) == 8
+    assert instrumentation.write_report() is None
+
+
+def test_stages_nest_and_are_summarized(tmp_path):
+    report = tmp_path / "run_report.jsonl"
+
+    @instrumented("work.build")
+    def build(n):
+        return list(range(n))
+
+    with recording(report) as run_id:
+        with stage("work", rows=100, file="x.csv"):
+            assert len(build(60)) == 60
+            assert len(build(40)) == 40
+        with pytest.raises(RuntimeError), stage("work.fail"):
+            raise RuntimeError("boom")
+
+    lines = _report(report)
+    stages = [line for line in lines if line["type"] == "stage"]
+    assert [line["stage"] for line in stages] == ["work.build", "work.build", "work", "work.fail"]
+    assert {line["run_id"] for line in lines} == {run_id}
+    assert stages[0]["parent"] == "work" and stages[2]["parent"] is None
+    assert stages[2]["labels"] == {"file": "x.csv"}
+    assert stages[3]["error"] == "RuntimeError: boom"
+    assert all(line["wall_seconds"] >= 0 and line["cpu_seconds"] >= 0 for line in stages)
+
+    summary = {line["stage"]: line for line in lines if line["type"] == "summary"}
+    assert summary["work.build"]["calls"] == 2
+    assert summary["work.build"]["rows"] == 100
+    assert summary["work"]["rows"] == 100
+    assert summary["work.fail"]["calls"] == 1 and summary["work.fail"]["rows"] == 0
+
+
+def test_data_prep_stages_are_reported(tmp_path):
+    raw_dir, processed_dir = tmp_path / "raw", tmp_path / "processed"
+    raw_dir.mkdir()
+    processed_dir.mkdir()
+    pd.DataFrame({"CustomerID": [1, 2, 2], "Name": ["a", "b", "b"]}).to_csv(
+        raw_dir / "customers_data.csv", index=False
+    )
+    report = tmp_path / "run_report.jsonl"
+
+    with recording(report, trace_memory=True):
+        process_file("customers_data.csv", raw_dir=raw_dir, processed_dir=processed_dir)
+
+    stages = {line["stage"]: line for line in _report(report) if line["type"] == "stage"}
+    assert list(stages) == ["prep.read", "prep.clean", "prep.write"]
+    assert stages["prep.read"]["rows"] == 3
+    assert stages["prep.write"]["rows"] == 2
+    assert stages["prep.clean"]["traced_peak_mb"] > 0
+    assert stages["prep.write"]["labels"] == {"file": "customers_data.csv", "format": "csv"}
@@ -0,0 +1,122 @@
+"""Test the binary intermediate format between pipeline stages.
+
+Module Information:
+    - Filename: test_intermediate.py
+    - Module: test_intermediate
+    - Location: tests/
+
+A binary intermediate must hand loaders the frame the stage wrote (same
+values and dtypes), and the warehouse loaded from it must match the one
+loaded from CSV.
+"""
+
+import sqlite3
+
+import pandas as pd
+
+from analytics_project import data_prep, intermediate
+from analytics_project.dw import etl_to_dw
+from analytics_project.pipeline_cache import StageCache
+from analytics_project.schemas import read_csv
+
+LIMITS = {"CampaignID": (0, 2)}
+
+
+def test_round_trip_keeps_dtypes_and_prefers_fresh_copy(tmp_path):
+    df = data_prep.clean_frame(read_csv(data_prep.RAW_DIR / "sales_data.csv"), LIMITS, 0)
+    path = tmp_path / "sales_data_cleaned.csv"
+
+    written = intermediate.write_frame(df, path, "both")
+    assert written == [path, tmp_path / "sales_data_cleaned.cols"]
+    assert intermediate.source_path(path) == written[1]
+
+    back = intermediate.read_frame(path)
+    # Dictionaries list the categories in order of first appearance
+    pd.testing.assert_frame_equal(back, df.reset_index(drop=True), check_categorical=False)
+    chunks = list(intermediate.read_chunks(path, 500))
+    assert [len(chunk) for chunk in chunks][:-1] == [500] * (len(chunks) - 1)
+    pd.testing.assert_frame_equal(pd.concat(chunks), back)
+
+    # A CSV rewritten after the binary copy wins
+    df.head(3).to_csv(path, index=False)
+    assert intermediate.source_path(path) == path
+    assert len(intermediate.read_frame(path)) == 3
+
+
+def test_sharded_and_cached_binary_output(tmp_path):
+    raw, sequential, sharded = (tmp_path / name for name in ("raw", "seq", "sharded"))
+    for folder in (raw, sequential, sharded):
+        folder.mkdir()
+    df = pd.read_csv(data_prep.RAW_DIR / "sales_data.csv")
+    pd.concat([df] * 5, ignore_index=True).to_csv(raw / "sales_data.csv", index=False)
+
+    data_prep.process_file("sales_data.csv", LIMITS, 0, raw, sequential, output_format="npy")
+    data_prep.process_file_sharded(
+        "sales_data.csv", LIMITS, 0, raw, sharded, shards=3, output_format="npy"
+    )
+    assert not (sharded / "sales_data_cleaned.csv").exists()
+    pd.testing.assert_frame_equal(
+        intermediate.read_frame(sharded / "sales_data_cleaned.csv"),
+        intermediate.read_frame(sequential / "sales_data_cleaned.csv"),
+        check_categorical=False,
+    )
+
+    # Row shards cut across the parts the workers wrote; each reads only its rows
+    whole = intermediate.read_frame(sharded / "sales_data_cleaned.csv")
+    path, bounds = intermediate.shard_bounds(sharded / "sales_data_cleaned.csv", 70)
+    for start, end in bounds:
+        pd.testing.assert_frame_equal(
+            intermediate.read_shard(path, start, end),
+            whole.iloc[start:end],
+            check_categorical=False,
+        )
+    for file in (path / "part=00002").iterdir():
+        file.unlink()
+    assert len(intermediate.read_shard(path, *bounds[0])) == 70
+    assert len(next(intermediate.read_chunks(sharded / "sales_data_cleaned.csv", 70))) == 70
+
+    cache = StageCache(tmp_path / "cache")
+    out = tmp_path / "cached"
+    out.mkdir()
+    for _ in range(2):
+        data_prep.process_file(
+            "sales_data.csv", LIMITS, 0, raw, out, cache=cache, output_format="npy"
+        )
+        # Hits restore the whole table folder
+        for file in (out / "sales_data_cleaned.cols").iterdir():
+            file.unlink()
+    data_prep.process_file("sales_data.csv", LIMITS, 0, raw, out, cache=cache, output_format="npy")
+    assert cache.stats == {"hits": 2, "misses": 1, "evictions": 0}
+    assert len(intermediate.read_frame(out / "sales_data_cleaned.csv")) > 0
+
+
+def _load(tmp_path, name, output_format, stream_sales):
+    folder = tmp_path / name
+    folder.mkdir()
+    paths = {}
+    for csv in (etl_to_dw.CUSTOMERS_CSV, etl_to_dw.PRODUCTS_CSV, etl_to_dw.SALES_CSV):
+        paths[csv.name] = folder / csv.name
+        intermediate.write_frame(read_csv(csv), paths[csv.name], output_format)
+
+    conn = sqlite3.connect(folder / "dw.db")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.insert_customers(intermediate.read_frame(paths[etl_to_dw.CUSTOMERS_CSV.name]), cursor)
+    etl_to_dw.insert_products(intermediate.read_frame(paths[etl_to_dw.PRODUCTS_CSV.name]), cursor)
+    sales_path = paths[etl_to_dw.SALES_CSV.name]
+    if stream_sales:
+        etl_to_dw.load_sales_streaming(sales_path, cursor, read_chunk_rows=300)
+    else:
+        etl_to_dw.insert_sales(intermediate.read_frame(sales_path), cursor)
+    tables = {
+        table: cursor.execute(f"SELECT * FROM {table} ORDER BY 1").fetchall()  # noqa: S608
+        for table in ("customer", "product", "sale")
+    }
+    conn.close()
+    return tables
+
+
+def test_warehouse_from_binary_matches_csv(tmp_path):
+    expected = _load(tmp_path, "csv", "csv", stream_sales=False)
+    assert _load(tmp_path, "npy", "npy", stream_sales=False) == expected
+    assert _load(tmp_path, "npy_stream", "npy", stream_sales=True) == expected
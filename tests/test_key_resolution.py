@@ -0,0 +1,112 @@
+"""Test sale key resolution against the dimension tables.
+
+Module Information:
+    - Filename: test_key_resolution.py
+    - Module: test_key_resolution
+    - Location: tests/
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.dw.key_resolution import UNKNOWN_MEMBER_ID, KeyResolver
+
+
+def _sales():
+    return pd.DataFrame(
+        {
+            "sale_id": [1, 2, 3, 4, 5],
+            "customer_id": [10.0, None, 99.0, 11.0, 99.0],
+            "product_id": [7.0, 7.0, 8.0, 55.0, None],
+            "sale_amount_usd": [1.0, 2.0, 3.0, 4.0, 5.0],
+        }
+    )
+
+
+def test_check_splits_orphans_and_counts_them():
+    resolver = KeyResolver([11, 10, 10], [7, 8])
+    load, orphans, counts = resolver.check(_sales())
+
+    assert load["sale_id"].tolist() == [1]
+    assert dict(zip(orphans["sale_id"], orphans["reason"], strict=True)) == {
+        2: "customer_id missing",
+        3: "customer_id not in customer",
+        4: "product_id not in product",
+        5: "customer_id not in customer; product_id missing",
+    }
+    assert counts == {
+        "checked": 5,
+        "orphan_rows": 4,
+        "orphan_customer_id": 3,
+        "orphan_product_id": 2,
+    }
+
+    # Keys too spread out for a lookup table are binary-searched instead
+    sparse = KeyResolver([10, 11, 1 << 40], [7, 8])
+    assert "customer_id" not in sparse.tables
+    assert sparse.check(_sales())[2] == counts
+
+    unknown = KeyResolver([10, 11], [7, 8], policy="unknown")
+    load, orphans, _ = unknown.check(_sales())
+    assert orphans.empty
+    assert load["customer_id"].tolist() == [
+        10,
+        UNKNOWN_MEMBER_ID,
+        UNKNOWN_MEMBER_ID,
+        11,
+        UNKNOWN_MEMBER_ID,
+    ]
+    assert load["product_id"].tolist() == [7, 7, 8, UNKNOWN_MEMBER_ID, UNKNOWN_MEMBER_ID]
+
+    unknown.record(counts)
+    unknown.record(counts)
+    assert unknown.report()["orphan_rate"] == 0.8
+
+    with pytest.raises(ValueError, match="orphan policy"):
+        KeyResolver([], [], policy="drop")
+
+
+def test_empty_dimension_makes_every_row_an_orphan():
+    resolver = KeyResolver([], [7, 8], surrogate_keys={"product_id": [70, 80]})
+    load, orphans, counts = resolver.check(_sales())
+
+    assert load.empty
+    assert orphans["sale_id"].tolist() == [1, 2, 3, 4, 5]
+    assert orphans["customer_key"].isna().all()
+    assert orphans["product_key"].tolist()[:3] == [70, 70, 80]
+    assert counts["orphan_customer_id"] == 5
+
+
+def test_every_sales_loader_quarantines_the_same_rows(tmp_path):
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    products = pd.read_csv(etl_to_dw.PRODUCTS_CSV)
+    sales = pd.read_csv(etl_to_dw.SALES_CSV, dtype={"CustomerID": float, "ProductID": float})
+    sales.loc[[3, 400], "CustomerID"] = [float("nan"), 424242]
+    sales.loc[[4, 900], "ProductID"] = [float("nan"), 7]
+    csv_path = tmp_path / "sales.csv"
+    sales.to_csv(csv_path, index=False)
+
+    def load(loader, *args, **kwargs):
+        conn = sqlite3.connect(":memory:", check_same_thread=False)
+        cursor = conn.cursor()
+        etl_to_dw.create_tables(cursor)
+        etl_to_dw.insert_customers(customers, cursor)
+        etl_to_dw.insert_products(products, cursor)
+        resolver = KeyResolver.from_cursor(cursor)
+        loader(*args, cursor, resolver=resolver, **kwargs)
+        return (
+            conn.execute("SELECT * FROM sale ORDER BY 1").fetchall(),
+            conn.execute("SELECT sale_id, reason FROM sale_quarantine ORDER BY 1").fetchall(),
+            resolver.counts,
+        )
+
+    bulk = load(etl_to_dw.insert_sales, sales)
+    assert {4, 5, 401, 901} <= {sale_id for sale_id, _ in bulk[1]}
+    assert not {sale_id for sale_id, _ in bulk[1]} & {row[0] for row in bulk[0]}
+    assert bulk[2]["orphan_rows"] == len(bulk[1])
+
+    assert load(etl_to_dw.load_sales_streaming, csv_path, read_chunk_rows=300) == bulk
+    assert load(etl_to_dw.load_sales_parallel, csv_path, workers=2, shard_rows=500) == bulk
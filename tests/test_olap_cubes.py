@@ -0,0 +1,104 @@
+"""Test the materialized OLAP cuboids.
+
+Module Information:
+    - Filename: test_olap_cubes.py
+    - Module: test_olap_cubes
+    - Location: tests/
+
+Cube lookups must agree with the equivalent GROUP BY over the star schema,
+including after an incremental refresh.
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from analytics_project.dw import etl_to_dw, olap_cubes
+
+
+def _direct(conn, dims, where="", params=()):
+    exprs = [f"{olap_cubes.DIMENSIONS[d]} AS {d}" for d in dims]
+    sql = (
+        f"SELECT {', '.join([*exprs, 'SUM(s.sale_amount_usd) AS total_sales', 'COUNT(*) AS sale_count'])} "
+        "FROM sale s JOIN customer c ON s.customer_id = c.customer_id "
+        f"JOIN product p ON s.product_id = p.product_id {where} "
+        + (f"GROUP BY {', '.join(dims)} ORDER BY {', '.join(dims)}" if dims else "")
+    )
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def _load_warehouse(monkeypatch, tmp_path, customers):
+    sales = pd.read_csv(etl_to_dw.SALES_CSV)
+    files = {
+        "CUSTOMERS_CSV": customers,
+        "PRODUCTS_CSV": pd.read_csv(etl_to_dw.PRODUCTS_CSV),
+        "SALES_CSV": sales.iloc[:1200],
+    }
+    for name, df in files.items():
+        path = tmp_path / f"{name.lower()}.csv"
+        df.to_csv(path, index=False)
+        monkeypatch.setattr(etl_to_dw, name, path)
+    monkeypatch.setattr(etl_to_dw, "DW_PATH", tmp_path / "dw.db")
+    etl_to_dw.create_and_load_dw()
+    return tmp_path, sales
+
+
+@pytest.fixture
+def warehouse(monkeypatch, tmp_path):
+    return _load_warehouse(monkeypatch, tmp_path, pd.read_csv(etl_to_dw.CUSTOMERS_CSV))
+
+
+def test_cube_queries_match_star_schema(warehouse):
+    tmp_path, _ = warehouse
+    conn = sqlite3.connect(tmp_path / "dw.db")
+
+    for dims in (["region", "payment_type", "category"], ["category"], ["region", "month"], []):
+        pd.testing.assert_frame_equal(olap_cubes.query_cube(conn, dims), _direct(conn, dims))
+
+    diced = olap_cubes.query_cube(conn, ["category"], {"region": "South", "payment_type": "Credit"})
+    expected = _direct(
+        conn, ["category"], "WHERE c.region = ? AND s.payment_type = ?", ("South", "Credit")
+    )
+    pd.testing.assert_frame_equal(diced, expected)
+
+
+def test_smallest_cuboid_is_chosen(warehouse):
+    tmp_path, _ = warehouse
+    conn = sqlite3.connect(tmp_path / "dw.db")
+
+    assert olap_cubes.choose_cuboid(conn, ["region"]) == "cube_region"
+    assert olap_cubes.choose_cuboid(conn, ["region", "category"]) == "cube_region_category"
+    assert olap_cubes.choose_cuboid(conn, ["payment_type", "month"]) == olap_cubes.BASE_CUBOID
+    with pytest.raises(ValueError):
+        olap_cubes.choose_cuboid(conn, ["store"])
+
+
+def test_incremental_refresh_folds_in_new_sales(warehouse):
+    tmp_path, sales = warehouse
+    sales.to_csv(etl_to_dw.SALES_CSV, index=False)
+    etl_to_dw.create_and_load_dw(incremental=True)
+
+    conn = sqlite3.connect(tmp_path / "dw.db")
+    dims = list(olap_cubes.CUBOIDS[olap_cubes.BASE_CUBOID])
+    pd.testing.assert_frame_equal(olap_cubes.query_cube(conn, dims), _direct(conn, dims))
+    pd.testing.assert_frame_equal(olap_cubes.query_cube(conn, []), _direct(conn, []))
+
+
+def test_none_filters_match_null_dimension_values(monkeypatch, tmp_path):
+    customers = pd.read_csv(etl_to_dw.CUSTOMERS_CSV)
+    customers.loc[customers.index[::5], "Region"] = None
+    tmp_path, _ = _load_warehouse(monkeypatch, tmp_path, customers)
+    conn = sqlite3.connect(tmp_path / "dw.db")
+
+    nulls = olap_cubes.query_cube(conn, ["category"], {"region": None})
+    assert nulls["sale_count"].sum() > 0
+    pd.testing.assert_frame_equal(nulls, _direct(conn, ["category"], "WHERE c.region IS NULL"))
+
+    mixed = olap_cubes.query_cube(conn, ["region"], {"region": [None, "South"]})
+    expected = _direct(conn, ["region"], "WHERE c.region IS NULL OR c.region = ?", ("South",))
+    pd.testing.assert_frame_equal(mixed, expected)
+
+    empty = olap_cubes.query_cube(conn, ["region"], {"region": [], "category": "Home"})
+    assert empty.empty
+    assert list(empty.columns) == ["region", "total_sales", "sale_count"]
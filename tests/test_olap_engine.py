@@ -0,0 +1,95 @@
+"""Test the in-process OLAP engine.
+
+Module Information:
+    - Filename: test_olap_engine.py
+    - Module: test_olap_engine
+    - Location: tests/
+
+SalesCube results must match the same queries run as SQL over the
+star schema (the SQL the Spark notebooks send).
+"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analytics_project.dw import etl_to_dw
+from analytics_project.olap_engine import SalesCube
+
+STAR = (
+    "FROM sale s JOIN customer c ON s.customer_id = c.customer_id "
+    "JOIN product p ON s.product_id = p.product_id"
+)
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory):
+    conn = sqlite3.connect(tmp_path_factory.mktemp("dw") / "dw.db")
+    cursor = conn.cursor()
+    etl_to_dw.create_tables(cursor)
+    etl_to_dw.insert_customers(pd.read_csv(etl_to_dw.CUSTOMERS_CSV), cursor)
+    etl_to_dw.insert_products(pd.read_csv(etl_to_dw.PRODUCTS_CSV), cursor)
+    etl_to_dw.insert_sales(pd.read_csv(etl_to_dw.SALES_CSV), cursor)
+    conn.commit()
+    return conn
+
+
+def _sorted(df):
+    return df.sort_values(list(df.columns[:-1]), na_position="first").reset_index(drop=True)
+
+
+def test_dice_matches_sql(conn):
+    cube = SalesCube.from_connection(conn)
+    result = cube.dice({"region": "South", "payment_type": "Credit"}).aggregate(
+        ["region", "payment_type", "category"]
+    )
+    expected = pd.read_sql_query(
+        "SELECT c.region, s.payment_type, p.category, SUM(s.sale_amount_usd) AS sum_sale_amount_usd "
+        f"{STAR} WHERE c.region = 'South' AND s.payment_type = 'Credit' "
+        "GROUP BY c.region, s.payment_type, p.category",
+        conn,
+    )
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_rollup_matches_sql(conn):
+    cube = SalesCube.from_connection(conn)
+    dims = ["region", "payment_type", "category"]
+    result = cube.rollup(dims)
+
+    levels = []
+    for depth in range(len(dims), -1, -1):
+        select = [f"{d}" if i < depth else f"NULL AS {d}" for i, d in enumerate(dims)]
+        group = f"GROUP BY {', '.join(dims[:depth])}" if depth else ""
+        levels.append(
+            f"SELECT {', '.join(select)}, SUM(s.sale_amount_usd) AS sum_sale_amount_usd "
+            f"FROM (SELECT c.region, s.payment_type, p.category, s.sale_amount_usd {STAR}) s {group}"
+        )
+    expected = pd.read_sql_query(" UNION ALL ".join(levels), conn)
+
+    assert len(result) == len(expected)
+    np.testing.assert_allclose(
+        _sorted(result)["sum_sale_amount_usd"], _sorted(expected)["sum_sale_amount_usd"]
+    )
+
+
+def test_measures_ignore_nulls(conn):
+    cube = SalesCube.from_connection(conn)
+    result = cube.slice("category", "Home").drill_down(
+        ["region"], "category", "open_invoices", "mean"
+    )
+    expected = pd.read_sql_query(
+        "SELECT c.region, p.category, AVG(CAST(c.open_invoices_num AS REAL)) AS mean_open_invoices "
+        f"{STAR} WHERE p.category = 'Home' AND c.open_invoices_num GLOB '[0-9]*' "
+        "GROUP BY c.region, p.category",
+        conn,
+    )
+    pd.testing.assert_frame_equal(_sorted(result), _sorted(expected))
+
+
+def test_unknown_dimension_is_rejected(conn):
+    cube = SalesCube.from_connection(conn)
+    with pytest.raises(ValueError):
+        cube.aggregate(["store"])
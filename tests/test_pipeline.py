@@ -0,0 +1,129 @@
+"""Test the pipeline DAG runner.
+
+Module Information:
+    - Filename: test_pipeline.py
+    - Module: test_pipeline
+    - Location: tests/
+"""
+
+import threading
+
+import pytest
+
+from analytics_project.pipeline import Pipeline, Stage, build_pipeline
+
+
+def _copy_stage(name, source, target, calls, sync=None, after=()):
+    def run():
+        if sync and sync["barrier"] is not None:
+            # Both independent stages must be running at the same time
+            sync["barrier"].wait(timeout=5)
+        calls.append(name)
+        target.write_text(source.read_text() + name)
+
+    return Stage(name, run, inputs=(source,), outputs=(target,), after=after)
+
+
+def test_parallel_stages_and_up_to_date_skips(tmp_path):
+    raw_a, raw_b = tmp_path / "a.txt", tmp_path / "b.txt"
+    raw_a.write_text("a")
+    raw_b.write_text("b")
+    clean_a, clean_b, joined = tmp_path / "a2.txt", tmp_path / "b2.txt", tmp_path / "ab.txt"
+    calls = []
+    sync = {"barrier": threading.Barrier(2)}
+
+    def join():
+        calls.append("join")
+        joined.write_text(clean_a.read_text() + clean_b.read_text())
+
+    pipeline = Pipeline(
+        [
+            Stage("join", join, inputs=(clean_a, clean_b), outputs=(joined,)),
+            _copy_stage("clean_a", raw_a, clean_a, calls, sync),
+            _copy_stage("clean_b", raw_b, clean_b, calls, sync),
+        ],
+        state_path=tmp_path / "state.json",
+    )
+    assert pipeline.depends_on == {
+        "join": {"clean_a", "clean_b"},
+        "clean_a": set(),
+        "clean_b": set(),
+    }
+
+    first = pipeline.run(workers=2)
+    assert list(first) == ["clean_a", "clean_b", "join"]
+    assert {result.status for result in first.values()} == {"ran"}
+    assert calls[-1] == "join"
+    assert joined.read_text() == "aclean_abclean_b"
+    sync["barrier"] = None
+
+    calls.clear()
+    assert {result.status for result in pipeline.run().values()} == {"skipped"}
+    assert calls == []
+
+    raw_b.write_text("B!")
+    statuses = {name: result.status for name, result in pipeline.run(workers=1).items()}
+    assert statuses == {"clean_a": "skipped", "clean_b": "ran", "join": "ran"}
+    assert pipeline.run(["clean_a"], force=True)["clean_a"].status == "ran"
+
+
+def test_failures_block_dependents_and_bad_graphs_are_rejected(tmp_path):
+    source, middle, target = tmp_path / "in.txt", tmp_path / "mid.txt", tmp_path / "out.txt"
+    source.write_text("x")
+    calls = []
+
+    def fail():
+        raise RuntimeError("boom")
+
+    pipeline = Pipeline(
+        [
+            Stage("broken", fail, inputs=(source,), outputs=(middle,)),
+            _copy_stage("after_broken", middle, target, calls),
+            _copy_stage("independent", source, tmp_path / "other.txt", calls),
+        ],
+        state_path=tmp_path / "state.json",
+    )
+    results = pipeline.run(workers=1)
+    assert results["broken"].status == "failed"
+    assert results["broken"].error == "boom"
+    assert results["after_broken"].status == "blocked"
+    assert results["independent"].status == "ran"
+    assert calls == ["independent"]
+
+    with pytest.raises(ValueError, match="cycle"):
+        Pipeline(
+            [
+                _copy_stage("one", source, middle, calls),
+                _copy_stage("two", middle, source, calls),
+            ]
+        )
+    with pytest.raises(ValueError, match="unknown"):
+        Pipeline([_copy_stage("one", source, middle, calls, after=("missing",))])
+
+
+def test_project_stage_graph(tmp_path):
+    pipeline = build_pipeline(output_format="both", state_path=tmp_path / "state.json")
+    depends_on = pipeline.depends_on
+
+    for table in ("customers", "products", "sales"):
+        assert depends_on[f"clean_{table}"] == set()
+        assert depends_on[f"prepare_{table}"] == set()
+    assert depends_on["load_dw"] == {"clean_customers", "clean_products", "clean_sales"}
+    assert depends_on["load_prepared"] == {
+        "load_dw",
+        "prepare_customers",
+        "prepare_products",
+        "prepare_sales",
+    }
+    assert depends_on["export_snapshot"] == {"load_dw", "load_prepared"}
+    assert pipeline.upstream(["load_dw"]) == {
+        "load_dw",
+        "clean_customers",
+        "clean_products",
+        "clean_sales",
+    }
+    clean_sales = next(stage for stage in pipeline.stages if stage.name == "clean_sales")
+    assert [path.name for path in clean_sales.outputs] == [
+        "sales_data_cleaned.csv",
+        "sales_data_cleaned.cols",
+    ]
@@ -0,0 +1,91 @@
+"""Test the content-hash stage cache.
+
+Module Information:
+    - Filename: test_pipeline_cache.py
+    - Module: test_pipeline_cache
+    - Location: tests/
+
+A stage must run again only when an input's contents, its parameters or
+the code version change; evicted or deleted outputs must be recomputed or
+restored.
+"""
+
+from analytics_project import data_prep
+from analytics_project.pipeline_cache import StageCache
+
+
+def _stage(cache, raw, out, calls, params=None):
+    def compute():
+        calls.append(raw.name)
+        out.write_text(raw.read_text().upper())
+        return len(calls)
+
+    return cache.run("upper", inputs=[raw], outputs=[out], compute=compute, params=params)
+
+
+def test_hits_until_contents_or_params_change(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    raw, out = tmp_path / "a.csv", tmp_path / "a_out.csv"
+    raw.write_text("x,y\n1,2\n")
+    calls = []
+
+    assert _stage(cache, raw, out, calls) == 1
+    assert _stage(cache, raw, out, calls) == 1  # hit returns the stored result
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+    # A deleted output is restored from the cache without recomputing
+    out.unlink()
+    _stage(cache, raw, out, calls)
+    assert out.read_text() == "X,Y\n1,2\n"
+    assert len(calls) == 1
+
+    _stage(cache, raw, out, calls, params={"fill_value": 0})
+    raw.write_text("x,y\n3,4\n")
+    _stage(cache, raw, out, calls, params={"fill_value": 0})
+    assert len(calls) == 3
+    assert out.read_text() == "X,Y\n3,4\n"
+
+
+def test_lru_eviction(tmp_path):
+    cache = StageCache(tmp_path / "cache", max_entries=2)
+    calls = []
+    files = []
+    for name in ("a", "b", "c"):
+        raw = tmp_path / f"{name}.csv"
+        raw.write_text(name)
+        files.append((raw, tmp_path / f"{name}_out.csv"))
+
+    _stage(cache, *files[0], calls)
+    _stage(cache, *files[1], calls)
+    _stage(cache, *files[0], calls)  # a is now more recent than b
+    _stage(cache, *files[2], calls)  # evicts b
+
+    assert cache.stats["evictions"] == 1
+    _stage(cache, *files[0], calls)
+    _stage(cache, *files[1], calls)
+    assert calls == ["a.csv", "b.csv", "c.csv", "b.csv"]
+
+
+def test_process_file_only_recleans_changed_file(tmp_path):
+    raw, out = tmp_path / "raw", tmp_path / "out"
+    raw.mkdir()
+    out.mkdir()
+    for name in ("sales_data.csv", "customers_data.csv"):
+        (raw / name).write_bytes((data_prep.RAW_DIR / name).read_bytes())
+    cache = StageCache(tmp_path / "cache")
+
+    def run_all():
+        for name in ("sales_data.csv", "customers_data.csv"):
+            data_prep.process_file(name, None, 0, raw, out, cache=cache)
+
+    run_all()
+    uncached = (out / "sales_data_cleaned.csv").read_bytes()
+    run_all()
+    assert cache.stats == {"hits": 2, "misses": 2, "evictions": 0}
+
+    with (raw / "customers_data.csv").open("a") as f:
+        f.write("9999,Extra Customer,East,1/1/23,0,Bronze\n")
+    run_all()
+    assert cache.stats["hits"] == 3
+    assert cache.stats["misses"] == 3
+    assert (out / "sales_data_cleaned.csv").read_bytes() == uncached
@@ -0,0 +1,73 @@
+"""Test the declarative prepare engine.
+
+Module Information:
+    - Filename: test_prepare_engine.py
+    - Module: test_prepare_engine
+    - Location: tests/
+"""
+
+import pandas as pd
+
+from analytics_project.data_preparation import prepare_engine
+from analytics_project.data_preparation.prepare_engine import NumericRange, TableSpec
+from analytics_project.pipeline_cache import StageCache
+
+
+def test_prepare_frame_applies_rules_in_one_pass():
+    df = pd.DataFrame(
+        {
+            "ID": [1, 1, 2, 3, 4, 5],
+            "Amount": ["10", "10", "abc", "0", "99.5", "100"],
+            "Region": ["East", "East", None, "West", None, "North"],
+            "Day": ["1/2/25", "1/2/25", "1/3/25", "bad", "1/5/25", "1/6/25"],
+        }
+    )
+    spec = TableSpec(
+        name="t",
+        raw_file="t.csv",
+        prepared_file="t_prepared.csv",
+        ranges=(NumericRange("Amount", low=0, high=100, low_inclusive=True),),
+        fill_values={"Region": "Unknown"},
+        date_columns=("Day",),
+    )
+
+    out, stats = prepare_engine.prepare_frame(df, spec)
+
+    assert out["ID"].tolist() == [1, 3, 4]
+    assert out["Amount"].tolist() == [10.0, 0.0, 99.5]
+    assert out["Region"].tolist() == ["East", "West", "Unknown"]
+    assert out["Day"].isna().tolist() == [False, True, False]
+    assert [(s.rule, s.dropped) for s in stats] == [
+        ("dedupe", 1),
+        ("range Amount", 2),
+        ("fill Region", 0),
+        ("date Day", 0),
+    ]
+    assert all(s.rows_per_second > 0 for s in stats)
+
+
+def test_dedupe_keys_and_missing_columns():
+    df = pd.DataFrame({"ID": [1, 1, 2], "Name": ["a", "b", "c"]})
+    spec = TableSpec(
+        name="t",
+        raw_file="t.csv",
+        prepared_file="t_prepared.csv",
+        dedupe_keys=("ID",),
+        ranges=(NumericRange("Missing", low=0),),
+    )
+    out, _ = prepare_engine.prepare_frame(df, spec)
+    assert out["Name"].tolist() == ["a", "c"]
+
+
+def test_prepare_tables_concurrently_with_cache(tmp_path):
+    cache = StageCache(tmp_path / "cache")
+    first = prepare_engine.prepare_tables(prepared_dir=tmp_path, cache=cache)
+    second = prepare_engine.prepare_tables(prepared_dir=tmp_path, cache=cache)
+
+    assert set(first) == {"customers", "products", "sales"}
+    assert not any(result.cached for result in first.values())
+    assert all(result.cached for result in second.values())
+    sales = pd.read_csv(tmp_path / "sales_prepared.csv")
+    assert len(sales) == first["sales"].rows == second["sales"].rows
+    assert sales["SaleAmount"].between(0, 100000, inclusive="neither").all()
+    assert "(cache hit)" in prepare_engine.throughput_report(second)
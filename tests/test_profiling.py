@@ -0,0 +1,98 @@
+"""Test the streaming sketches and the one-pass DataProfile.
+
+Module Information:
+    - Filename: test_profiling.py
+    - Module: test_profiling
+    - Location: tests/
+
+Sketch results must match exact NumPy/pandas answers (within the sketch
+error where they are estimates), and profiles merged from chunks must
+match the profile of the whole frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics_project.data_prep import RAW_DIR
+from analytics_project.data_scrubber import DataScrubber
+from analytics_project.profiling import DataProfile
+from analytics_project.sketches import (
+    HyperLogLog,
+    QuantileSketch,
+    RunningMoments,
+    hash_column,
+)
+
+
+def test_sketches_merge_across_batches():
+    rng = np.random.default_rng(0)
+    values = rng.normal(10, 3, 200_000)
+    parts = np.array_split(values, 7)
+
+    moments = RunningMoments()
+    quantiles = QuantileSketch()
+    for part in parts:
+        moments.merge(RunningMoments().update(part))
+        quantiles.merge(QuantileSketch().update(part))
+
+    assert moments.count == len(values)
+    assert np.isclose(moments.mean, values.mean())
+    assert np.isclose(moments.std, values.std(ddof=1))
+    assert moments.min == values.min()
+    np.testing.assert_allclose(
+        quantiles.quantiles([0.25, 0.5, 0.75]), np.quantile(values, [0.25, 0.5, 0.75]), atol=0.1
+    )
+
+    keys = pd.Series(rng.integers(0, 300_000, 400_000))
+    hashes = hash_column(keys)
+    sketch = HyperLogLog().update(hashes[:200_000]).merge(HyperLogLog().update(hashes[200_000:]))
+    assert not sketch.is_exact
+    assert abs(sketch.estimate() / keys.nunique() - 1) < 0.03
+
+
+def test_hash_column_matches_numbers_across_dtypes_and_text_exactly():
+    as_ints = hash_column(pd.Series([5, 7]))
+    as_floats = hash_column(pd.Series([5.0, 7.0, None]))
+    np.testing.assert_array_equal(as_ints, as_floats[:2])
+
+    text = hash_column(pd.Series(["7", "07", "7.0", None, "7"]))
+    assert len(set(text[:4])) == 4
+    assert text[0] == text[4]
+    mixed = hash_column(pd.Series([7, "7"], dtype=object))
+    assert mixed[0] != mixed[1]
+    assert mixed[1] == text[0]
+
+
+def test_checks_count_numeric_looking_text_as_distinct():
+    df = pd.DataFrame({"code": ["7", "07", "7.0", "7"], "qty": [1, 1, 1, 1]})
+    assert DataScrubber(df).check_data_consistency_before_cleaning()["duplicate_count"] == 1
+
+    scrubber = DataScrubber(df)
+    scrubber.remove_duplicate_records()
+    assert len(scrubber.df) == 3
+    assert scrubber.check_data_consistency_after_cleaning()["duplicate_count"] == 0
+
+
+def test_profile_matches_pandas():
+    df = pd.read_csv(RAW_DIR / "sales_data.csv")
+    df = pd.concat([df, df.iloc[:40]], ignore_index=True)
+
+    whole = DataProfile.from_frame(df)
+    merged = DataProfile.from_chunks(df.iloc[rows] for rows in np.array_split(range(len(df)), 4))
+    for profile in (whole, merged):
+        assert profile.null_counts.equals(df.isnull().sum())
+        assert profile.duplicates_exact
+        assert profile.duplicate_rows == df.duplicated().sum()
+
+    expected = df.describe()
+    result = merged.describe().loc[expected.index, expected.columns]
+    exact = ["count", "mean", "std", "min", "max"]
+    np.testing.assert_allclose(result.loc[exact], expected.loc[exact], rtol=1e-9)
+    # Quantiles are sketched: within a few percent of the range
+    spread = expected.loc["max"] - expected.loc["min"]
+    assert ((result.loc["50%"] - expected.loc["50%"]).abs() <= 0.05 * spread).all()
+
+    scrubber = DataScrubber(df)
+    assert scrubber.check_data_consistency_before_cleaning()["duplicate_count"] == 40
+    scrubber.remove_duplicate_records()
+    assert scrubber.check_data_consistency_before_cleaning()["duplicate_count"] == 0
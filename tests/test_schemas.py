@@ -0,0 +1,56 @@
+"""Test the read-time schema registry.
+
+Module Information:
+    - Filename: test_schemas.py
+    - Module: test_schemas
+    - Location: tests/
+
+Typed reads must keep every value a default read keeps (including the
+dirty ones the cleaning rules deal with), only in smaller dtypes.
+"""
+
+import pandas as pd
+
+from analytics_project import schemas
+from analytics_project.data_prep import RAW_DIR
+
+
+def test_raw_files_read_compact_and_lossless():
+    for table in schemas.SCHEMAS:
+        path = RAW_DIR / f"{table}_data.csv"
+        default = pd.read_csv(path)
+        typed = schemas.read_csv(path)
+
+        assert typed.memory_usage(deep=True).sum() < default.memory_usage(deep=True).sum()
+        for col in default.columns:
+            assert typed[col].astype(object).where(typed[col].notna(), None).tolist() == (
+                default[col].astype(object).where(default[col].notna(), None).tolist()
+            ), col
+
+    sales = schemas.read_csv(RAW_DIR / "sales_data.csv")
+    assert str(sales["TransactionID"].dtype) == "Int32"
+    assert str(sales["CampaignID"].dtype) == "Int8"
+    assert isinstance(sales["PaymentType_cat"].dtype, pd.CategoricalDtype)
+    assert "?" in set(sales["SaleAmount"])
+
+
+def test_parse_dates_with_fixed_format(tmp_path):
+    path = tmp_path / "sales_data.csv"
+    path.write_text("TransactionID,SaleDate\n1,5/4/25\n2,2023-13-01\n")
+
+    sales = schemas.read_csv(path, parse_dates=True)
+    assert sales["SaleDate"].tolist()[0] == pd.Timestamp("2025-05-04")
+    assert pd.isna(sales["SaleDate"].iloc[1])
+
+    chunks = list(schemas.read_csv(path, parse_dates=True, chunksize=1))
+    assert [str(chunk["SaleDate"].dtype) for chunk in chunks] == ["datetime64[ns]"] * 2
+
+
+def test_ids_that_do_not_fit_stay_as_read(tmp_path):
+    path = tmp_path / "customers_data_cleaned.csv"
+    path.write_text("CustomerID,Region\n1000,East\nabc,\n")
+
+    customers = schemas.read_csv(path)
+    assert customers["CustomerID"].tolist() == ["1000", "abc"]
+    assert isinstance(customers["Region"].dtype, pd.CategoricalDtype)
+    assert schemas.fill_missing(customers["Region"], "N/A").tolist() == ["East", "N/A"]
@@ -0,0 +1,72 @@
+"""Test the synthetic data generator and the stage benchmark suite.
+
+Module Information:
+    - Filename: test_synthetic_data.py
+    - Module: test_synthetic_data
+    - Location: tests/
+"""
+
+import json
+
+import pandas as pd
+
+from analytics_project.benchmarks.bench_suite import report, run_suite
+from analytics_project.data_prep import RAW_DIR
+from analytics_project.synthetic_data import (
+    CLEAN,
+    DirtyRates,
+    sale_block,
+    write_dataset,
+)
+
+
+def test_files_are_reproducible_and_match_the_raw_schemas(tmp_path):
+    first = write_dataset(tmp_path / "a", 1500, seed=7)
+    again = write_dataset(tmp_path / "b", 1500, seed=7)
+    other = write_dataset(tmp_path / "c", 1500, seed=8)
+
+    for table, path in first.items():
+        assert path.read_bytes() == again[table].read_bytes()
+        assert path.read_bytes() != other[table].read_bytes()
+        raw_header = (RAW_DIR / path.name).read_text().splitlines()[0]
+        assert path.read_text().splitlines()[0] == raw_header
+
+    sales = pd.read_csv(first["sales"])
+    assert len(sales) == 1500
+    assert len(pd.read_csv(first["customers"])) == 200
+
+
+def test_dirty_value_rates():
+    rates = DirtyRates(
+        nulls=0.02, duplicates=0.05, bad_amounts=0.05, bad_labels=0.05, orphan_keys=0.05
+    )
+    sales = sale_block(0, 20_000, customers=100, products=50, seed=1, rates=rates)
+
+    assert 0.03 < sales.duplicated().mean() < 0.07
+    assert 0.01 < sales["SaleDate"].isna().mean() < 0.03
+    amounts = pd.to_numeric(sales["SaleAmount"])
+    assert 0.01 < ((amounts < 0) | (amounts > 100_000)).mean() < 0.05
+    bad_payments = ~sales["PaymentType_cat"].isin(["Credit", "Cash", "PayPal", "GiftCard", None])
+    assert 0.02 < bad_payments.mean() < 0.07
+    assert (pd.to_numeric(sales["CustomerID"]) >= 1100).any()
+
+    clean = sale_block(0, 20_000, customers=100, products=50, seed=1, rates=CLEAN)
+    assert not clean.isna().any().any()
+    assert not clean.duplicated().any()
+    assert pd.to_numeric(clean["SaleAmount"]).between(0, 100_000).all()
+    assert pd.to_numeric(clean["CustomerID"]).between(1000, 1099).all()
+
+
+def test_suite_runs_every_stage_and_appends_results(tmp_path):
+    results_path = tmp_path / "results.jsonl"
+    results = run_suite([3000], seed=3, isolate=False, results_path=results_path)
+
+    assert [result["stage"] for result in results] == ["clean", "prepare", "load"]
+    assert all(result["rows"] > 2000 and result["seconds"] > 0 for result in results)
+    lines = [json.loads(line) for line in results_path.read_text().splitlines()]
+    assert lines == results
+
+    history = [
+        {**result, "commit": "older", "seconds": result["seconds"] * 2} for result in results
+    ]
+    assert "-50% vs older" in report(results, history)
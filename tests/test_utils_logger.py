@@ -11,7 +11,11 @@ Testing logging is important because:
     - Good tests ensure logs work when you need them most
 """
 
+import json
+import logging
 from pathlib import Path
+import threading
+
 from analytics_project import utils_logger
 
 
@@ -66,3 +70,56 @@ def test_logger_creates_log_file():
 
     # Check log file exists
     assert log_path.parent.exists(), "Log directory not created"
+
+
+def test_stdlib_logging_reaches_the_loguru_sinks():
+    """Verify stdlib records go to the same sinks, attributed to their caller."""
+    utils_logger.init_logger()
+    messages = []
+    handler_id = utils_logger.logger.add(messages.append, format="{function}: {message}")
+    logging.getLogger("legacy").warning("%s rows skipped", 3)
+    utils_logger.logger.remove(handler_id)
+    assert messages == ["test_stdlib_logging_reaches_the_loguru_sinks: 3 rows skipped\n"]
+
+
+def test_throttled_logs_every_nth_call_per_call_site():
+    """Verify throttled() samples one call site and counts what it skipped."""
+    messages = []
+    handler_id = utils_logger.logger.add(messages.append, format="{message}")
+    for i in range(7):
+        utils_logger.throttled("WARNING", "row {} failed", i, every=3)
+    utils_logger.logger.remove(handler_id)
+    assert messages == [
+        "row 0 failed\n",
+        "row 3 failed (+2 suppressed)\n",
+        "row 6 failed (+2 suppressed)\n",
+    ]
+
+
+def test_json_sink_drops_info_but_keeps_warnings_when_full(tmp_path):
+    """Verify the JSON-lines sink under pressure: INFO is dropped and counted, WARNING waits."""
+    sink = utils_logger.JsonLinesSink(tmp_path / "log.jsonl", max_queue=1)
+    writing, release = threading.Event(), threading.Event()
+    append = sink._append
+
+    def slow_append(lines):
+        writing.set()
+        release.wait()
+        append(lines)
+
+    sink._append = slow_append
+    handler_id = utils_logger.logger.add(sink, format="{message}")
+    log = utils_logger.logger.bind(table="sale")
+    log.info("first")
+    writing.wait()
+    # The writer is busy: one record fits in the queue, the rest are dropped
+    for i in range(5):
+        log.info(f"row {i}")
+    release.set()
+    log.warning("kept")
+    utils_logger.logger.remove(handler_id)
+
+    records = [json.loads(line) for line in (tmp_path / "log.jsonl").read_text().splitlines()]
+    assert [r["message"] for r in records if "dropped" not in r] == ["first", "row 0", "kept"]
+    assert records[0]["extra"] == {"table": "sale"}
+    assert [r["dropped"] for r in records if "dropped" in r] == [{"INFO": 4}]